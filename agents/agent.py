@@ -1,11 +1,10 @@
 from langchain.agents import OpenAIFunctionsAgent, AgentExecutor
-from agents.tools import fetch_weather, fetch_moon_phase, fetch_sky_events, fetch_satellite_passes
+from agents.tools import fetch_weather, fetch_moon_phase, fetch_sky_events, fetch_satellite_passes, fetch_night_report, fetch_best_nights
 import os
 from dotenv import load_dotenv
 from langchain.schema.messages import SystemMessage
 from agents.prompt import SYSTEM_PROMPT
-from langchain_community.chat_message_histories import StreamlitChatMessageHistory
-from langchain.memory import ConversationBufferWindowMemory
+from agents.callbacks import TelemetryCallbackHandler
 from langchain_openai import ChatOpenAI
 import streamlit as st
 
@@ -18,29 +17,29 @@ OPENAI_API_KEY = os.getenv('OPENAI_API_KEY')
 
 # Define the Agent creation function
 def create_sky_agent():
-    """Create the sky agent with Streamlit-integrated memory"""
+    """Create the sky agent.
+
+    The agent keeps no memory of its own; each input carries the compact
+    session context rendered by agents.conversation.ConversationState.
+    Every tool has an async implementation, so ainvoke does not block
+    threads on upstream calls.
+    """
     
     try:
         system_prompt = SystemMessage(content=SYSTEM_PROMPT)
-        
-        # Use StreamlitChatMessageHistory for proper integration
-        message_history = StreamlitChatMessageHistory(key="langchain_messages")
-        
-        memory = ConversationBufferWindowMemory(
-            memory_key="chat_history",
-            chat_memory=message_history,
-            return_messages=True,
-            k=10  # Keep last 10 turns
-        )
 
-        tools = [fetch_weather, fetch_moon_phase, fetch_sky_events, fetch_satellite_passes]
+        tools = [fetch_night_report, fetch_best_nights, fetch_weather, fetch_moon_phase, fetch_sky_events, fetch_satellite_passes]
         
         llm = ChatOpenAI(
             model="gpt-4", 
             temperature=0.7, 
             openai_api_key=OPENAI_API_KEY,
             request_timeout=60,
-            max_retries=2
+            max_retries=2,
+            streaming=True,
+            # Attached to the model, not the executor: executor callbacks
+            # are local to its own run and never see the LLM calls.
+            callbacks=[TelemetryCallbackHandler()],
         )
 
         # Agent and executor
@@ -53,8 +52,7 @@ def create_sky_agent():
         sky_agent = AgentExecutor.from_agent_and_tools(
             agent=agent,
             tools=tools,
-            memory=memory,
-            verbose=True,
+            verbose=os.getenv("LANGCHAIN_VERBOSE", "").lower() in ("1", "true"),
             handle_parsing_errors=True
         )
         
@@ -0,0 +1,186 @@
+import functools
+import inspect
+import os
+import threading
+from collections import defaultdict
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+from stargaze.utils import telemetry
+from stargaze.utils.cache import TieredCache
+from stargaze.utils.geocoding import normalize_query
+
+# Optional SQLite file that keeps tool results across processes and restarts.
+TOOL_CACHE_PATH = os.getenv('TOOL_CACHE_PATH')
+TOOL_RESULTS_TABLE = "tool_results_v2"
+
+# Moon phases and sky positions for a given place and date never change;
+# weather and satellite predictions go stale quickly.
+TOOL_TTLS = {
+    "fetch_moon_phase": 30 * 24 * 3600,
+    "fetch_sky_events": 30 * 24 * 3600,
+    "fetch_weather": 30 * 60,
+    "fetch_satellite_passes": 30 * 60,
+    "fetch_night_report": 30 * 60,
+    "fetch_best_nights": 30 * 60,
+}
+DEFAULT_TTL = 5 * 60
+
+
+# Tool results starting with one of these report a failure (an upstream
+# error, an unknown location, missing data) rather than an answer.
+FAILURE_PREFIXES = ("Error", "Could not find", "Location not found", "No weather data", "No forecast")
+
+
+def is_cacheable(result: Any) -> bool:
+    """Results that report a failure are returned but not cached."""
+    return not (isinstance(result, str) and result.startswith(FAILURE_PREFIXES))
+
+
+class ToolResultCache:
+    """Process-wide cache of tool results shared by every chat session.
+
+    Results live in an in-memory LRU and, when a path is given, in a
+    SQLite file so other worker processes and restarts reuse them too.
+    Concurrent calls with the same arguments run the tool once.
+
+    Args:
+        path (Optional[str]): SQLite file for the disk tier, or None.
+        maxsize (int): Maximum number of results kept in memory.
+    """
+
+    def __init__(self, path: Optional[str] = None, maxsize: int = 4096):
+        self.path = path
+        self._cache = TieredCache(TOOL_RESULTS_TABLE, path, maxsize=maxsize, ttl=DEFAULT_TTL)
+        self._counts: Dict[str, Dict[str, int]] = defaultdict(lambda: {"hits": 0, "misses": 0})
+        self._lock = threading.Lock()
+
+    def get(self, tool_name: str, key: str) -> Optional[str]:
+        """Return a cached result, counting the hit or miss for tool_name."""
+        value = self._cache.get(key)
+        self._count(tool_name, value is not None)
+        return value
+
+    def set(self, key: str, value: str, ttl: float) -> None:
+        """Store a result in memory and, if enabled, on disk."""
+        self._cache.set(key, value, ttl)
+
+    def get_or_load(self, tool_name: str, key: str, loader: Callable[[], Any], ttl: float,
+                    cacheable: Callable[[Any], bool]) -> Tuple[Any, bool]:
+        """Returns (result, hit), running loader on a miss and caching cacheable results."""
+        loaded = []
+
+        def load():
+            loaded.append(True)
+            return loader()
+
+        result = self._cache.get_or_load(key, load, ttl=ttl, cacheable=cacheable)
+        self._count(tool_name, not loaded)
+        return result, not loaded
+
+    async def aget_or_load(self, tool_name: str, key: str, loader: Callable[[], Awaitable[Any]], ttl: float,
+                           cacheable: Callable[[Any], bool]) -> Tuple[Any, bool]:
+        """Async variant of get_or_load; loader returns an awaitable."""
+        loaded = []
+
+        async def load():
+            loaded.append(True)
+            return await loader()
+
+        result = await self._cache.aget_or_load(key, load, ttl=ttl, cacheable=cacheable)
+        self._count(tool_name, not loaded)
+        return result, not loaded
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        """Returns hit/miss counters per tool, plus a "total" entry."""
+        with self._lock:
+            stats = {name: dict(counts) for name, counts in self._counts.items()}
+        stats["total"] = {
+            "hits": sum(c["hits"] for c in stats.values()),
+            "misses": sum(c["misses"] for c in stats.values()),
+        }
+        return stats
+
+    def clear(self) -> None:
+        """Drop cached results from memory and reset the counters."""
+        self._cache.clear()
+        with self._lock:
+            self._counts.clear()
+
+    def _count(self, tool_name: str, hit: bool) -> None:
+        with self._lock:
+            self._counts[tool_name]["hits" if hit else "misses"] += 1
+        telemetry.increment(f"cache.tool.{'hit' if hit else 'miss'}")
+
+
+_tool_cache = ToolResultCache(TOOL_CACHE_PATH)
+
+
+def get_tool_cache() -> ToolResultCache:
+    """Returns the process-wide tool result cache."""
+    return _tool_cache
+
+
+def make_key(tool_name: str, arguments: Dict[str, Any]) -> str:
+    """Build a cache key from the tool name and its normalized arguments.
+
+    Location strings are normalized the same way as for geocoding, so
+    "Denver, CO" and " denver,co" share an entry.
+    """
+    parts = [tool_name]
+    for name in sorted(arguments):
+        value = arguments[name]
+        if name == "location" and isinstance(value, str):
+            value = normalize_query(value)
+        parts.append(f"{name}={value}")
+    return "|".join(parts)
+
+
+def cached_tool(tool_name: str, cacheable: Callable[[Any], bool] = is_cacheable):
+    """Decorator caching a tool function's string result across sessions.
+
+    Apply it beneath ``@tool`` so LangChain still sees the original
+    signature and docstring. Coroutine functions (a tool's async variant)
+    are wrapped in a coroutine sharing the same cache entries.
+
+    Args:
+        tool_name (str): Name used in the key, TTL lookup and counters.
+        cacheable (Callable[[Any], bool]): Returns False for results that
+            should not be cached (failures by default).
+    """
+    ttl = TOOL_TTLS.get(tool_name, DEFAULT_TTL)
+
+    def decorator(func):
+        signature = inspect.signature(func)
+
+        def key_of(args, kwargs) -> str:
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            return make_key(tool_name, bound.arguments)
+
+        def store_if(result: Any) -> bool:
+            return isinstance(result, str) and cacheable(result)
+
+        if inspect.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                with telemetry.span(f"tool.{tool_name}") as span:
+                    result, hit = await get_tool_cache().aget_or_load(
+                        tool_name, key_of(args, kwargs), lambda: func(*args, **kwargs), ttl, store_if
+                    )
+                    span["cache"] = "hit" if hit else "miss"
+                    return result
+
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with telemetry.span(f"tool.{tool_name}") as span:
+                result, hit = get_tool_cache().get_or_load(
+                    tool_name, key_of(args, kwargs), lambda: func(*args, **kwargs), ttl, store_if
+                )
+                span["cache"] = "hit" if hit else "miss"
+                return result
+
+        return wrapper
+
+    return decorator
@@ -0,0 +1,116 @@
+import ast
+import time
+from typing import Any, Dict, Optional, Tuple
+from uuid import UUID
+
+from langchain_core.callbacks import BaseCallbackHandler
+
+from agents.conversation import ConversationState
+from stargaze.utils import telemetry
+
+
+class StreamlitStreamHandler(BaseCallbackHandler):
+    """Streams LLM tokens and tool activity into a Streamlit chat message.
+
+    Tool start/end events are written to a collapsible status box and
+    tokens are appended to a placeholder as they arrive, so the user sees
+    progress during the agent run instead of a spinner.
+    """
+
+    def __init__(self, container):
+        self.status = container.status("Thinking...", expanded=False)
+        self.placeholder = container.empty()
+        self.text = ""
+        self._tool_starts: Dict[UUID, float] = {}
+
+    def on_llm_start(self, serialized: Dict[str, Any], prompts: Any, **kwargs: Any) -> None:
+        # Each agent step is a new LLM call; only the last one is the answer.
+        self.text = ""
+
+    def on_llm_new_token(self, token: Any, **kwargs: Any) -> None:
+        if not isinstance(token, str) or not token:
+            return
+        self.text += token
+        self.placeholder.markdown(self.text + "▌")
+
+    def on_tool_start(self, serialized: Dict[str, Any], input_str: str, *, run_id: UUID, **kwargs: Any) -> None:
+        name = (serialized or {}).get("name", "tool")
+        self._tool_starts[run_id] = time.perf_counter()
+        self.status.update(label=f"Running {name}...", state="running")
+        self.status.write(f"🔧 `{name}` {input_str}")
+
+    def on_tool_end(self, output: Any, *, run_id: UUID, **kwargs: Any) -> None:
+        elapsed = time.perf_counter() - self._tool_starts.pop(run_id, time.perf_counter())
+        self.status.write(f"✅ done in {elapsed:.1f}s")
+        self.status.update(label="Thinking...")
+
+    def on_tool_error(self, error: BaseException, *, run_id: UUID, **kwargs: Any) -> None:
+        self._tool_starts.pop(run_id, None)
+        self.status.write(f"⚠️ {error}")
+
+    def finish(self, response: str) -> None:
+        """Replace the streamed text with the final response and close the status box."""
+        self.placeholder.markdown(response)
+        self.status.update(label="Done", state="complete")
+
+    def fail(self) -> None:
+        """Clear the partial output and mark the status box as failed."""
+        self.placeholder.empty()
+        self.status.update(label="Failed", state="error")
+
+
+class TelemetryCallbackHandler(BaseCallbackHandler):
+    """Records every LLM call made by the agent as a telemetry span.
+
+    Tool calls are already timed by the tool layer itself.
+    """
+
+    def __init__(self):
+        self._starts: Dict[UUID, float] = {}
+
+    def on_llm_start(self, serialized: Dict[str, Any], prompts: Any, *, run_id: UUID, **kwargs: Any) -> None:
+        self._starts[run_id] = time.perf_counter()
+
+    def on_chat_model_start(self, serialized: Dict[str, Any], messages: Any, *, run_id: UUID, **kwargs: Any) -> None:
+        self._starts[run_id] = time.perf_counter()
+
+    def on_llm_end(self, response: Any, *, run_id: UUID, **kwargs: Any) -> None:
+        usage = (getattr(response, "llm_output", None) or {}).get("token_usage") or {}
+        self._record(run_id, prompt_tokens=usage.get("prompt_tokens"), completion_tokens=usage.get("completion_tokens"))
+
+    def on_llm_error(self, error: BaseException, *, run_id: UUID, **kwargs: Any) -> None:
+        self._record(run_id, error=f"{type(error).__name__}: {error}")
+
+    def _record(self, run_id: UUID, **attributes: Any) -> None:
+        start = self._starts.pop(run_id, None)
+        if start is None:
+            return
+        attributes = {k: v for k, v in attributes.items() if v is not None}
+        telemetry.increment("llm.calls")
+        telemetry.record_span("llm.call", (time.perf_counter() - start) * 1000, **attributes)
+
+
+class ConversationStateHandler(BaseCallbackHandler):
+    """Feeds every completed tool call into the session's ConversationState."""
+
+    def __init__(self, state: ConversationState):
+        self.state = state
+        self._calls: Dict[UUID, Tuple[str, Dict[str, Any]]] = {}
+
+    def on_tool_start(self, serialized: Dict[str, Any], input_str: str, *, run_id: UUID,
+                      inputs: Optional[Dict[str, Any]] = None, **kwargs: Any) -> None:
+        if inputs is None:
+            try:
+                inputs = ast.literal_eval(input_str)
+            except (ValueError, SyntaxError):
+                inputs = None
+        name = (serialized or {}).get("name", "tool")
+        self._calls[run_id] = (name, inputs if isinstance(inputs, dict) else {})
+
+    def on_tool_end(self, output: Any, *, run_id: UUID, **kwargs: Any) -> None:
+        call = self._calls.pop(run_id, None)
+        if call is not None:
+            self.state.record_tool(call[0], call[1], getattr(output, "content", output))
+
+    def on_tool_error(self, error: BaseException, *, run_id: UUID, **kwargs: Any) -> None:
+        self._calls.pop(run_id, None)
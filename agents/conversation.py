@@ -0,0 +1,115 @@
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Deque, Dict, Optional, Tuple
+
+from stargaze.utils.geocoding import get_geocoding_service
+
+try:
+    import tiktoken
+except ImportError:  # optional: fall back to a character-based estimate
+    tiktoken = None
+
+# Budget for what is replayed to the model each turn: a few recent
+# messages, each trimmed, plus one short finding per tool.
+MAX_TURNS = 4
+MAX_TURN_CHARS = 400
+MAX_FINDING_CHARS = 240
+
+# Approximate characters per token for English text when tiktoken is absent.
+CHARS_PER_TOKEN = 4
+
+
+def count_tokens(text: str, model: str = "gpt-4") -> int:
+    """Returns the number of tokens text uses for model (estimated without tiktoken)."""
+    if tiktoken is not None:
+        try:
+            return len(tiktoken.encoding_for_model(model).encode(text))
+        except KeyError:
+            return len(tiktoken.get_encoding("cl100k_base").encode(text))
+    return -(-len(text) // CHARS_PER_TOKEN)
+
+
+def raw_history_tokens(history, model: str = "gpt-4") -> int:
+    """Tokens the previous scheme pasted into each turn, for comparison in the debug panel.
+
+    That was the last six raw messages, tool dumps included, prefixed
+    with "Previous conversation:".
+
+    Args:
+        history (Sequence[Tuple[str, str]]): (role, content) messages before this turn.
+    """
+    if not history:
+        return 0
+    pasted = "Previous conversation:\n" + "".join(f"{role}: {content}\n" for role, content in history[-6:])
+    return count_tokens(pasted, model)
+
+
+def _trim(text: str, limit: int) -> str:
+    text = " ".join(text.split())
+    return text if len(text) <= limit else text[:limit - 1].rstrip() + "…"
+
+
+@dataclass
+class ConversationState:
+    """Compact per-session context replayed to the agent instead of raw history.
+
+    Holds what the conversation has established (location, coordinates,
+    date), a one-line finding per tool and the last few trimmed messages.
+    The rendered context stays bounded however long the chat runs.
+    """
+
+    location: Optional[str] = None
+    coords: Optional[Tuple[float, float]] = None
+    date: Optional[str] = None
+    findings: Dict[str, str] = field(default_factory=dict)
+    turns: Deque[Tuple[str, str]] = field(default_factory=lambda: deque(maxlen=MAX_TURNS))
+
+    def add_message(self, role: str, content: str) -> None:
+        """Record a chat message, keeping only the last MAX_TURNS trimmed."""
+        self.turns.append((role, _trim(content, MAX_TURN_CHARS)))
+
+    def record_tool(self, tool_name: str, arguments: Dict[str, Any], output: Any,
+                    coords: Optional[Tuple[float, float]] = None) -> None:
+        """Update the established location/date and findings from a tool call.
+
+        Args:
+            tool_name (str): Name of the tool that ran.
+            arguments (Dict[str, Any]): The tool's arguments.
+            output (Any): The tool's result; only a trimmed summary is kept.
+            coords (Optional[Tuple[float, float]]): The location's coordinates,
+                if the caller already has them; otherwise they are geocoded.
+        """
+        location = arguments.get("location")
+        if isinstance(location, str) and location.strip() and location != self.location:
+            self.location = location.strip()
+            # Tools geocode through the shared service, so this is a cache lookup.
+            self.coords = coords or get_geocoding_service().geocode(self.location)
+        if arguments.get("date_str"):
+            self.date = str(arguments["date_str"])
+        self.findings[tool_name] = _trim(str(output), MAX_FINDING_CHARS)
+
+    def render(self, question: str) -> str:
+        """Returns the agent input: the compact context followed by the question."""
+        lines = []
+        known = []
+        if self.location:
+            coords = f" ({self.coords[0]:.2f}, {self.coords[1]:.2f})" if self.coords else ""
+            known.append(f"location={self.location}{coords}")
+        if self.date:
+            known.append(f"date={self.date}")
+        if known:
+            lines.append("Established context: " + "; ".join(known))
+        if self.findings:
+            lines.append("Earlier tool findings (summarized):")
+            lines.extend(f"- {name}: {summary}" for name, summary in self.findings.items())
+        if self.turns:
+            lines.append("Recent conversation:")
+            lines.extend(f"{role}: {content}" for role, content in self.turns)
+        if not lines:
+            return question
+        return "\n".join(lines) + f"\n\nCurrent question: {question}"
+
+    def clear(self) -> None:
+        self.location = self.coords = self.date = None
+        self.findings.clear()
+        self.turns.clear()
@@ -0,0 +1,282 @@
+"""Deterministic fast path for simple, structured questions.
+
+Questions with exactly one recognizable intent (moon phase, weather,
+sky events, satellite passes, best night) and an unambiguous location
+and date are answered by calling stargaze.utils directly and filling a
+template, skipping the LLM. Anything else returns None and goes to the
+agent.
+"""
+import re
+import time
+from dataclasses import dataclass, field
+from datetime import date as DateType, datetime, timedelta
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from dateparser.search import search_dates
+
+from agents.conversation import ConversationState
+from stargaze.utils import telemetry
+from stargaze.utils.astronomy import get_moon_phase, get_sky_events
+from stargaze.utils.best_nights import get_best_nights
+from stargaze.utils.geocoding import geocode
+from stargaze.utils.satellite import get_satellite_passes
+from stargaze.utils.weather import FORECAST_DAYS, get_weather
+
+INTENT_PATTERNS = {
+    "moon_phase": re.compile(r"\bmoon\b.*\b(phase|illuminat\w*|full|new|lit)\b|\b(phase|illumination) of the moon\b", re.I),
+    "best_nights": re.compile(r"\b(best|clearest|darkest) nights?\b|\bwhich night\b", re.I),
+    "weather": re.compile(r"\b(weather|cloudy|clouds?|cloud cover|forecast|temperature|rain)\b", re.I),
+    "satellite_passes": re.compile(r"\b(iss|satellites?|hubble|tiangong|space station)\b", re.I),
+    "sky_events": re.compile(r"\b(planets?|stars?|constellations?|what can i see|what'?s up|visible in the sky)\b", re.I),
+}
+
+# Questions asking for reasoning or comparison need the agent, as do
+# searches for when something happens ("when is the next full moon?"),
+# which the single-date templates would answer for today.
+OPEN_ENDED = re.compile(
+    r"\b(why|how come|explain|compare|versus|vs|should i|recommend|difference|history|what is a|tell me about"
+    r"|when|until|how long|next (?:full|new)|next (?:moon|eclipse|meteor))\b",
+    re.I,
+)
+
+LOCATION_PATTERN = re.compile(
+    r"\b(?:in|at|for|from|over|near)\s+(?P<location>[^?!;]+?)"
+    r"(?=\s+(?:on|tonight|today|tomorrow|this|next|for|at|in|during|around|over|from)\b|\s*[?!;]|\.?\s*$)",
+    re.I,
+)
+NOT_LOCATIONS = {
+    "the", "my", "a", "an", "this", "next", "tonight", "today", "tomorrow", "stargazing",
+    "sky", "night", "week", "weekend", "days", "me", "us", "it", "there", "here",
+}
+
+ISO_DATE = re.compile(r"\b\d{4}-\d{2}-\d{2}\b")
+# Date expressions that name a specific day; vague ones ("in May") go to the agent.
+SPECIFIC_DATE = re.compile(
+    r"\d|today|tonight|tomorrow|monday|tuesday|wednesday|thursday|friday|saturday|sunday", re.I
+)
+# Clock times, removed before date parsing so "at 3am" is not read as a date.
+TIME_OF_DAY = re.compile(r"\b\d{1,2}(?::\d{2})?\s*(?:am|pm)\b|\b\d{1,2}:\d{2}\b", re.I)
+# Named days; a question naming more than one ("tonight or tomorrow") is deferred.
+DAY_WORDS = re.compile(r"\b(today|tonight|tomorrow|monday|tuesday|wednesday|thursday|friday|saturday|sunday)\b", re.I)
+# Words that start a date, not a place ("in May", "on Friday").
+DATE_WORDS = re.compile(
+    r"(january|february|march|april|may|june|july|august|september|october|november|december"
+    r"|jan|feb|mar|apr|jun|jul|aug|sep|sept|oct|nov|dec"
+    r"|monday|tuesday|wednesday|thursday|friday|saturday|sunday|\d+)\.?",
+    re.I,
+)
+
+
+@dataclass
+class RouteResult:
+    """A question answered without the LLM."""
+
+    intent: str
+    answer: str
+    arguments: Dict[str, Any] = field(default_factory=dict)
+    coords: Optional[Tuple[float, float]] = None
+    latency_ms: float = 0.0
+
+
+def detect_intent(question: str) -> Optional[str]:
+    """Returns the single intent a question expresses, or None if there are zero or several."""
+    if OPEN_ENDED.search(question):
+        return None
+    matches = [name for name, pattern in INTENT_PATTERNS.items() if pattern.search(question)]
+    # "best night ... clouds" is still one question about ranking nights.
+    if "best_nights" in matches:
+        return "best_nights"
+    return matches[0] if len(matches) == 1 else None
+
+
+def extract_location(question: str) -> Tuple[Optional[str], str]:
+    """Returns (location, question with the location removed), or (None, question)."""
+    for match in LOCATION_PATTERN.finditer(question):
+        location = match.group("location").strip(" ,")
+        first_word = location.split()[0].lower() if location else ""
+        if not location or first_word in NOT_LOCATIONS or DATE_WORDS.fullmatch(first_word):
+            continue
+        return location, question[:match.start("location")] + question[match.end("location"):]
+    return None, question
+
+
+def extract_date(question: str, today: DateType) -> Tuple[Optional[DateType], bool]:
+    """Returns (date, found) for the day a question asks about.
+
+    Args:
+        question (str): The question, with any location already removed.
+        today (datetime.date): Reference date for relative expressions.
+
+    Returns:
+        Tuple[Optional[datetime.date], bool]: The date and whether the
+        question named one; (None, True) when it named one too vaguely
+        or named several.
+    """
+    question = TIME_OF_DAY.sub(" ", question)
+    isos = ISO_DATE.findall(question)
+    days = {word.lower().replace("tonight", "today") for word in DAY_WORDS.findall(question)}
+    if len(isos) + len(days) > 1:
+        return None, True
+    if isos:
+        return DateType.fromisoformat(isos[0]), True
+    lowered = question.lower()
+    if "tomorrow" in lowered:
+        return today + timedelta(days=1), True
+    if "tonight" in lowered or "today" in lowered:
+        return today, True
+
+    found = search_dates(
+        question,
+        languages=["en"],
+        settings={"PREFER_DATES_FROM": "future", "RELATIVE_BASE": datetime.combine(today, datetime.min.time())},
+    )
+    if not found:
+        return None, False
+    text, value = found[0]
+    if len(found) > 1 or not SPECIFIC_DATE.search(text):
+        return None, True
+    return value.date(), True
+
+
+def _moon_phase(location: Optional[str], day: DateType, question: str) -> Optional[Tuple[str, Dict]]:
+    return f"🌙 Moon on {day:%A, %B %d, %Y}: {get_moon_phase(day)}.", {"date_str": day.isoformat()}
+
+
+def _weather(location: Optional[str], day: DateType, question: str) -> Optional[Tuple[str, Dict]]:
+    if not location:
+        return None
+    data = get_weather(location, day)
+    if not data:
+        return None
+    answer = f"☁️ Weather for {location} on {day:%A, %B %d}: {data['summary']}."
+    return answer, {"location": location, "date_str": day.isoformat()}
+
+
+def _sky_events(location: Optional[str], day: DateType, question: str) -> Optional[Tuple[str, Dict]]:
+    if not location:
+        return None
+    events = get_sky_events(location, day)
+    if events == ["Location not found."]:
+        return None
+    answer = f"Here's the sky over {location} at 10 PM on {day:%A, %B %d}:\n\n" + "\n".join(events)
+    return answer, {"location": location, "date_str": day.isoformat()}
+
+
+def _satellite_passes(location: Optional[str], day: DateType, question: str) -> Optional[Tuple[str, Dict]]:
+    if not location:
+        return None
+    days = 7 if re.search(r"\bweek\b", question, re.I) else 3
+    passes = get_satellite_passes(location, days)
+    if passes.startswith(("Error", "Could not find")):
+        return None
+    return passes, {"location": location, "days": days}
+
+
+def _best_nights(location: Optional[str], day: DateType, question: str) -> Optional[Tuple[str, Dict]]:
+    if not location:
+        return None
+    days = 14 if re.search(r"\b(two weeks|fortnight|14 days)\b", question, re.I) else 7
+    nights = get_best_nights(location, days)
+    if not nights:
+        return None
+    lines = "\n".join(f"{rank}. {night}" for rank, night in enumerate(nights, 1))
+    return f"🔭 The next {days} nights in {location}, best first:\n\n{lines}", {"location": location, "days": days}
+
+
+HANDLERS: Dict[str, Callable[[Optional[str], DateType, str], Optional[Tuple[str, Dict]]]] = {
+    "moon_phase": _moon_phase,
+    "weather": _weather,
+    "sky_events": _sky_events,
+    "satellite_passes": _satellite_passes,
+    "best_nights": _best_nights,
+}
+
+# Intents that need a location; the router geocodes it once up front.
+LOCATED_INTENTS = {"weather", "sky_events", "satellite_passes", "best_nights"}
+
+# Intents answered for one specific date; the others cover a span of days.
+DATED_INTENTS = {"moon_phase", "weather", "sky_events"}
+
+# The tool each intent stands in for, so the conversation state records it the same way.
+INTENT_TOOLS = {
+    "moon_phase": "fetch_moon_phase",
+    "weather": "fetch_weather",
+    "sky_events": "fetch_sky_events",
+    "satellite_passes": "fetch_satellite_passes",
+    "best_nights": "fetch_best_nights",
+}
+
+
+def route(question: str, state: Optional[ConversationState] = None,
+          today: Optional[DateType] = None) -> Optional[RouteResult]:
+    """Answers a question on the fast path, or returns None to defer to the agent.
+
+    Location and date fall back to those established earlier in the
+    conversation. Upstream failures also defer to the agent, which can
+    explain them.
+
+    Args:
+        question (str): The user's message.
+        state (Optional[ConversationState]): The session's established context.
+        today (Optional[datetime.date]): Reference date; defaults to today.
+
+    Returns:
+        Optional[RouteResult]: The templated answer, or None.
+    """
+    start = time.perf_counter()
+    today = today or DateType.today()
+    with telemetry.span("router.route") as span:
+        intent = detect_intent(question)
+        result = None
+        if intent is not None:
+            span["intent"] = intent
+            result = _answer(intent, question, state, today)
+        span["routed"] = result is not None
+
+    telemetry.increment("router.hit" if result else "router.miss")
+    if result:
+        result.latency_ms = (time.perf_counter() - start) * 1000
+        telemetry.increment(f"router.hit.{intent}")
+    return result
+
+
+def _answer(intent: str, question: str, state: Optional[ConversationState], today: DateType) -> Optional[RouteResult]:
+    location, rest = extract_location(question)
+    if location is None and state is not None:
+        location = state.location
+
+    day = today
+    if intent in DATED_INTENTS:
+        day, named = extract_date(rest, today)
+        if named and day is None:
+            return None
+        if day is None:
+            day = DateType.fromisoformat(state.date) if state is not None and state.date else today
+        # Past dates and days beyond the forecast need the agent's judgement.
+        if day < today or (intent == "weather" and day >= today + timedelta(days=FORECAST_DAYS)):
+            return None
+
+    coords = None
+    try:
+        if intent in LOCATED_INTENTS:
+            if not location:
+                return None
+            # Handlers geocode through the same cached service, so this is the only lookup.
+            coords = geocode(location)
+            if coords is None:
+                return None
+        handled = HANDLERS[intent](location, day, question)
+    except Exception:
+        telemetry.increment("router.errors")
+        return None
+    if handled is None:
+        return None
+    answer, arguments = handled
+    return RouteResult(intent=intent, answer=answer, arguments=arguments, coords=coords)
+
+
+def hit_rate() -> Optional[float]:
+    """Returns the fraction of questions answered on the fast path so far, or None."""
+    counters = telemetry.snapshot()["counters"]
+    hits, misses = counters.get("router.hit", 0), counters.get("router.miss", 0)
+    return hits / (hits + misses) if hits + misses else None
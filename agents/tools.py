@@ -1,32 +1,203 @@
 from langchain_community.tools import tool
-from stargaze.utils.weather import get_weather
+from stargaze.utils.weather import aget_weather, get_weather
 from stargaze.utils.astronomy import get_moon_phase, get_sky_events
 from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor, wait
+import asyncio
+import json
 import os
-from stargaze.utils.satellite import get_satellite_passes
+import time
+from stargaze.utils.satellite import aget_satellite_passes, get_satellite_passes
+from stargaze.utils.best_nights import get_best_nights
+from agents.cache import cached_tool, is_cacheable
+from stargaze.utils import telemetry
+
+
+# Per-source time budgets (seconds) for the night report.
+NIGHT_REPORT_TIMEOUTS = {
+    "weather": 15,
+    "moon_phase": 5,
+    "sky_events": 20,
+    "satellite_passes": 15,
+}
+
+
+def is_complete_report(result: str) -> bool:
+    """Whether a night report JSON has every source and none reported a failure."""
+    report = json.loads(result)
+    return not report["errors"] and all(is_cacheable(report[name]) for name in NIGHT_REPORT_TIMEOUTS)
+
+
+def build_night_report(location: str, date: datetime, days: int = 3) -> dict:
+    """Fetch weather, moon phase, sky events and satellite passes concurrently.
+
+    Each source runs in its own thread with its own deadline; a source
+    that fails or misses its deadline is reported under "errors" and the
+    rest of the report is still returned.
+
+    Args:
+        location (str): Location name (e.g., "Denver, CO").
+        date (datetime): The night of interest.
+        days (int): Number of days to check for satellite passes.
+
+    Returns:
+        dict: "location", "date", one key per source, and "errors".
+    """
+    sources = {
+        "weather": lambda: (get_weather(location, date) or {}).get("summary", "No weather data available."),
+        "moon_phase": lambda: get_moon_phase(date),
+        "sky_events": lambda: "\n".join(get_sky_events(location, date)),
+        "satellite_passes": lambda: get_satellite_passes(location, days),
+    }
+
+    report = {"location": location, "date": date.strftime("%Y-%m-%d"), "errors": {}}
+    start = time.monotonic()
+    executor = ThreadPoolExecutor(max_workers=len(sources), thread_name_prefix="night_report")
+    try:
+        futures = {name: executor.submit(telemetry.propagate(func)) for name, func in sources.items()}
+        for name, future in futures.items():
+            remaining = NIGHT_REPORT_TIMEOUTS[name] - (time.monotonic() - start)
+            wait([future], timeout=max(remaining, 0))
+            if not future.done():
+                report[name] = None
+                report["errors"][name] = f"timed out after {NIGHT_REPORT_TIMEOUTS[name]}s"
+                continue
+            try:
+                report[name] = future.result()
+            except Exception as e:
+                report[name] = None
+                report["errors"][name] = str(e)
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+    return report
+
+
+async def abuild_night_report(location: str, date: datetime, days: int = 3) -> dict:
+    """Async variant of build_night_report.
+
+    Weather and satellite passes are awaited on the event loop; the
+    CPU-bound moon and sky computations run in worker threads. Deadlines
+    and error reporting match build_night_report.
+    """
+    async def weather():
+        return ((await aget_weather(location, date)) or {}).get("summary", "No weather data available.")
+
+    async def sky_events():
+        return "\n".join(await asyncio.to_thread(get_sky_events, location, date))
+
+    sources = {
+        "weather": weather(),
+        "moon_phase": asyncio.to_thread(get_moon_phase, date),
+        "sky_events": sky_events(),
+        "satellite_passes": aget_satellite_passes(location, days),
+    }
+
+    report = {"location": location, "date": date.strftime("%Y-%m-%d"), "errors": {}}
+    results = await asyncio.gather(
+        *(asyncio.wait_for(source, NIGHT_REPORT_TIMEOUTS[name]) for name, source in sources.items()),
+        return_exceptions=True,
+    )
+    for name, result in zip(sources, results):
+        if isinstance(result, asyncio.TimeoutError):
+            report[name] = None
+            report["errors"][name] = f"timed out after {NIGHT_REPORT_TIMEOUTS[name]}s"
+        elif isinstance(result, Exception):
+            report[name] = None
+            report["errors"][name] = str(result)
+        else:
+            report[name] = result
+    return report
+
+
+def async_variant(sync_tool):
+    """Decorator registering a coroutine as sync_tool's implementation for ainvoke.
+
+    The coroutine must take the same arguments as the sync tool; LangChain
+    builds the tool schema from the sync function.
+    """
+    def decorator(coroutine):
+        sync_tool.coroutine = coroutine
+        return coroutine
+
+    return decorator
 
 
 @tool
+@cached_tool("fetch_weather")
 def fetch_weather(location: str, date_str: str) -> str:
     """Returns weather summary for a given location and date (YYYY-MM-DD)."""
     date = datetime.strptime(date_str, "%Y-%m-%d")
     data = get_weather(location, date)
     return data['summary'] if data else "No weather data available."
 
+@async_variant(fetch_weather)
+@cached_tool("fetch_weather")
+async def afetch_weather(location: str, date_str: str) -> str:
+    date = datetime.strptime(date_str, "%Y-%m-%d")
+    data = await aget_weather(location, date)
+    return data['summary'] if data else "No weather data available."
+
 @tool
+@cached_tool("fetch_moon_phase")
 def fetch_moon_phase(date_str: str) -> str:
     """Returns moon phase for a given date (YYYY-MM-DD)."""
     date = datetime.strptime(date_str, "%Y-%m-%d")
     return get_moon_phase(date)
 
+@async_variant(fetch_moon_phase)
+@cached_tool("fetch_moon_phase")
+async def afetch_moon_phase(date_str: str) -> str:
+    date = datetime.strptime(date_str, "%Y-%m-%d")
+    return await asyncio.to_thread(get_moon_phase, date)
+
 @tool
+@cached_tool("fetch_sky_events")
 def fetch_sky_events(location: str, date_str: str) -> str:
     """Returns visible sky events for a location and date (YYYY-MM-DD)."""
     date = datetime.strptime(date_str, "%Y-%m-%d")
     events = get_sky_events(location, date)
     return "\n".join(events)
 
+@async_variant(fetch_sky_events)
+@cached_tool("fetch_sky_events")
+async def afetch_sky_events(location: str, date_str: str) -> str:
+    date = datetime.strptime(date_str, "%Y-%m-%d")
+    events = await asyncio.to_thread(get_sky_events, location, date)
+    return "\n".join(events)
+
 @tool
+@cached_tool("fetch_satellite_passes")
 def fetch_satellite_passes(location: str, days: int = 3) -> str:
     """Returns visible satellite passes for a location over the next few days."""        
     return get_satellite_passes(location, days)
+
+@async_variant(fetch_satellite_passes)
+@cached_tool("fetch_satellite_passes")
+async def afetch_satellite_passes(location: str, days: int = 3) -> str:
+    return await aget_satellite_passes(location, days)
+
+@tool
+@cached_tool("fetch_night_report", cacheable=is_complete_report)
+def fetch_night_report(location: str, date_str: str) -> str:
+    """Returns weather, moon phase, visible sky events and satellite passes for a location and night (YYYY-MM-DD) in one call. Prefer this for general "can I stargaze" questions."""
+    date = datetime.strptime(date_str, "%Y-%m-%d")
+    return json.dumps(build_night_report(location, date), ensure_ascii=False, indent=2)
+
+@async_variant(fetch_night_report)
+@cached_tool("fetch_night_report", cacheable=is_complete_report)
+async def afetch_night_report(location: str, date_str: str) -> str:
+    date = datetime.strptime(date_str, "%Y-%m-%d")
+    return json.dumps(await abuild_night_report(location, date), ensure_ascii=False, indent=2)
+
+@tool
+@cached_tool("fetch_best_nights")
+def fetch_best_nights(location: str, days: int = 7) -> str:
+    """Ranks the next few nights (up to 15) at a location for stargazing by cloud cover, darkness and moonlight, with each night's best viewing window. Use this for "which night is best?" questions."""
+    nights = get_best_nights(location, days)
+    return "\n".join(nights) if nights else "No forecast available for ranking nights."
+
+@async_variant(fetch_best_nights)
+@cached_tool("fetch_best_nights")
+async def afetch_best_nights(location: str, days: int = 7) -> str:
+    nights = await asyncio.to_thread(get_best_nights, location, days)
+    return "\n".join(nights) if nights else "No forecast available for ranking nights."
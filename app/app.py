@@ -1,9 +1,30 @@
+import logging
+import threading
+
 import streamlit as st
 from agents.agent import create_sky_agent
+from agents.callbacks import ConversationStateHandler, StreamlitStreamHandler
+from agents.conversation import ConversationState, count_tokens, raw_history_tokens
+from agents.router import INTENT_TOOLS, hit_rate, route
+from stargaze.utils import telemetry
+from stargaze.utils.astronomy import warm_sky_snapshots
+
+logger = logging.getLogger(__name__)
 
 st.set_page_config(page_title="Stargazing Chat", page_icon="🌌", layout="centered")
 st.title("🌠 Stargazing Assistant")
 
+
+@st.cache_resource
+def warm_sky_cache() -> threading.Thread:
+    """Precompute sky snapshots for popular cities once per server process."""
+    thread = threading.Thread(target=warm_sky_snapshots, name="sky_warm", daemon=True)
+    thread.start()
+    return thread
+
+
+warm_sky_cache()
+
 # Initialize the agent
 if "sky_agent" not in st.session_state:
     st.session_state.sky_agent = create_sky_agent()
@@ -12,6 +33,10 @@ if "sky_agent" not in st.session_state:
 if "chat_history" not in st.session_state:
     st.session_state.chat_history = []
 
+# Compact context (location, date, tool findings, trimmed recent turns) sent with each question
+if "conversation" not in st.session_state:
+    st.session_state.conversation = ConversationState()
+
 # Display chat history
 with st.container():
     for role, content in st.session_state.chat_history:
@@ -25,36 +50,90 @@ if user_input:
     # Display user message
     with st.chat_message("user"):
         st.markdown(user_input)
+    previous_history = list(st.session_state.chat_history)
     st.session_state.chat_history.append(("user", user_input))
 
-    # Process with agent
-    with st.chat_message("assistant"):
-        with st.spinner("Thinking..."):
+    conversation = st.session_state.conversation
+    with telemetry.trace() as trace_id:
+        st.session_state.last_trace_id = trace_id
+        routed = route(user_input, conversation)
+
+    if routed:
+        # Simple structured question: answered directly, no LLM round-trip
+        with st.chat_message("assistant"):
+            st.markdown(routed.answer)
+            st.caption(f"⚡ Answered directly in {routed.latency_ms:.0f} ms")
+        st.session_state.chat_history.append(("assistant", routed.answer))
+        try:
+            conversation.record_tool(INTENT_TOOLS[routed.intent], routed.arguments, routed.answer, routed.coords)
+        except Exception as e:
+            # The answer is already shown; only the session context misses this turn's finding.
+            logger.warning("Could not record fast-path answer in the session context: %s", e)
+        conversation.add_message("user", user_input)
+        conversation.add_message("assistant", routed.answer)
+
+    else:
+        # Process with agent, streaming tokens and tool activity as they arrive
+        with st.chat_message("assistant"):
+            stream_handler = StreamlitStreamHandler(st.container())
             try:
-                # Create context from recent chat history
-                context = ""
-                if len(st.session_state.chat_history) > 1:
-                    # Get last 6 messages (3 exchanges) for context
-                    recent_history = st.session_state.chat_history[-7:-1]  # Exclude current user message
-                    context = "Previous conversation:\n"
-                    for role, content in recent_history:
-                        context += f"{role}: {content}\n"
-                    context += f"\nCurrent question: {user_input}"
-                else:
-                    context = user_input
-                
-                # Invoke agent with context
-                result = st.session_state.sky_agent.invoke({"input": context})
+                context = conversation.render(user_input)
+                tokens = {
+                    "context_tokens": count_tokens(context),
+                    "raw_history_tokens": raw_history_tokens(previous_history) + count_tokens(user_input),
+                }
+                st.session_state.last_context_tokens = tokens
+                telemetry.increment("prompt.context_tokens", tokens["context_tokens"])
+
+                # Invoke agent with context, grouping this turn's spans under the same trace
+                with telemetry.trace(trace_id), telemetry.span("agent.turn", **tokens):
+                    result = st.session_state.sky_agent.invoke(
+                        {"input": context},
+                        config={"callbacks": [stream_handler, ConversationStateHandler(conversation)]},
+                    )
                 response = result["output"] if isinstance(result, dict) and "output" in result else str(result)
-                st.markdown(response)
+                stream_handler.finish(response)
                 st.session_state.chat_history.append(("assistant", response))
-                
+                conversation.add_message("user", user_input)
+                conversation.add_message("assistant", response)
+
             except Exception as e:
+                stream_handler.fail()
                 error_msg = f"Error: {str(e)}"
                 st.error(error_msg)
                 st.session_state.chat_history.append(("assistant", error_msg))
 
+# Debug panel: where the last answer spent its time
+if st.sidebar.toggle("Debug panel", value=False):
+    trace_id = st.session_state.get("last_trace_id")
+    spans = telemetry.get_spans(trace_id) if trace_id else []
+    st.sidebar.subheader("Last turn")
+    if spans:
+        st.sidebar.dataframe(
+            [{k: s.get(k) for k in ("span", "duration_ms", "cache", "status", "error")} for s in spans],
+            hide_index=True,
+        )
+    else:
+        st.sidebar.caption("No spans recorded yet.")
+    tokens = st.session_state.get("last_context_tokens")
+    if tokens:
+        st.sidebar.metric(
+            "Context tokens",
+            tokens["context_tokens"],
+            delta=tokens["context_tokens"] - tokens["raw_history_tokens"],
+            delta_color="inverse",
+            help="Compact context sent with the last question, vs. pasting the last six raw messages",
+        )
+    rate = hit_rate()
+    if rate is not None:
+        router_spans = telemetry.snapshot()["spans"].get("router.route", {})
+        mean_ms = router_spans["total_ms"] / router_spans["count"] if router_spans.get("count") else 0.0
+        st.sidebar.metric("Fast-path hit rate", f"{rate:.0%}", help=f"Router mean latency {mean_ms:.0f} ms")
+    st.sidebar.subheader("Counters")
+    st.sidebar.json(telemetry.snapshot()["counters"])
+
 # Clear chat button
 if st.button("Clear Chat History"):
     st.session_state.chat_history = []
+    st.session_state.conversation.clear()
     st.rerun()
\ No newline at end of file
@@ -0,0 +1,78 @@
+"""Benchmark the vectorized get_bright_stars against the per-row path.
+
+Run from the repository root (the ephemeris and Hipparcos files are loaded
+from the working directory):
+
+    python -m benchmarks.bench_bright_stars --repeat 5
+"""
+import argparse
+import statistics
+import time
+from datetime import date
+from typing import Callable, List
+
+from skyfield.api import Star, wgs84
+
+from stargaze.utils.astronomy import get_bright_stars
+from stargaze.utils.constellations import star_name
+from stargaze.utils.resources import get_ephemeris, get_star_catalog
+from stargaze.utils.timezones import local_time
+
+
+def get_bright_stars_per_row(lat: float, lon: float, day: date, max_magnitude: float = 2.5, min_altitude: float = 10) -> List[str]:
+    """Reference implementation: one Star and one altaz() call per catalog row."""
+    t = local_time(lat, lon, day, hour=22)
+    location = get_ephemeris()['earth'] + wgs84.latlon(latitude_degrees=lat, longitude_degrees=lon)
+
+    catalog = get_star_catalog()
+    visible = []
+    for row in catalog[catalog['magnitude'] < max_magnitude]:
+        star = Star(ra_hours=float(row['ra_hours']), dec_degrees=float(row['dec_degrees']))
+        alt, _, _ = location.at(t).observe(star).apparent().altaz()
+        if alt.degrees > min_altitude:
+            visible.append((row['magnitude'], row['hip'], alt.degrees))
+
+    visible.sort(key=lambda v: v[0])
+    return [f"{star_name(hip_id)} (alt {alt:.1f}°, mag {mag:.1f})" for mag, hip_id, alt in visible]
+
+
+def time_call(func: Callable, repeat: int, *args, **kwargs) -> List[float]:
+    """Call func repeatedly and return the wall-clock duration of each call."""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(*args, **kwargs)
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--lat", type=float, default=40.71)
+    parser.add_argument("--lon", type=float, default=-74.01)
+    parser.add_argument("--date", type=date.fromisoformat, default=date(2026, 10, 16))
+    parser.add_argument("--max-magnitude", type=float, default=2.5)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    call_args = (args.lat, args.lon, args.date)
+    call_kwargs = {"max_magnitude": args.max_magnitude}
+
+    vectorized = get_bright_stars(*call_args, **call_kwargs)
+    per_row = get_bright_stars_per_row(*call_args, **call_kwargs)
+    if vectorized != per_row:
+        raise SystemExit("Vectorized and per-row results differ")
+
+    fast = time_call(get_bright_stars, args.repeat, *call_args, **call_kwargs)
+    slow = time_call(get_bright_stars_per_row, args.repeat, *call_args, **call_kwargs)
+
+    fast_median = statistics.median(fast)
+    slow_median = statistics.median(slow)
+    print(f"stars visible : {len(vectorized)}")
+    print(f"per-row       : {slow_median * 1000:9.2f} ms (median of {args.repeat})")
+    print(f"vectorized    : {fast_median * 1000:9.2f} ms (median of {args.repeat})")
+    print(f"speedup       : {slow_median / fast_median:9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+"""Offline data fixtures for the benchmark suite.
+
+The star catalog fixture is a seeded synthetic Hipparcos-sized catalog
+with a realistic magnitude distribution, written straight to the compact
+.npy format. The JPL ephemeris is too large to bundle, so an existing
+de421.bsp is linked into the fixture directory instead.
+"""
+import os
+import shutil
+
+import numpy as np
+
+CATALOG_SIZE = 118218  # stars in the real Hipparcos catalog
+SEED = 421
+
+
+def synthetic_magnitudes(rng: np.random.Generator, size: int) -> np.ndarray:
+    """Magnitudes whose cumulative counts roughly follow Hipparcos.
+
+    About 130 stars are brighter than 2.5 and about 5000 brighter than 6.
+    """
+    fraction_brighter_than_6 = 5000 / CATALOG_SIZE
+    u = rng.uniform(1e-6, 1.0, size)
+    return np.clip(6 + np.log10(u / fraction_brighter_than_6) / 0.45, -1.5, 12.4)
+
+
+def write_catalog_fixture(data_dir: str, size: int = CATALOG_SIZE, seed: int = SEED) -> str:
+    """Write the synthetic catalog into data_dir and return its path."""
+    from stargaze.utils.resources import CATALOG_CACHE_FILE, write_star_catalog
+
+    rng = np.random.default_rng(seed)
+    path = os.path.join(data_dir, CATALOG_CACHE_FILE)
+    write_star_catalog(
+        path,
+        hip=np.arange(1, size + 1),
+        ra_hours=rng.uniform(0, 24, size),
+        dec_degrees=np.degrees(np.arcsin(rng.uniform(-1, 1, size))),
+        magnitude=synthetic_magnitudes(rng, size),
+    )
+    return path
+
+
+def link_ephemeris(data_dir: str, ephemeris_path: str) -> str:
+    """Make de421.bsp available inside data_dir and return its path."""
+    from stargaze.utils.resources import EPHEMERIS_FILE
+
+    if not os.path.exists(ephemeris_path):
+        raise SystemExit(
+            f"Ephemeris not found at {ephemeris_path}. Pass --ephemeris pointing at a "
+            f"local {EPHEMERIS_FILE} (Skyfield downloads it on first normal use)."
+        )
+    target = os.path.join(data_dir, EPHEMERIS_FILE)
+    if not os.path.exists(target):
+        try:
+            os.symlink(os.path.abspath(ephemeris_path), target)
+        except OSError:
+            shutil.copyfile(ephemeris_path, target)
+    return target
@@ -0,0 +1,335 @@
+"""Load test replaying simulated chat sessions against local stand-ins.
+
+Starts the stand-in Nominatim, Open-Meteo, N2YO and OpenAI chat APIs,
+then replays scripted conversations through the same path as app/app.py:
+the fast-path router first, then an agent from create_sky_agent given the
+session's compact context. Each session gets its own agent and
+ConversationState, as each browser session does in the app. Reports
+throughput, turn latency percentiles, upstream calls per turn and memory
+per session, and saves them as JSON:
+
+    python -m benchmarks.loadtest --ephemeris de421.bsp --sessions 200 --concurrency 20
+    python -m benchmarks.loadtest --ephemeris de421.bsp --mode async --llm-latency 0.8 --error-rate 0.05
+
+"threads" mode runs each session on its own worker thread with
+agent.invoke, like Streamlit script runs; "async" mode runs sessions as
+tasks on one event loop with agent.ainvoke.
+"""
+import argparse
+import asyncio
+import gc
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, timedelta, timezone
+from typing import Dict, List, Optional, Tuple
+
+# Scripted conversations; {site} is the session's location, {date} today
+# and {tomorrow} the next day. They mix fast-path questions, open
+# questions for the agent and follow-ups that rely on session context.
+CONVERSATIONS = [
+    [
+        "What's the moon phase tonight?",
+        "What's the weather in {site} tonight?",
+        "What planets can I see in {site} tonight?",
+        "Any ISS passes over {site} this week?",
+    ],
+    [
+        "Can I go stargazing in {site} on {date}?",
+        "Why does the moon matter for that?",
+        "Which night is best this week in {site}?",
+    ],
+    [
+        "Tell me about the sky over {site} on {date}",
+        "Should I bring a telescope or binoculars?",
+        "Compare the weather with {tomorrow}",
+    ],
+]
+
+Session = Tuple[List[str], str]
+
+
+def make_sites(count: int, seed: int) -> List[str]:
+    """Distinct stand-in locations; fewer sites means more cache sharing between sessions."""
+    from benchmarks.standins import site_query
+
+    rng = random.Random(seed)
+    return [site_query(round(rng.uniform(-60, 65), 1), round(rng.uniform(-180, 180), 1)) for _ in range(count)]
+
+
+def plan_sessions(count: int, sites: List[str], seed: int) -> List[Session]:
+    """Pick a conversation and a site for each simulated session."""
+    rng = random.Random(seed)
+    return [(CONVERSATIONS[i % len(CONVERSATIONS)], rng.choice(sites)) for i in range(count)]
+
+
+def _questions(script: List[str], site: str, today: date) -> List[str]:
+    tomorrow = today + timedelta(days=1)
+    return [q.format(site=site, date=today.isoformat(), tomorrow=tomorrow.isoformat()) for q in script]
+
+
+def _new_agent():
+    from agents.agent import create_sky_agent
+
+    agent = create_sky_agent()
+    if agent is None:
+        raise RuntimeError("create_sky_agent failed; see the error above")
+    return agent
+
+
+def _routed_turn(state, question: str, routed) -> None:
+    from agents.router import INTENT_TOOLS
+
+    state.record_tool(INTENT_TOOLS[routed.intent], routed.arguments, routed.answer, routed.coords)
+    state.add_message("user", question)
+    state.add_message("assistant", routed.answer)
+
+
+def _agent_turn(state, question: str, result) -> None:
+    response = result["output"] if isinstance(result, dict) and "output" in result else str(result)
+    state.add_message("user", question)
+    state.add_message("assistant", response)
+
+
+def run_turn(agent, state, question: str, today: date) -> Dict:
+    """Answer one question the way app/app.py does and time it."""
+    from agents.callbacks import ConversationStateHandler
+    from agents.router import route
+
+    start = time.perf_counter()
+    routed, error = None, None
+    try:
+        routed = route(question, state, today)
+        if routed:
+            _routed_turn(state, question, routed)
+        else:
+            result = agent.invoke({"input": state.render(question)},
+                                  config={"callbacks": [ConversationStateHandler(state)]})
+            _agent_turn(state, question, result)
+    except Exception as e:
+        error = f"{type(e).__name__}: {e}"
+    return {"latency": time.perf_counter() - start, "routed": routed is not None, "error": error}
+
+
+async def arun_turn(agent, state, question: str, today: date) -> Dict:
+    """Async variant of run_turn using agent.ainvoke; the router runs in a worker thread."""
+    from agents.callbacks import ConversationStateHandler
+    from agents.router import route
+
+    start = time.perf_counter()
+    routed, error = None, None
+    try:
+        routed = await asyncio.to_thread(route, question, state, today)
+        if routed:
+            _routed_turn(state, question, routed)
+        else:
+            result = await agent.ainvoke({"input": state.render(question)},
+                                         config={"callbacks": [ConversationStateHandler(state)]})
+            _agent_turn(state, question, result)
+    except Exception as e:
+        error = f"{type(e).__name__}: {e}"
+    return {"latency": time.perf_counter() - start, "routed": routed is not None, "error": error}
+
+
+def run_session(session: Session, today: date) -> List[Dict]:
+    from agents.conversation import ConversationState
+
+    script, site = session
+    agent, state = _new_agent(), ConversationState()
+    return [run_turn(agent, state, question, today) for question in _questions(script, site, today)]
+
+
+async def arun_session(session: Session, today: date) -> List[Dict]:
+    from agents.conversation import ConversationState
+
+    script, site = session
+    agent, state = _new_agent(), ConversationState()
+    return [await arun_turn(agent, state, question, today) for question in _questions(script, site, today)]
+
+
+def run_load(sessions: List[Session], concurrency: int, mode: str, today: date) -> Tuple[List[Dict], float]:
+    """Run every session with at most concurrency in flight; returns (turns, elapsed seconds)."""
+    start = time.perf_counter()
+    if mode == "async":
+        async def run_all():
+            semaphore = asyncio.Semaphore(concurrency)
+
+            async def limited(session):
+                async with semaphore:
+                    return await arun_session(session, today)
+
+            return await asyncio.gather(*(limited(s) for s in sessions))
+
+        results = asyncio.run(run_all())
+    else:
+        with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="session") as executor:
+            results = list(executor.map(lambda s: run_session(s, today), sessions))
+    return [turn for session_turns in results for turn in session_turns], time.perf_counter() - start
+
+
+def session_memory(sessions: List[Session], today: date) -> Dict[str, float]:
+    """Memory one session holds after its conversation, and its peak while running.
+
+    Sessions run one after another with tracing on, after the load run has
+    warmed the shared caches, and are kept alive (as the app keeps its
+    session state) until measured.
+    """
+    from agents.conversation import ConversationState
+
+    gc.collect()
+    tracemalloc.start()
+    before, _ = tracemalloc.get_traced_memory()
+    kept = []
+    for script, site in sessions:
+        agent, state = _new_agent(), ConversationState()
+        for question in _questions(script, site, today):
+            run_turn(agent, state, question, today)
+        kept.append((agent, state))
+    gc.collect()
+    after, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {
+        "retained_kb_per_session": (after - before) / len(sessions) / 1024,
+        "peak_kb": (peak - before) / 1024,
+    }
+
+
+def latency_stats(latencies: List[float]) -> Dict[str, float]:
+    from benchmarks.run import percentile
+
+    if not latencies:
+        return {"turns": 0}
+    latencies = sorted(latencies)
+    return {
+        "turns": len(latencies),
+        "p50_ms": percentile(latencies, 50) * 1000,
+        "p95_ms": percentile(latencies, 95) * 1000,
+        "p99_ms": percentile(latencies, 99) * 1000,
+    }
+
+
+def summarize(turns: List[Dict], elapsed: float, sessions: int, counts: Dict[str, int]) -> Dict:
+    """Throughput, latency percentiles (overall, fast path, agent), errors and upstream calls per turn."""
+    agent_turns = sum(1 for t in turns if not t["routed"])
+    errors = [t["error"] for t in turns if t["error"]]
+    return {
+        "sessions": sessions,
+        "turns": len(turns),
+        "elapsed_s": elapsed,
+        "turns_per_s": len(turns) / elapsed,
+        "sessions_per_s": sessions / elapsed,
+        "latency": {
+            "all": latency_stats([t["latency"] for t in turns]),
+            "fast_path": latency_stats([t["latency"] for t in turns if t["routed"]]),
+            "agent": latency_stats([t["latency"] for t in turns if not t["routed"]]),
+        },
+        "fast_path_rate": 1 - agent_turns / len(turns) if turns else 0.0,
+        "errors": len(errors),
+        "error_samples": sorted(set(errors))[:5],
+        "upstream_calls_per_turn": {
+            api: n / len(turns) for api, n in sorted(counts.items()) if not api.endswith("_tokens")
+        },
+        "prompt_tokens_per_agent_turn": counts.get("openai_prompt_tokens", 0) / agent_turns if agent_turns else 0.0,
+    }
+
+
+def print_report(summary: Dict, settings: Dict) -> None:
+    print(f"{summary['sessions']} sessions, {summary['turns']} turns, concurrency {settings['concurrency']}, "
+          f"{settings['mode']} mode, {summary['elapsed_s']:.1f}s")
+    print(f"throughput: {summary['turns_per_s']:.1f} turns/s, {summary['sessions_per_s']:.2f} sessions/s")
+    print(f"fast path: {summary['fast_path_rate']:.0%} of turns; errors: {summary['errors']}")
+    for sample in summary["error_samples"]:
+        print(f"  {sample}")
+    print()
+    header = f"{'turn latency':<14}{'turns':>7}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}"
+    print(header)
+    print("-" * len(header))
+    for name, stats in summary["latency"].items():
+        if stats["turns"]:
+            print(f"{name:<14}{stats['turns']:>7}{stats['p50_ms']:>10.1f}{stats['p95_ms']:>10.1f}{stats['p99_ms']:>10.1f}")
+    print()
+    print("upstream calls per turn: " + ", ".join(
+        f"{api} {n:.2f}" for api, n in summary["upstream_calls_per_turn"].items()))
+    print(f"prompt tokens per agent turn: {summary['prompt_tokens_per_agent_turn']:.0f}")
+    memory = summary.get("memory")
+    if memory:
+        print(f"memory per session: {memory['retained_kb_per_session']:.0f} KiB retained, "
+              f"{memory['peak_kb']:.0f} KiB peak while measuring")
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--ephemeris", default="de421.bsp", help="path to a local de421.bsp")
+    parser.add_argument("--sessions", type=int, default=100, help="simulated chat sessions")
+    parser.add_argument("--concurrency", type=int, default=10, help="sessions in flight at once")
+    parser.add_argument("--mode", choices=("threads", "async"), default="threads")
+    parser.add_argument("--sites", type=int, default=25, help="distinct locations the sessions ask about")
+    parser.add_argument("--latency", type=float, default=0.05, help="stand-in API latency in seconds")
+    parser.add_argument("--llm-latency", type=float, default=0.5, help="stand-in chat completion latency in seconds")
+    parser.add_argument("--jitter", type=float, default=0.0, help="extra random latency in seconds, every API")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fraction of requests answered with 503, every API")
+    parser.add_argument("--memory-sessions", type=int, default=5, help="sessions replayed to measure memory (0 to skip)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--out", default=os.path.join("benchmarks", "results"), help="directory for JSON results")
+    args = parser.parse_args(argv)
+
+    # The data directory and upstream URLs must be set before stargaze is imported.
+    data_dir = tempfile.mkdtemp(prefix="stargaze-load-")
+    os.environ["STARGAZE_DATA_DIR"] = data_dir
+
+    from benchmarks.standins import StandinConfig, StandinServer, UpstreamBehaviour
+
+    def behaviour(latency: float) -> UpstreamBehaviour:
+        return UpstreamBehaviour(latency=latency, jitter=args.jitter, error_rate=args.error_rate)
+
+    server = StandinServer(StandinConfig(
+        nominatim=behaviour(args.latency),
+        open_meteo=behaviour(args.latency),
+        n2yo=behaviour(args.latency),
+        openai=behaviour(args.llm_latency),
+        seed=args.seed,
+    )).start()
+    os.environ.update(server.environ())
+
+    from benchmarks.fixtures import link_ephemeris, write_catalog_fixture
+    from benchmarks.run import environment
+
+    link_ephemeris(data_dir, args.ephemeris)
+    write_catalog_fixture(data_dir)
+    server.install_geocoder()
+
+    # The stand-in forecast starts at today's UTC date.
+    today = datetime.now(timezone.utc).date()
+    settings = {k: v for k, v in vars(args).items() if k not in ("ephemeris", "out")}
+    try:
+        # Load the ephemeris, catalog and agent modules once before timing.
+        warmup = make_sites(1, seed=args.seed + 1)[0]
+        for script in CONVERSATIONS:
+            run_session((script, warmup), today)
+        server.reset_counts()
+
+        sessions = plan_sessions(args.sessions, make_sites(args.sites, args.seed), args.seed)
+        turns, elapsed = run_load(sessions, args.concurrency, args.mode, today)
+        summary = summarize(turns, elapsed, len(sessions), server.reset_counts())
+        if args.memory_sessions:
+            summary["memory"] = session_memory(sessions[:args.memory_sessions], today)
+    finally:
+        server.stop()
+
+    print_report(summary, settings)
+
+    os.makedirs(args.out, exist_ok=True)
+    stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+    path = os.path.join(args.out, f"load-{stamp}.json")
+    with open(path, "w") as f:
+        json.dump({"timestamp": stamp, "environment": environment(), "settings": settings, "results": summary}, f, indent=2)
+    print(f"\nSaved {path}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,222 @@
+"""Offline benchmark suite for the astronomy, weather and satellite hot paths.
+
+Runs every benchmarked function over a matrix of latitudes, dates and
+magnitude limits against the bundled catalog fixture and the local
+stand-in upstreams, then reports latency percentiles, throughput and
+peak memory. Results are saved as JSON so runs can be compared:
+
+    python -m benchmarks.run --ephemeris de421.bsp
+    python -m benchmarks.run --ephemeris de421.bsp --compare benchmarks/results/<previous>.json
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import date, datetime, timezone
+from typing import Callable, Dict, List, Optional
+
+LATITUDES = [-60.0, -33.9, 0.0, 40.7, 64.1, 78.2]
+LONGITUDE = 10.0
+DATES = [date(2026, 3, 20), date(2026, 6, 21), date(2026, 12, 21)]
+MAGNITUDE_LIMITS = [2.5, 4.0, 6.0]
+
+
+def percentile(sorted_values: List[float], q: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    index = min(len(sorted_values) - 1, max(0, round(q / 100 * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+def clear_caches() -> None:
+    """Empty every in-process cache so each call exercises the full path."""
+    from stargaze.utils import satellite, weather
+    from stargaze.utils.astronomy import get_sky_snapshot_cache
+    from stargaze.utils.geocoding import get_geocoding_service
+
+    get_geocoding_service().clear()
+    get_sky_snapshot_cache().clear()
+    weather._forecast_cache.clear()
+    satellite._pass_cache.clear()
+
+
+def build_cases() -> Dict[str, List[Dict]]:
+    """Return the benchmark matrix: function name -> list of call cases."""
+    from stargaze.utils.astronomy import (
+        get_bright_stars,
+        get_moon_phase,
+        get_nearby_stars_constellation,
+        get_sky_events,
+        get_visible_planets,
+    )
+    from stargaze.utils.best_nights import get_best_nights
+    from stargaze.utils.satellite import get_satellite_passes
+    from stargaze.utils.weather import get_weather
+
+    from benchmarks.standins import site_query
+
+    cases: Dict[str, List[Dict]] = {}
+
+    def add(name: str, func: Callable, params: Dict, *args, **kwargs):
+        cases.setdefault(name, []).append({"func": func, "params": params, "args": args, "kwargs": kwargs})
+
+    for day in DATES:
+        add("get_moon_phase", get_moon_phase, {"date": day.isoformat()}, day)
+        for lat in LATITUDES:
+            params = {"lat": lat, "date": day.isoformat()}
+            location = site_query(lat, LONGITUDE)
+            add("get_visible_planets", get_visible_planets, params, lat, LONGITUDE, day)
+            add("get_sky_events", get_sky_events, params, location, day)
+            add("get_weather", get_weather, params, location, day)
+            for mag in MAGNITUDE_LIMITS:
+                mag_params = dict(params, max_magnitude=mag)
+                add("get_bright_stars", get_bright_stars, mag_params, lat, LONGITUDE, day, max_magnitude=mag)
+                add("get_nearby_stars_constellation", get_nearby_stars_constellation, mag_params,
+                    lat, LONGITUDE, day, max_magnitude=mag)
+
+    for lat in LATITUDES:
+        add("get_best_nights", get_best_nights, {"lat": lat}, site_query(lat, LONGITUDE), 14)
+        add("get_satellite_passes", get_satellite_passes, {"lat": lat}, site_query(lat, LONGITUDE), 3)
+    return cases
+
+
+def run_function(cases: List[Dict], repeat: int, warm: bool) -> Dict:
+    """Time every case of one function and measure its peak memory."""
+    timings = []
+    start = time.perf_counter()
+    for case in cases:
+        for _ in range(repeat):
+            if not warm:
+                clear_caches()
+            t0 = time.perf_counter()
+            case["func"](*case["args"], **case["kwargs"])
+            timings.append(time.perf_counter() - t0)
+    elapsed = time.perf_counter() - start
+
+    # Peak memory is measured on a separate call so tracing doesn't skew timings.
+    if not warm:
+        clear_caches()
+    case = cases[-1]
+    tracemalloc.start()
+    case["func"](*case["args"], **case["kwargs"])
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    timings.sort()
+    return {
+        "calls": len(timings),
+        "cases": len(cases),
+        "p50_ms": percentile(timings, 50) * 1000,
+        "p90_ms": percentile(timings, 90) * 1000,
+        "p99_ms": percentile(timings, 99) * 1000,
+        "mean_ms": statistics.fmean(timings) * 1000,
+        "throughput_per_s": len(timings) / elapsed,
+        "peak_memory_kb": peak / 1024,
+    }
+
+
+def environment() -> Dict:
+    """Describe the interpreter, key libraries and git revision of this run."""
+    import numpy
+    import skyfield
+
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True).stdout.strip()
+    except OSError:
+        commit = ""
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "numpy": numpy.__version__,
+        "skyfield": skyfield.__version__,
+        "commit": commit,
+    }
+
+
+def print_report(results: Dict[str, Dict], baseline: Optional[Dict[str, Dict]] = None) -> None:
+    header = f"{'function':<32}{'calls':>7}{'p50 ms':>10}{'p90 ms':>10}{'p99 ms':>10}{'ops/s':>10}{'peak KiB':>11}"
+    if baseline:
+        header += f"{'p50 vs base':>13}"
+    print(header)
+    print("-" * len(header))
+    for name, r in results.items():
+        line = (f"{name:<32}{r['calls']:>7}{r['p50_ms']:>10.2f}{r['p90_ms']:>10.2f}{r['p99_ms']:>10.2f}"
+                f"{r['throughput_per_s']:>10.1f}{r['peak_memory_kb']:>11.0f}")
+        if baseline and name in baseline:
+            change = (r["p50_ms"] / baseline[name]["p50_ms"] - 1) * 100
+            line += f"{change:>+12.1f}%"
+        print(line)
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--ephemeris", default="de421.bsp", help="path to a local de421.bsp")
+    parser.add_argument("--repeat", type=int, default=3, help="calls per case")
+    parser.add_argument("--only", nargs="*", help="benchmark only these functions")
+    parser.add_argument("--warm", action="store_true", help="keep caches between calls")
+    parser.add_argument("--latency", type=float, default=0.0, help="stand-in upstream latency in seconds")
+    parser.add_argument("--out", default=os.path.join("benchmarks", "results"), help="directory for JSON results")
+    parser.add_argument("--compare", help="previous results JSON to compare against")
+    args = parser.parse_args(argv)
+
+    # The data directory and upstream URLs must be set before stargaze is imported.
+    data_dir = tempfile.mkdtemp(prefix="stargaze-bench-")
+    os.environ["STARGAZE_DATA_DIR"] = data_dir
+
+    from benchmarks.standins import StandinConfig, StandinServer, UpstreamBehaviour
+
+    behaviour = UpstreamBehaviour(latency=args.latency)
+    server = StandinServer(StandinConfig(nominatim=behaviour, open_meteo=behaviour, n2yo=behaviour)).start()
+    os.environ.update(server.environ())
+
+    from benchmarks.fixtures import link_ephemeris, write_catalog_fixture
+
+    link_ephemeris(data_dir, args.ephemeris)
+    write_catalog_fixture(data_dir)
+    server.install_geocoder()
+
+    try:
+        cases = build_cases()
+        if args.only:
+            cases = {name: c for name, c in cases.items() if name in args.only}
+
+        # Load the ephemeris, catalog and indexes once before timing.
+        for name, function_cases in cases.items():
+            case = function_cases[0]
+            case["func"](*case["args"], **case["kwargs"])
+        server.reset_counts()
+
+        results = {}
+        for name, function_cases in cases.items():
+            results[name] = run_function(function_cases, args.repeat, args.warm)
+            results[name]["upstream_calls"] = server.reset_counts()
+    finally:
+        server.stop()
+
+    baseline = None
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)["results"]
+    print_report(results, baseline)
+
+    os.makedirs(args.out, exist_ok=True)
+    stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+    path = os.path.join(args.out, f"bench-{stamp}.json")
+    with open(path, "w") as f:
+        json.dump({
+            "timestamp": stamp,
+            "environment": environment(),
+            "settings": {"repeat": args.repeat, "warm": args.warm, "latency": args.latency},
+            "matrix": {"latitudes": LATITUDES, "dates": [d.isoformat() for d in DATES], "magnitudes": MAGNITUDE_LIMITS},
+            "results": results,
+        }, f, indent=2)
+    print(f"\nSaved {path}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,294 @@
+"""Local stand-ins for the Nominatim, Open-Meteo, N2YO and OpenAI chat APIs.
+
+One threaded HTTP server answers all four APIs with deterministic,
+plausibly shaped responses, so benchmarks and load tests run without
+network access. Latency and error injection are configurable per API.
+
+Nominatim queries of the form "site <lat> <lon>" geocode to those
+coordinates; any other query is not found.
+
+The chat endpoint plays a scripted model: for a user message it calls
+the first offered function whose keywords match the current question,
+with the "site" location and ISO date found in the question or its
+context; once a function result is in, it
+answers with a summary of it. Both the legacy ``functions`` and the
+``tools`` request formats are supported, streamed or not.
+"""
+import json
+import random
+import re
+import threading
+import time
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Optional
+from urllib.parse import parse_qs, urlparse
+
+SITE_PATTERN = re.compile(r"^site\s+(-?\d+(?:\.\d+)?)\s+(-?\d+(?:\.\d+)?)$")
+SITE_MENTION = re.compile(r"\bsite\s+-?\d+(?:\.\d+)?\s+-?\d+(?:\.\d+)?")
+ISO_DATE = re.compile(r"\b\d{4}-\d{2}-\d{2}\b")
+
+# Functions the scripted model calls, first match wins.
+CHAT_FUNCTION_KEYWORDS = [
+    ("fetch_best_nights", re.compile(r"\b(best|clearest) nights?\b|\bwhich night\b", re.I)),
+    ("fetch_weather", re.compile(r"\b(weather|cloud\w*|rain|temperature)\b", re.I)),
+    ("fetch_moon_phase", re.compile(r"\bmoon\b", re.I)),
+    ("fetch_satellite_passes", re.compile(r"\b(iss|satellites?|space station)\b", re.I)),
+    ("fetch_sky_events", re.compile(r"\b(planets?|stars?|constellations?|sky)\b", re.I)),
+    ("fetch_night_report", re.compile(r"\bstargaz\w*\b", re.I)),
+]
+
+
+def site_query(lat: float, lon: float) -> str:
+    """Location string the stand-in Nominatim geocodes to (lat, lon)."""
+    return f"site {lat} {lon}"
+
+
+@dataclass
+class UpstreamBehaviour:
+    """Latency and error injection for one stand-in API."""
+
+    latency: float = 0.0  # seconds added to every response
+    jitter: float = 0.0  # extra uniformly distributed seconds
+    error_rate: float = 0.0  # fraction of requests answered with HTTP 503
+
+
+@dataclass
+class StandinConfig:
+    nominatim: UpstreamBehaviour = field(default_factory=UpstreamBehaviour)
+    open_meteo: UpstreamBehaviour = field(default_factory=UpstreamBehaviour)
+    n2yo: UpstreamBehaviour = field(default_factory=UpstreamBehaviour)
+    openai: UpstreamBehaviour = field(default_factory=UpstreamBehaviour)
+    seed: Optional[int] = 0
+
+
+class _Handler(BaseHTTPRequestHandler):
+    server: "StandinServer"
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        query = {k: v[0] for k, v in parse_qs(url.query).items()}
+
+        if url.path.startswith("/search"):
+            api, handler = "nominatim", self._nominatim
+        elif url.path.startswith("/v1/forecast"):
+            api, handler = "open_meteo", self._open_meteo
+        elif url.path.startswith("/visualpasses/"):
+            api, handler = "n2yo", self._n2yo
+        else:
+            self._send(404, {"error": "unknown endpoint"})
+            return
+
+        if self._inject(api):
+            self._send(200, handler(url.path, query))
+
+    def do_POST(self):
+        if not urlparse(self.path).path.endswith("/chat/completions"):
+            self._send(404, {"error": "unknown endpoint"})
+            return
+        payload = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+        if not self._inject("openai"):
+            return
+        message = self._chat(payload)
+        self.server.count("openai_prompt_tokens", len(json.dumps(payload["messages"])) // 4)
+        if payload.get("stream"):
+            self._send_stream(payload, message)
+        else:
+            self._send(200, self._completion(payload, message))
+
+    def _inject(self, api: str) -> bool:
+        """Count the request and apply latency/errors; False if an error was sent."""
+        behaviour = getattr(self.server.config, api)
+        self.server.count(api)
+        delay = behaviour.latency + self.server.uniform(0, behaviour.jitter)
+        if delay:
+            time.sleep(delay)
+        if behaviour.error_rate and self.server.uniform(0, 1) < behaviour.error_rate:
+            self.server.count(f"{api}_errors")
+            self._send(503, {"error": "injected failure"})
+            return False
+        return True
+
+    def _send(self, status: int, payload):
+        body = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_stream(self, payload, message: Dict) -> None:
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.end_headers()
+        base = {"id": "chatcmpl-standin", "object": "chat.completion.chunk", "created": int(time.time()),
+                "model": payload.get("model", "standin")}
+        content = message.get("content") or ""
+        deltas = [{"role": "assistant", "content": ""}]
+        deltas += [{"content": content[i:i + 40]} for i in range(0, len(content), 40)]
+        if "function_call" in message:
+            deltas.append({"function_call": message["function_call"]})
+        if "tool_calls" in message:
+            deltas.append({"tool_calls": [dict(call, index=0) for call in message["tool_calls"]]})
+        for delta in deltas:
+            chunk = dict(base, choices=[{"index": 0, "delta": delta, "finish_reason": None}])
+            self.wfile.write(f"data: {json.dumps(chunk)}\n\n".encode())
+        final = dict(base, choices=[{"index": 0, "delta": {}, "finish_reason": self._finish_reason(message)}])
+        self.wfile.write(f"data: {json.dumps(final)}\n\ndata: [DONE]\n\n".encode())
+
+    @staticmethod
+    def _finish_reason(message: Dict) -> str:
+        if "function_call" in message:
+            return "function_call"
+        return "tool_calls" if "tool_calls" in message else "stop"
+
+    def _completion(self, payload, message: Dict) -> Dict:
+        prompt_tokens = len(json.dumps(payload["messages"])) // 4
+        completion_tokens = len(json.dumps(message)) // 4
+        return {
+            "id": "chatcmpl-standin",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": payload.get("model", "standin"),
+            "choices": [{"index": 0, "message": message, "finish_reason": self._finish_reason(message)}],
+            "usage": {"prompt_tokens": prompt_tokens, "completion_tokens": completion_tokens,
+                      "total_tokens": prompt_tokens + completion_tokens},
+        }
+
+    def _chat(self, payload) -> Dict:
+        """The scripted model's next assistant message."""
+        functions = {f["name"]: f for f in payload.get("functions", [])}
+        functions.update({t["function"]["name"]: t["function"] for t in payload.get("tools", [])})
+        last = payload["messages"][-1]
+        if last["role"] in ("function", "tool"):
+            return {"role": "assistant", "content": "Here's what I found:\n" + str(last.get("content") or "")[:400]}
+
+        # Agent inputs carry the session context before "Current question:".
+        text = str(last.get("content") or "")
+        question = text.rsplit("Current question:", 1)[-1]
+        name = next((n for n, pattern in CHAT_FUNCTION_KEYWORDS if n in functions and pattern.search(question)), None)
+        if name is None:
+            return {"role": "assistant", "content": "Clear, dark, moonless skies away from city lights are best for stargazing."}
+
+        parameters = functions[name].get("parameters", {}).get("properties", {})
+        site = SITE_MENTION.search(question) or SITE_MENTION.search(text)
+        iso = ISO_DATE.search(question) or ISO_DATE.search(text)
+        arguments = {}
+        if "location" in parameters:
+            if not site:
+                return {"role": "assistant", "content": "Which location should I check?"}
+            arguments["location"] = site.group()
+        if "date_str" in parameters:
+            arguments["date_str"] = iso.group() if iso else date.today().isoformat()
+        call = {"name": name, "arguments": json.dumps(arguments)}
+        if "functions" in payload:
+            return {"role": "assistant", "content": None, "function_call": call}
+        return {"role": "assistant", "content": None,
+                "tool_calls": [{"id": f"call_{name}", "type": "function", "function": call}]}
+
+    def _nominatim(self, path: str, query: Dict[str, str]):
+        match = SITE_PATTERN.match(query.get("q", "").strip().lower())
+        if not match:
+            return []
+        lat, lon = match.groups()
+        return [{"lat": lat, "lon": lon, "display_name": query["q"], "importance": 1.0}]
+
+    def _open_meteo(self, path: str, query: Dict[str, str]):
+        lat = float(query.get("latitude", 0))
+        if "start_date" in query:
+            start = date.fromisoformat(query["start_date"])
+            days = (date.fromisoformat(query["end_date"]) - start).days + 1
+        else:
+            start = datetime.now(timezone.utc).date()
+            days = int(query.get("forecast_days", 7))
+
+        times, clouds, temps = [], [], []
+        for hour in range(days * 24):
+            t = datetime.combine(start, datetime.min.time()) + timedelta(hours=hour)
+            times.append(t.strftime("%Y-%m-%dT%H:%M"))
+            clouds.append((hour * 37 + int(abs(lat) * 10)) % 101)
+            temps.append(round(25 - abs(lat) * 0.4 + 5 * ((hour % 24) - 12) / 12, 1))
+        return {"timezone": "GMT", "hourly": {"time": times, "cloudcover": clouds, "temperature_2m": temps}}
+
+    def _n2yo(self, path: str, query: Dict[str, str]):
+        parts = path.split("/")
+        satellite_id, days = int(parts[2]), int(parts[6])
+        now = int(time.time())
+        passes = []
+        for i in range(min(days, 10)):
+            start = now + i * 86400 + (satellite_id % 7) * 3600
+            duration = 300 + satellite_id % 300
+            passes.append({
+                "startUTC": start,
+                "endUTC": start + duration,
+                "duration": duration,
+                "maxEl": 20 + satellite_id % 60,
+                "mag": -1.5,
+            })
+        return {"info": {"satid": satellite_id, "passescount": len(passes)}, "passes": passes}
+
+
+class StandinServer(ThreadingHTTPServer):
+    """Threaded HTTP server hosting every stand-in API on one local port."""
+
+    daemon_threads = True
+
+    def __init__(self, config: Optional[StandinConfig] = None, port: int = 0):
+        super().__init__(("127.0.0.1", port), _Handler)
+        self.config = config or StandinConfig()
+        self.counts: Dict[str, int] = {}
+        self._random = random.Random(self.config.seed)
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.server_port}"
+
+    def count(self, key: str, value: int = 1) -> None:
+        with self._lock:
+            self.counts[key] = self.counts.get(key, 0) + value
+
+    def uniform(self, low: float, high: float) -> float:
+        with self._lock:
+            return self._random.uniform(low, high)
+
+    def reset_counts(self) -> Dict[str, int]:
+        """Return the request counters and start counting from zero."""
+        with self._lock:
+            counts, self.counts = self.counts, {}
+        return counts
+
+    def start(self) -> "StandinServer":
+        self._thread = threading.Thread(target=self.serve_forever, name="standins", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self.shutdown()
+        self.server_close()
+
+    def environ(self) -> Dict[str, str]:
+        """Environment variables pointing the stargaze clients at this server."""
+        return {
+            "OPEN_METEO_URL": f"{self.url}/v1/forecast",
+            "N2YO_BASE_URL": self.url,
+            "N2YO_API_KEY": "standin",
+            "SATELLITE_BACKEND": "n2yo",
+            "OPENAI_API_KEY": "standin",
+            "OPENAI_API_BASE": f"{self.url}/v1",
+            "OPENAI_BASE_URL": f"{self.url}/v1",
+        }
+
+    def install_geocoder(self) -> None:
+        """Route the shared geocoding service to the stand-in Nominatim."""
+        from geopy.geocoders import Nominatim
+
+        from stargaze.utils.geocoding import GeocodingService, set_geocoding_service
+
+        geocoder = Nominatim(user_agent="stargaze_benchmarks", domain=self.url.split("://")[1], scheme="http")
+        set_geocoding_service(GeocodingService(geocoder=geocoder, min_delay_seconds=0))
@@ -1,17 +1,40 @@
-from astral import moon
-from geopy.geocoders import Nominatim
-from skyfield.data import hipparcos
-from skyfield.api import load, wgs84, Star
-from datetime import datetime, timezone, date as DateType
+from skyfield.api import wgs84, Star
+from datetime import date as DateType, datetime, timedelta, timezone
+from functools import lru_cache
 from typing import List, Dict, Union
+import logging
+import os
 import numpy as np
 
-# Load planetary ephemeris
-planets = load('de421.bsp')
-ts = load.timescale()
-with load.open(hipparcos.URL) as f:
-    star_df = hipparcos.load_dataframe(f)
+from stargaze.utils import telemetry
+from stargaze.utils.geocoding import geocode
+from stargaze.utils.catalog import StarIndex, positions_to_unit_vectors
+from stargaze.utils.constellations import constellation_name, constellation_of, star_name
+from stargaze.utils.moon import get_moon_phases
+from stargaze.utils.resources import get_bright_catalog, get_ephemeris, get_star_catalog
+from stargaze.utils.snapshots import POPULAR_CITIES, SkySnapshotCache
+from stargaze.utils.timezones import local_time
 
+logger = logging.getLogger(__name__)
+
+# Optional SQLite file that keeps sky snapshots across processes and restarts.
+SKY_SNAPSHOT_PATH = os.getenv('SKY_SNAPSHOT_PATH')
+
+PLANET_KEYS = {
+    'Mercury': 'mercury',
+    'Venus': 'venus',
+    'Mars': 'mars',
+    'Jupiter': 'jupiter barycenter',
+    'Saturn': 'saturn barycenter',
+}
+
+@lru_cache(maxsize=1)
+def get_star_index() -> StarIndex:
+    """Returns the spatial index over the full Hipparcos catalog, built once."""
+    with telemetry.span("astronomy.build_star_index"):
+        return StarIndex.from_catalog(get_star_catalog())
+
+@telemetry.traced()
 def get_moon_phase(date: DateType) -> str:
     """Returns the moon phase for a given date.
     
@@ -19,21 +42,15 @@ def get_moon_phase(date: DateType) -> str:
         date (datetime.date): The date for which to get the moon phase.
     
     Returns:
-        str: Description of the moon phase.
+        str: Description of the moon phase at noon UTC, with the true
+        illuminated fraction from the ephemeris.
     
     """
-    phase = moon.phase(date)
-    if phase < 7:
-        desc = "Waxing Crescent"
-    elif phase < 14:
-        desc = "First Quarter"
-    elif phase < 21:
-        desc = "Waning Gibbous"
-    else:
-        desc = "New Moon"
-    illumination = round((phase / 29) * 100)
-    return f"{desc} ({illumination}% illumination)"
+    phases = get_moon_phases([date], hour=12)
+    illumination = round(float(phases["illumination"][0]) * 100)
+    return f"{phases['name'][0]} ({illumination}% illumination)"
 
+@telemetry.traced()
 def get_visible_planets(lat: float, lon: float, date: DateType) -> List[str]:
     """Returns a list of visible planets for a given location and date.
     
@@ -44,35 +61,26 @@ def get_visible_planets(lat: float, lon: float, date: DateType) -> List[str]:
         date (datetime.date): The date for which to check visibility.
     
     Returns:
-        List[str]: List of visible planets with their altitudes.
+        List[str]: List of visible planets with their altitudes and constellations.
     """
-    local_dt = datetime(date.year, date.month, date.day, 22, 0)
-    utc_dt = local_dt.astimezone(timezone.utc)
-    t = ts.from_datetime(utc_dt)
+    t = local_time(lat, lon, date, hour=22)
 
+    planets = get_ephemeris()
     earth = planets['earth']
     location = earth + wgs84.latlon(latitude_degrees=lat, longitude_degrees=lon)
 
-    planet_keys = {
-        'Mercury': 'mercury',
-        'Venus': 'venus',
-        'Mars': 'mars',
-        'Jupiter': 'jupiter barycenter',
-        'Saturn': 'saturn barycenter',
-    }
-
     visible_planets = []
-    for name, key in planet_keys.items():
+    for name, key in PLANET_KEYS.items():
         try:
             planet = planets[key]
             astrometric = location.at(t).observe(planet)
             try:
                 alt, az, distance = astrometric.apparent().altaz()
             except ValueError as e:
-                print(f"Failed to unpack altaz values: {e}")
+                logger.warning("Failed to unpack altaz values for %s: %s", name, e)
                 continue  # skip this star or planet            
             if alt.degrees > 10:
-                visible_planets.append(f"{name} (altitude: {alt.degrees:.1f}°)")
+                visible_planets.append(f"{name} (altitude: {alt.degrees:.1f}°, in {constellation_of(astrometric)})")
         except KeyError:
             continue
 
@@ -91,39 +99,91 @@ def star_from_hipparcos_row(row) -> Star:
 
     return Star(ra_hours=ra_hours, dec_degrees=dec_degrees)
 
-def get_bright_stars(lat: float, lon: float, date: DateType) -> List[str]:
+def stars_from_catalog(rows) -> Star:
+    """Create a single array-valued Star from catalog rows.
+    
+    Args:
+        rows (np.ndarray): Rows of the compact star catalog.
+    Returns:
+        Star: A Skyfield Star whose coordinates are arrays, one entry per row.
+    """
+    return Star(
+        ra_hours=np.asarray(rows['ra_hours'], dtype=float),
+        dec_degrees=np.asarray(rows['dec_degrees'], dtype=float),
+    )
+
+@telemetry.traced()
+def get_bright_stars(lat: float, lon: float, date: DateType, max_magnitude: float = 2.5, min_altitude: float = 10) -> List[str]:
     """Returns a list of bright stars visible at a given location and date.
     
+    All stars are observed in a single vectorized pass; the result is
+    sorted brightest first.
+    
     Args:
         lat (float): Latitude of the observer's location.
         lon (float): Longitude of the observer's location.
         date (datetime.date): The date for which to check visibility.   
+        max_magnitude (float): Only consider stars brighter than this magnitude.
+        min_altitude (float): Minimum altitude in degrees for a star to count as visible.
     Returns:
         List[str]: List of bright stars with their altitudes and magnitudes.
     """
-    local_dt = datetime(date.year, date.month, date.day, 22, 0)
-    utc_dt = local_dt.astimezone(timezone.utc)
-    t = ts.from_datetime(utc_dt)
+    t = local_time(lat, lon, date, hour=22)
 
+    planets = get_ephemeris()
     earth = planets['earth']
     location = earth + wgs84.latlon(latitude_degrees=lat, longitude_degrees=lon)
 
-    bright_stars = star_df[star_df['magnitude'] < 2.5]
-    visible_stars = []
+    bright_stars = get_bright_catalog(max_magnitude)
+    if len(bright_stars) == 0:
+        return []
 
-    for hip_id, row in bright_stars.iterrows():
-        try:
-            star = star_from_hipparcos_row(row)  # Make sure this returns a valid Star object
-            alt, az, _ = location.at(t).observe(star).apparent().altaz()
-        except Exception as e:
-            print(f"Skipping star HIP {hip_id} due to error: {e}")
-            continue  # Skip this star if anything goes wrong
+    stars = stars_from_catalog(bright_stars)
+    alt, az, _ = location.at(t).observe(stars).apparent().altaz()
+
+    altitudes = alt.degrees
+    magnitudes = bright_stars['magnitude']
+    hip_ids = bright_stars['hip']
+
+    # The catalog is stored brightest first, so this is already in order.
+    visible = np.flatnonzero(altitudes > min_altitude)
+
+    return [
+        f"{star_name(hip_ids[i])} (alt {altitudes[i]:.1f}°, mag {magnitudes[i]:.1f})"
+        for i in visible
+    ]
+
+def zenith_unit_vectors(lat, lon, t) -> np.ndarray:
+    """Returns the ICRS unit vector of the zenith for observers and times.
+    
+    Args:
+        lat (float or array_like): Latitude(s) of the observer.
+        lon (float or array_like): Longitude(s) of the observer.
+        t (Time): A Skyfield time, scalar or array-valued.
+    
+    Returns:
+        np.ndarray: Array of shape (3,) or (N, 3) of unit vectors.
+    """
+    observer = wgs84.latlon(latitude_degrees=lat, longitude_degrees=lon).at(t)
+    zenith = observer.from_altaz(alt_degrees=90, az_degrees=0)
+    return positions_to_unit_vectors(zenith.position.au)
 
-    if alt.degrees > 10:
-        visible_stars.append(f"HIP {hip_id} (alt {alt.degrees:.1f}°, mag {row['magnitude']:.1f})")
-    return visible_stars
+def _cone_results(rows: np.ndarray, distances: np.ndarray) -> List[Dict[str, Union[str, float]]]:
+    """Build result dicts for a cone search over the star index."""
+    index = get_star_index()
+    return [
+        {
+            "hip_id": int(index.hip_ids[i]),
+            "name": star_name(index.hip_ids[i]),
+            "magnitude": round(float(index.magnitudes[i]), 2),
+            "constellation": constellation_name(index.constellations[i]) if index.constellations is not None else "Unknown",
+            "angular_distance_deg": round(float(d), 2),
+        }
+        for i, d in zip(rows, distances)
+    ]
 
-def get_nearby_stars_constellation(lat: float, lon: float, date: DateType, max_distance_deg: float = 10) -> List[Dict[str, Union[str, float]]]:
+@telemetry.traced()
+def get_nearby_stars_constellation(lat: float, lon: float, date: DateType, max_distance_deg: float = 10, max_magnitude: float = 3.5) -> List[Dict[str, Union[str, float]]]:
     """Returns stars near the zenith for a given location and date.
     
     Args:
@@ -131,77 +191,54 @@ def get_nearby_stars_constellation(lat: float, lon: float, date: DateType, max_d
         lon (float): Longitude of the observer's location.
         date (datetime.date): The date for which to check visibility.
         max_distance_deg (float): Maximum angular distance from zenith in degrees.
+        max_magnitude (float): Only return stars brighter than this magnitude.
     
     Returns:
-        List[Dict[str, Union[str, float]]]: List of stars
+        List[Dict[str, Union[str, float]]]: List of stars, nearest to the zenith first.
     """
-    local_dt = datetime(date.year, date.month, date.day, 22, 0)
-    utc_dt = local_dt.astimezone(timezone.utc)
-    t = ts.from_datetime(utc_dt)
-
-    observer = wgs84.latlon(latitude_degrees=lat, longitude_degrees=lon).at(t)
-    
-    # Get zenith position as a skyfield position object
-    zenith = observer.from_altaz(alt_degrees=90, az_degrees=0)
-    zenith_ra, zenith_dec, _ = zenith.radec()  # Correctly get RA and Dec
-
-    # Convert zenith RA/Dec to unit vector for angular distance calc
-    zenith_vec = np.array([
-        np.cos(np.radians(zenith_dec.degrees)) * np.cos(np.radians(zenith_ra.hours * 15)),
-        np.cos(np.radians(zenith_dec.degrees)) * np.sin(np.radians(zenith_ra.hours * 15)),
-        np.sin(np.radians(zenith_dec.degrees))
-    ])
-
-    results = []
-    bright_stars = star_df[star_df['magnitude'] < 3.5]
-
-    for hip_id, row in bright_stars.iterrows():
-        # Create Star from Hipparcos data columns
-        star = Star(ra_hours=row['ra_hours'], dec_degrees=row['dec_degrees'])
-        
-        ra_deg = star.ra.hours * 15
-        dec_deg = star.dec.degrees
+    t = local_time(lat, lon, date, hour=22)
 
-        star_vec = np.array([
-            np.cos(np.radians(dec_deg)) * np.cos(np.radians(ra_deg)),
-            np.cos(np.radians(dec_deg)) * np.sin(np.radians(ra_deg)),
-            np.sin(np.radians(dec_deg))
-        ])
-
-        cos_angle = np.clip(np.dot(zenith_vec, star_vec), -1.0, 1.0)
-        angle_deg = np.degrees(np.arccos(cos_angle))
-        name = row.get('proper_name') or f"HIP {hip_id}"
+    zenith_vec = zenith_unit_vectors(lat, lon, t)
+    [(rows, distances)] = get_star_index().cone_search(zenith_vec, max_distance_deg, max_magnitude)
+    return _cone_results(rows, distances)
 
+@telemetry.traced()
+def get_stars_near_planet(lat: float, lon: float, date: DateType, planet_name: str, max_distance_deg: float = 5, max_magnitude: float = 3.5) -> List[Dict[str, Union[str, float]]]:
+    """Returns catalog stars close to a planet as seen from a location.
+    
+    Args:
+        lat (float): Latitude of the observer's location.
+        lon (float): Longitude of the observer's location.
+        date (datetime.date): The date for which to check visibility.
+        planet_name (str): One of the names in PLANET_KEYS (e.g. "Jupiter").
+        max_distance_deg (float): Maximum angular distance from the planet in degrees.
+        max_magnitude (float): Only return stars brighter than this magnitude.
+    
+    Returns:
+        List[Dict[str, Union[str, float]]]: List of stars, nearest to the planet first.
+    """
+    t = local_time(lat, lon, date, hour=22)
 
-        if angle_deg <= max_distance_deg:
-            results.append({
-                "hip_id": hip_id,
-                "name": name,
-                "magnitude": row['magnitude'],
-                "constellation": row.get('constellation', 'Unknown'),
-                "angular_distance_deg": round(angle_deg, 2)
-            })
+    planets = get_ephemeris()
+    location = planets['earth'] + wgs84.latlon(latitude_degrees=lat, longitude_degrees=lon)
+    astrometric = location.at(t).observe(planets[PLANET_KEYS[planet_name]])
+    planet_vec = positions_to_unit_vectors(astrometric.position.au)
 
-    results.sort(key=lambda x: x['angular_distance_deg'])
-    return results
+    [(rows, distances)] = get_star_index().cone_search(planet_vec, max_distance_deg, max_magnitude)
+    return _cone_results(rows, distances)
 
-def get_sky_events(location: str, date: DateType) -> List[Union[str, List[Dict[str, Union[str, float]]]]]:
-    """Returns visible sky events for a location and date.
+def compute_sky_events(lat: float, lon: float, date: DateType) -> List[str]:
+    """Computes the sky event summary for a location and date.
     
     Args:
-        location (str): Name of the location (e.g., "Paris, France").
+        lat (float): Latitude of the observer's location.
+        lon (float): Longitude of the observer's location.
         date (datetime.date): The date for which to check sky events.
     
     Returns:
-        List[Union[str, List[Dict[str, Union[str, float]]]]]: List of visible planets, bright stars, and nearby stars.
-        """
-    geolocator = Nominatim(user_agent="stargazing_app")
-    loc = geolocator.geocode(location)
-    if not loc:
-        return ["Location not found."]
-
-    lat, lon = loc.latitude, loc.longitude
-    events: List[Union[str, List[Dict[str, Union[str, float]]]]] = []
+        List[str]: Lines describing visible planets, bright stars and stars near the zenith.
+    """
+    events: List[str] = []
 
     # Planets
     planets_visible = get_visible_planets(lat, lon, date)
@@ -225,6 +262,45 @@ def get_sky_events(location: str, date: DateType) -> List[Union[str, List[Dict[s
     nearby_stars = get_nearby_stars_constellation(lat, lon, date)
     events.append("✨ Stars Near Zenith:")
     for star in nearby_stars:
-        events.append(f" - {star['name']} (mag {star['magnitude']}, dist {star['angular_distance_deg']}°)")
+        events.append(f" - {star['name']} in {star['constellation']} (mag {star['magnitude']}, dist {star['angular_distance_deg']}°)")
 
     return events
+
+@lru_cache(maxsize=1)
+def get_sky_snapshot_cache() -> SkySnapshotCache:
+    """Returns the process-wide cache of sky event snapshots."""
+    return SkySnapshotCache(compute_sky_events, cache_path=SKY_SNAPSHOT_PATH)
+
+def warm_sky_snapshots(days: int = 2) -> int:
+    """Precomputes sky snapshots for POPULAR_CITIES for the next few dates.
+    
+    Args:
+        days (int): Number of dates to warm, starting today (UTC).
+    
+    Returns:
+        int: Number of snapshots warmed.
+    """
+    today = datetime.now(timezone.utc).date()
+    dates = [today + timedelta(days=i) for i in range(days)]
+    return get_sky_snapshot_cache().warm(POPULAR_CITIES.values(), dates)
+
+@telemetry.traced()
+def get_sky_events(location: str, date: DateType) -> List[Union[str, List[Dict[str, Union[str, float]]]]]:
+    """Returns visible sky events for a location and date.
+    
+    Results are shared by every location in the same ~28 km grid cell
+    (see SkySnapshotCache), so repeated and nearby questions are lookups.
+    
+    Args:
+        location (str): Name of the location (e.g., "Paris, France").
+        date (datetime.date): The date for which to check sky events.
+    
+    Returns:
+        List[Union[str, List[Dict[str, Union[str, float]]]]]: List of visible planets, bright stars, and nearby stars.
+        """
+    coords = geocode(location)
+    if not coords:
+        return ["Location not found."]
+
+    lat, lon = coords
+    return list(get_sky_snapshot_cache().get(lat, lon, date))
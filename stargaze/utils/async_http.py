@@ -0,0 +1,167 @@
+import asyncio
+import random
+import weakref
+from typing import Any, Dict, Optional
+from urllib.parse import urlsplit
+
+import httpx
+
+from stargaze.utils import telemetry
+from stargaze.utils.http import DEFAULT_TIMEOUT, POOL_MAXSIZE, RETRY_STATUSES, get_breaker
+
+# Requests in flight per provider host. Nominatim's usage policy allows
+# one at a time; hosts not listed get DEFAULT_HOST_LIMIT.
+HOST_LIMITS = {
+    "nominatim.openstreetmap.org": 1,
+    "api.n2yo.com": 8,
+    "api.open-meteo.com": 8,
+}
+DEFAULT_HOST_LIMIT = 8
+
+# Retries after the first attempt, with full-jitter exponential backoff
+# capped at BACKOFF_CAP_SECONDS (or the server's Retry-After, if shorter).
+MAX_RETRIES = 2
+BACKOFF_BASE_SECONDS = 0.3
+BACKOFF_CAP_SECONDS = 5.0
+
+
+def backoff_delay(attempt: int, retry_after: Optional[str] = None) -> float:
+    """Returns the delay before retry number attempt (0-based).
+
+    Args:
+        attempt (int): Retries already made.
+        retry_after (Optional[str]): The response's Retry-After header, if any.
+
+    Returns:
+        float: Seconds to sleep.
+    """
+    if retry_after:
+        try:
+            return min(float(retry_after), BACKOFF_CAP_SECONDS)
+        except ValueError:
+            pass
+    return random.uniform(0, min(BACKOFF_CAP_SECONDS, BACKOFF_BASE_SECONDS * 2 ** attempt))
+
+
+class AsyncHTTPClient:
+    """Pooled keep-alive HTTP client for the async code paths.
+
+    Wraps one httpx.AsyncClient per event loop. Every GET is limited per
+    host, goes through the host's circuit breaker (shared with the sync
+    session in stargaze.utils.http) and is retried with jittered backoff
+    on connection errors, timeouts and 429/5xx responses.
+
+    Args:
+        timeout (Tuple[float, float]): (connect, read) timeout in seconds.
+        max_connections (int): Size of the connection pool.
+        host_limits (Dict[str, int]): Concurrent requests allowed per host.
+        max_retries (int): Retries after the first attempt.
+    """
+
+    def __init__(self, timeout=DEFAULT_TIMEOUT, max_connections: int = POOL_MAXSIZE,
+                 host_limits: Dict[str, int] = HOST_LIMITS, max_retries: int = MAX_RETRIES):
+        connect, read = timeout
+        self.host_limits = host_limits
+        self.max_retries = max_retries
+        self._client = httpx.AsyncClient(
+            timeout=httpx.Timeout(read, connect=connect),
+            limits=httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_connections),
+            headers={"User-Agent": "stargazing_app"},
+            follow_redirects=True,
+        )
+        self._semaphores: Dict[str, asyncio.Semaphore] = {}
+
+    def _semaphore(self, host: str) -> asyncio.Semaphore:
+        semaphore = self._semaphores.get(host)
+        if semaphore is None:
+            limit = self.host_limits.get(host.split(":")[0], DEFAULT_HOST_LIMIT)
+            semaphore = self._semaphores[host] = asyncio.Semaphore(limit)
+        return semaphore
+
+    async def get(self, url: str, params: Optional[Dict[str, Any]] = None,
+                  timeout: Optional[Any] = None, max_retries: Optional[int] = None) -> httpx.Response:
+        """Sends a GET, retrying transient failures.
+
+        Args:
+            url (str): Request URL.
+            params (Optional[Dict[str, Any]]): Query parameters.
+            timeout: Optional (connect, read) override for this request.
+            max_retries (Optional[int]): Override of the client's retries,
+                e.g. 0 for callers that rate limit each request themselves.
+
+        Returns:
+            httpx.Response: The final response; callers check its status.
+
+        Raises:
+            CircuitOpenError: If the host's circuit is open.
+            httpx.TransportError: If every attempt failed to get a response.
+        """
+        host = urlsplit(url).netloc
+        breaker = get_breaker(host)
+        breaker.check()
+        if timeout is not None:
+            timeout = httpx.Timeout(timeout[1], connect=timeout[0])
+        else:
+            timeout = httpx.USE_CLIENT_DEFAULT
+
+        try:
+            retries = self.max_retries if max_retries is None else max_retries
+            response = await self._send(host, url, params, timeout, retries)
+        except httpx.TransportError:
+            breaker.record_failure()
+            raise
+        except BaseException:
+            # Cancelled (deadlines, wait_for): free a half-open probe slot,
+            # or the circuit would never be probed again.
+            breaker.release()
+            raise
+        if response.status_code in RETRY_STATUSES:
+            breaker.record_failure()
+        else:
+            breaker.record_success()
+        return response
+
+    async def _send(self, host: str, url: str, params: Optional[Dict[str, Any]], timeout,
+                    max_retries: int) -> httpx.Response:
+        """Sends a GET with retries; returns the last response or raises the last transport error."""
+        attempt = 0
+        while True:
+            response, error = None, None
+            try:
+                async with self._semaphore(host):
+                    response = await self._client.get(url, params=params, timeout=timeout)
+            except httpx.TransportError as e:
+                error = e
+            if response is not None and (response.status_code not in RETRY_STATUSES or attempt >= max_retries):
+                return response
+            if attempt >= max_retries:
+                raise error
+            telemetry.increment("http.retries")
+            await asyncio.sleep(backoff_delay(attempt, response.headers.get("Retry-After") if response else None))
+            attempt += 1
+
+    async def aclose(self) -> None:
+        await self._client.aclose()
+
+
+_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, AsyncHTTPClient]" = weakref.WeakKeyDictionary()
+
+
+def get_async_client() -> AsyncHTTPClient:
+    """Returns the pooled client for the running event loop.
+
+    httpx connections are bound to the loop that opened them, so each
+    loop (e.g. one per asyncio.run call) gets its own pool.
+    """
+    loop = asyncio.get_running_loop()
+    client = _clients.get(loop)
+    if client is None:
+        client = _clients[loop] = AsyncHTTPClient()
+    return client
+
+
+async def close_async_client() -> None:
+    """Close the running loop's pooled client, if it has one."""
+    client = _clients.pop(asyncio.get_running_loop(), None)
+    if client is not None:
+        await client.aclose()
@@ -0,0 +1,165 @@
+"""Batch sky computation for many locations and dates.
+
+Planet and bright-star altitudes are computed for every (site, date)
+combination with array-valued observers and time arrays, in chunks, so
+a thousand sites over a month cost a few dozen vectorized Skyfield
+calls rather than tens of thousands of scalar ones. Results are yielded
+one combination at a time and can be streamed as JSON lines:
+
+    python -m stargaze.utils.batch --sites sites.csv --start 2026-10-16 --nights 30 > sky.jsonl
+"""
+import argparse
+import csv
+import json
+import sys
+from datetime import date as DateType, datetime, timedelta
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+from skyfield.api import wgs84
+
+from stargaze.utils import telemetry
+from stargaze.utils.astronomy import PLANET_KEYS, stars_from_catalog
+from stargaze.utils.night import altitude_grid
+from stargaze.utils.resources import get_bright_catalog, get_ephemeris, get_timescale
+from stargaze.utils.timezones import get_timezone
+
+# (site, date) combinations evaluated per vectorized call; bounds memory to
+# roughly CHUNK_SIZE x catalog stars floats regardless of the batch size.
+CHUNK_SIZE = 2048
+
+
+def read_sites(lines: Iterable[str]) -> List[Tuple[str, float, float]]:
+    """Parse "lat,lon[,name]" CSV lines (an optional header row is skipped).
+
+    Args:
+        lines (Iterable[str]): CSV text lines.
+
+    Returns:
+        List[Tuple[str, float, float]]: (name, lat, lon) per site; sites
+        without a name are named "lat,lon".
+    """
+    sites = []
+    for row in csv.reader(lines):
+        if not row or row[0].startswith('#'):
+            continue
+        try:
+            lat, lon = float(row[0]), float(row[1])
+        except ValueError:
+            continue  # header row
+        name = row[2].strip() if len(row) > 2 and row[2].strip() else f"{lat},{lon}"
+        sites.append((name, lat, lon))
+    return sites
+
+
+def _local_times(lats: np.ndarray, lons: np.ndarray, days: Sequence[DateType], hour: int):
+    """Returns one Skyfield Time array for local `hour` at each (site, day) pair."""
+    moments = [
+        datetime(day.year, day.month, day.day, hour, tzinfo=get_timezone(float(lat), float(lon)))
+        for lat, lon, day in zip(lats, lons, days)
+    ]
+    return get_timescale().from_datetimes(moments)
+
+
+def compute_sky_batch(
+    sites: Sequence[Tuple[str, float, float]],
+    dates: Sequence[DateType],
+    max_magnitude: float = 2.5,
+    min_altitude: float = 10,
+    hour: int = 22,
+    chunk_size: int = CHUNK_SIZE,
+) -> Iterator[Dict]:
+    """Computes visible planets and bright stars for every site and date.
+
+    Args:
+        sites (Sequence[Tuple[str, float, float]]): (name, lat, lon) per site.
+        dates (Sequence[datetime.date]): Local dates to evaluate.
+        max_magnitude (float): Faintest star magnitude to include.
+        min_altitude (float): Minimum altitude in degrees to count as visible.
+        hour (int): Local hour of the observation at each site.
+        chunk_size (int): (site, date) combinations per vectorized call.
+
+    Yields:
+        Dict: One record per (site, date), dates outermost, with the site
+        name, lat, lon, date, UTC time, "planets" as {name: altitude} and
+        "stars" as [hip, magnitude, altitude] triples, brightest first.
+    """
+    eph = get_ephemeris()
+    earth = eph['earth']
+    planets = {name: eph[key] for name, key in PLANET_KEYS.items()}
+    rows = get_bright_catalog(max_magnitude)
+    stars = stars_from_catalog(rows) if len(rows) else None
+    hip_ids = rows['hip'].tolist()
+    magnitudes = np.round(rows['magnitude'].astype(float), 2).tolist()
+
+    combos = [(site, day) for day in dates for site in sites]
+    for start in range(0, len(combos), chunk_size):
+        chunk = combos[start:start + chunk_size]
+        lats = np.array([site[1] for site, _ in chunk])
+        lons = np.array([site[2] for site, _ in chunk])
+        t = _local_times(lats, lons, [day for _, day in chunk], hour)
+
+        with telemetry.span("batch.chunk", size=len(chunk)):
+            observers = earth + wgs84.latlon(latitude_degrees=lats, longitude_degrees=lons)
+            at = observers.at(t)
+            planet_alts = {
+                name: at.observe(body).apparent().altaz()[0].degrees
+                for name, body in planets.items()
+            }
+
+            if stars is not None:
+                # Star places barely move within a chunk's dates, so observe the
+                # catalog once from the geocenter at the chunk's mean time.
+                t_ref = get_timescale().tt_jd(float(np.mean(t.tt)))
+                ra, dec, _ = earth.at(t_ref).observe(stars).apparent().radec(epoch='date')
+                star_alts = altitude_grid(lats, lons, t.gast, ra.hours, dec.degrees)
+            else:
+                star_alts = np.empty((0, len(chunk)))
+
+        # Round and convert once per chunk; per-record work is then list indexing.
+        planet_rounded = {name: np.round(alts, 1).tolist() for name, alts in planet_alts.items()}
+        visible = star_alts > min_altitude
+        star_rounded = np.round(star_alts, 1).T.tolist()
+        times = t.utc_iso()
+
+        for i, ((name, lat, lon), day) in enumerate(chunk):
+            alts = star_rounded[i]
+            yield {
+                "site": name,
+                "lat": lat,
+                "lon": lon,
+                "date": day.isoformat(),
+                "time_utc": times[i],
+                "planets": {
+                    planet: values[i]
+                    for planet, values in planet_rounded.items()
+                    if planet_alts[planet][i] > min_altitude
+                },
+                "stars": [[hip_ids[j], magnitudes[j], alts[j]] for j in np.flatnonzero(visible[:, i]).tolist()],
+            }
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Stream planet and bright-star altitudes for many sites and dates as JSON lines.")
+    parser.add_argument("--sites", default="-", help="CSV file of lat,lon[,name] rows ('-' for stdin)")
+    parser.add_argument("--start", type=DateType.fromisoformat, default=DateType.today(), help="first local date (YYYY-MM-DD)")
+    parser.add_argument("--nights", type=int, default=1, help="number of consecutive dates")
+    parser.add_argument("--max-magnitude", type=float, default=2.5)
+    parser.add_argument("--min-altitude", type=float, default=10)
+    parser.add_argument("--hour", type=int, default=22, help="local hour of the observation")
+    args = parser.parse_args(argv)
+
+    if args.sites == "-":
+        sites = read_sites(sys.stdin)
+    else:
+        with open(args.sites, newline="") as f:
+            sites = read_sites(f)
+    dates = [args.start + timedelta(days=i) for i in range(args.nights)]
+
+    for record in compute_sky_batch(sites, dates, args.max_magnitude, args.min_altitude, args.hour):
+        sys.stdout.write(json.dumps(record) + "\n")
+        sys.stdout.flush()
+
+
+if __name__ == "__main__":
+    main()
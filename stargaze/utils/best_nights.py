@@ -0,0 +1,152 @@
+from datetime import date as DateType, datetime, timedelta
+from typing import Dict, List, Optional
+
+import numpy as np
+from skyfield import almanac
+from skyfield.api import wgs84
+
+from stargaze.utils import telemetry
+from stargaze.utils.resources import get_ephemeris, get_timescale
+from stargaze.utils.timezones import get_timezone
+from stargaze.utils.weather import get_coords, get_forecast
+
+# Sun altitude below which the sky is astronomically dark.
+DARK_SUN_ALTITUDE = -18.0
+
+# How much a full moon at the zenith reduces an hour's score (0-1).
+MOON_WEIGHT = 0.6
+
+# Hours scoring at least this much can be part of a night's best window.
+GOOD_HOUR_SCORE = 0.5
+
+
+def score_hours(cloudcover: np.ndarray, sun_alt: np.ndarray, moon_alt: np.ndarray,
+                moon_illumination: np.ndarray) -> np.ndarray:
+    """Scores observing hours from 0 (useless) to 1 (clear, dark and moonless).
+
+    Args:
+        cloudcover (np.ndarray): Cloud cover in percent per hour (NaN if unknown).
+        sun_alt (np.ndarray): Sun altitude in degrees per hour.
+        moon_alt (np.ndarray): Moon altitude in degrees per hour.
+        moon_illumination (np.ndarray): Illuminated fraction of the moon per hour.
+
+    Returns:
+        np.ndarray: Score per hour; hours that are not dark score 0.
+    """
+    clear = 1 - np.nan_to_num(cloudcover, nan=100.0) / 100
+    moonlight = moon_illumination * np.clip(np.sin(np.radians(moon_alt)), 0, 1)
+    return np.where(sun_alt < DARK_SUN_ALTITUDE, clear * (1 - MOON_WEIGHT * moonlight), 0.0)
+
+
+def _best_window(scores: np.ndarray) -> Optional[slice]:
+    """Returns the run of consecutive good hours with the highest total score."""
+    best, best_total, start = None, 0.0, None
+    for i, good in enumerate(np.append(scores >= GOOD_HOUR_SCORE, False)):
+        if good and start is None:
+            start = i
+        elif not good and start is not None:
+            total = scores[start:i].sum()
+            if total > best_total:
+                best, best_total = slice(start, i), total
+            start = None
+    return best
+
+
+@telemetry.traced()
+def rank_nights(lat: float, lon: float, days: int = 7, start: Optional[DateType] = None) -> List[Dict]:
+    """Ranks the coming nights at a location for stargazing.
+
+    The hourly cloud-cover forecast is fetched once (from the shared
+    forecast cache); sun and moon positions for every forecast hour are
+    computed in one vectorized pass and every hour is scored together.
+
+    Args:
+        lat (float): Latitude of the observer's location.
+        lon (float): Longitude of the observer's location.
+        days (int): Number of nights to consider (at most FORECAST_DAYS - 1).
+        start (Optional[datetime.date]): First night (local date); defaults to today.
+
+    Returns:
+        List[Dict]: Nights from best to worst, each with "date", "score"
+        (equivalent hours of clear, dark, moonless sky), "dark_hours",
+        "cloudcover" (mean % over dark hours with a forecast, or None),
+        "moon_illumination" (%) and the best window as local
+        "best_start"/"best_end" (None if no hour is good enough). Nights
+        without any cloud forecast, or that the forecast does not cover
+        until the next noon, are omitted.
+    """
+    forecast = get_forecast(lat, lon)
+    if not forecast:
+        return []
+
+    tz = get_timezone(lat, lon)
+    local = [datetime.fromisoformat(t).replace(tzinfo=tz) for t in forecast["time"]]
+    cloudcover = np.array([np.nan if c is None else c for c in forecast["cloudcover"]], dtype=float)
+
+    # An hour belongs to the night that began on the previous noon's date.
+    nights = np.array([(t - timedelta(hours=12)).date().toordinal() for t in local])
+    first = (start or datetime.now(tz).date()).toordinal()
+    # The horizon ends at midnight, so the last night misses its morning hours.
+    covered = (local[-1] + timedelta(hours=1) - timedelta(hours=12)).date().toordinal()
+    keep = (nights >= first) & (nights < min(first + days, covered))
+    if not keep.any():
+        return []
+    local = [t for t, k in zip(local, keep) if k]
+    cloudcover, nights = cloudcover[keep], nights[keep]
+
+    eph = get_ephemeris()
+    t = get_timescale().from_datetimes(local)
+    observer = (eph['earth'] + wgs84.latlon(latitude_degrees=lat, longitude_degrees=lon)).at(t)
+    sun_alt = observer.observe(eph['sun']).apparent().altaz()[0].degrees
+    moon_alt = observer.observe(eph['moon']).apparent().altaz()[0].degrees
+    illumination = almanac.fraction_illuminated(eph, 'moon', t)
+    scores = score_hours(cloudcover, sun_alt, moon_alt, illumination)
+    dark = sun_alt < DARK_SUN_ALTITUDE
+
+    ranked = []
+    for night in np.unique(nights):
+        hours = np.flatnonzero(nights == night)
+        if np.isnan(cloudcover[hours]).all():
+            continue
+        night_dark = hours[dark[hours]]
+        dark_cloud = cloudcover[night_dark][~np.isnan(cloudcover[night_dark])]
+        window = _best_window(scores[hours])
+        ranked.append({
+            "date": DateType.fromordinal(int(night)).isoformat(),
+            "score": round(float(scores[hours].sum()), 1),
+            "dark_hours": int(len(night_dark)),
+            "cloudcover": round(float(dark_cloud.mean()), 0) if len(dark_cloud) else None,
+            "moon_illumination": round(float(illumination[hours].mean()) * 100),
+            "best_start": local[hours[window.start]].isoformat(timespec='minutes') if window else None,
+            "best_end": (local[hours[window.stop - 1]] + timedelta(hours=1)).isoformat(timespec='minutes') if window else None,
+        })
+    return sorted(ranked, key=lambda n: n["score"], reverse=True)
+
+
+@telemetry.traced()
+def get_best_nights(location: str, days: int = 7) -> List[str]:
+    """Returns the coming nights at a location ranked for stargazing, as text.
+
+    Args:
+        location (str): Location name (e.g., "Denver, CO").
+        days (int): Number of nights to consider.
+
+    Returns:
+        List[str]: One line per night, best first.
+    """
+    lat, lon = get_coords(location)
+    lines = []
+    for night in rank_nights(lat, lon, days):
+        if not night["dark_hours"]:
+            lines.append(f"{night['date']}: no astronomical darkness")
+            continue
+        window = (
+            f"best {night['best_start'][11:16]}-{night['best_end'][11:16]}"
+            if night["best_start"] else "no clear dark window"
+        )
+        cloud = f"{night['cloudcover']:.0f}% cloud" if night["cloudcover"] is not None else "no cloud forecast"
+        lines.append(
+            f"{night['date']}: score {night['score']} ({night['dark_hours']} dark hours, "
+            f"{cloud}, moon {night['moon_illumination']}% lit), {window}"
+        )
+    return lines
@@ -0,0 +1,250 @@
+import asyncio
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from contextlib import closing
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple, Union
+
+from stargaze.utils import telemetry
+
+
+def quantize_coords(lat: float, lon: float, step_deg: float) -> Tuple[float, float]:
+    """Snap coordinates to the centre of a grid cell.
+    
+    Nearby requests fall into the same cell and can share cached results.
+    
+    Args:
+        lat (float): Latitude in degrees.
+        lon (float): Longitude in degrees.
+        step_deg (float): Grid cell size in degrees.
+    
+    Returns:
+        Tuple[float, float]: Quantized (latitude, longitude).
+    """
+    return (
+        round(round(lat / step_deg) * step_deg, 6),
+        round(round(lon / step_deg) * step_deg, 6),
+    )
+
+
+class TTLCache:
+    """Thread-safe in-memory LRU cache whose entries expire after a TTL.
+    
+    Args:
+        maxsize (int): Maximum number of entries before the least recently
+            used one is evicted.
+        ttl (float): Default time-to-live of an entry in seconds.
+        name (Optional[str]): If given, hits and misses are also reported
+            as telemetry counters "cache.<name>.hit" / "cache.<name>.miss".
+    """
+
+    def __init__(self, maxsize: int = 1024, ttl: float = 300, name: Optional[str] = None):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.name = name
+        self.hits = 0
+        self.misses = 0
+        self._data: "OrderedDict[Hashable, Tuple[Any, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Return the cached value for key, or default if absent or expired."""
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is not None and entry[1] > time.monotonic():
+                self._data.move_to_end(key)
+                self.hits += 1
+                hit, value = True, entry[0]
+            else:
+                if entry is not None:
+                    del self._data[key]
+                self.misses += 1
+                hit, value = False, default
+        if self.name:
+            telemetry.increment(f"cache.{self.name}.{'hit' if hit else 'miss'}")
+        return value
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        """Store value under key for ttl seconds (the cache default if omitted)."""
+        expires = time.monotonic() + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            self._data[key] = (value, expires)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self) -> None:
+        """Drop every entry and reset the hit/miss counters."""
+        with self._lock:
+            self._data.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._data)
+
+
+_MISSING = object()
+
+# A TTL in seconds, or a function of the value returning one.
+TTL = Union[float, Callable[[Any], float]]
+
+
+class TieredCache:
+    """Cache with an in-memory LRU tier, an optional SQLite tier and a loader.
+
+    get_or_load looks a key up in memory, then on disk, and only then runs
+    the loader. Concurrent misses for the same key, sync or async, are
+    merged into one load whose result (or error, including cancellation)
+    every waiting caller receives. Values are stored on disk as JSON, so
+    tuples come back as lists.
+
+    Args:
+        table (str): SQLite table for the disk tier; bump its name when the
+            stored format changes so stale rows are ignored.
+        path (Optional[str]): SQLite file for the disk tier, or None to keep
+            values in memory only.
+        maxsize (int): Maximum number of values kept in memory.
+        ttl (float): Default time-to-live in seconds.
+        name (Optional[str]): If given, reported as telemetry counters
+            "cache.<name>.hit/miss", "<name>.disk_hit" and "<name>.merged".
+    """
+
+    def __init__(self, table: str, path: Optional[str] = None, maxsize: int = 1024,
+                 ttl: float = 300, name: Optional[str] = None):
+        self.table = table
+        self.path = path
+        self.ttl = ttl
+        self.name = name
+        self._memory = TTLCache(maxsize=maxsize, ttl=ttl, name=name)
+        self._inflight: Dict[str, Future] = {}
+        self._lock = threading.Lock()
+        if path:
+            with closing(self._connect()) as conn, conn:
+                conn.execute(f"CREATE TABLE IF NOT EXISTS {table} (key TEXT PRIMARY KEY, value TEXT, expires REAL)")
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """Returns the value cached in memory or on disk, or default."""
+        entry = self._memory.get(key)
+        if entry is not None:
+            return entry[0]
+        value = self._from_disk(key)
+        return default if value is _MISSING else value
+
+    def set(self, key: str, value: Any, ttl: Optional[TTL] = None) -> None:
+        """Store value in memory and, if enabled, on disk."""
+        seconds = self._seconds(value, ttl)
+        self._memory.set(key, (value,), ttl=seconds)
+        if self.path:
+            with closing(self._connect()) as conn, conn:
+                conn.execute(
+                    f"INSERT OR REPLACE INTO {self.table} (key, value, expires) VALUES (?, ?, ?)",
+                    (key, json.dumps(value, ensure_ascii=False), time.time() + seconds),
+                )
+
+    def get_or_load(self, key: str, loader: Callable[[], Any], ttl: Optional[TTL] = None,
+                    cacheable: Optional[Callable[[Any], bool]] = None) -> Any:
+        """Returns the cached value for key, loading and caching it on a miss.
+
+        Args:
+            key (str): Cache key.
+            loader (Callable[[], Any]): Computes the value on a miss.
+            ttl (Optional[TTL]): Seconds, or a function of the value; defaults to the cache TTL.
+            cacheable (Optional[Callable[[Any], bool]]): Returns False for
+                values that are returned but not stored (e.g. errors).
+
+        Returns:
+            Any: The cached or freshly loaded value.
+        """
+        entry, future, leader = self._claim(key)
+        if future is None:
+            return entry[0]
+        if not leader:
+            self._count("merged")
+            return future.result()
+
+        try:
+            value = self._from_disk(key)
+            if value is _MISSING:
+                value = loader()
+                self._store(key, value, ttl, cacheable)
+            future.set_result(value)
+            return value
+        except BaseException as e:  # including cancellation, so merged callers never hang
+            future.set_exception(e)
+            raise
+        finally:
+            with self._lock:
+                del self._inflight[key]
+
+    async def aget_or_load(self, key: str, loader: Callable[[], Awaitable[Any]], ttl: Optional[TTL] = None,
+                           cacheable: Optional[Callable[[Any], bool]] = None) -> Any:
+        """Async variant of get_or_load; loader returns an awaitable."""
+        entry, future, leader = self._claim(key)
+        if future is None:
+            return entry[0]
+        if not leader:
+            self._count("merged")
+            return await asyncio.wrap_future(future)
+
+        try:
+            value = self._from_disk(key)
+            if value is _MISSING:
+                value = await loader()
+                self._store(key, value, ttl, cacheable)
+            future.set_result(value)
+            return value
+        except BaseException as e:  # including cancellation, so merged callers never hang
+            future.set_exception(e)
+            raise
+        finally:
+            with self._lock:
+                del self._inflight[key]
+
+    def clear(self) -> None:
+        """Drop every value from the in-memory tier."""
+        self._memory.clear()
+
+    def _claim(self, key: str):
+        """Returns (memory entry, None, False) on a hit, else (None, in-flight future, is leader)."""
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                return entry, None, False
+            future = self._inflight.get(key)
+            leader = future is None
+            if leader:
+                future = self._inflight[key] = Future()
+            return None, future, leader
+
+    def _store(self, key: str, value: Any, ttl: Optional[TTL], cacheable: Optional[Callable[[Any], bool]]) -> None:
+        if cacheable is None or cacheable(value):
+            self.set(key, value, ttl)
+
+    def _seconds(self, value: Any, ttl: Optional[TTL]) -> float:
+        if ttl is None:
+            return self.ttl
+        return ttl(value) if callable(ttl) else ttl
+
+    def _from_disk(self, key: str) -> Any:
+        if not self.path:
+            return _MISSING
+        with closing(self._connect()) as conn:
+            row = conn.execute(f"SELECT value, expires FROM {self.table} WHERE key = ?", (key,)).fetchone()
+        if row is None or row[1] <= time.time():
+            return _MISSING
+        value = json.loads(row[0])
+        self._memory.set(key, (value,), ttl=row[1] - time.time())
+        self._count("disk_hit")
+        return value
+
+    def _count(self, event: str) -> None:
+        if self.name:
+            telemetry.increment(f"{self.name}.{event}")
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.path, timeout=30)
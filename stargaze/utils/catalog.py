@@ -0,0 +1,113 @@
+import numpy as np
+from scipy.spatial import cKDTree
+from typing import List, Optional, Tuple
+
+
+def radec_to_unit_vectors(ra_hours, dec_degrees) -> np.ndarray:
+    """Convert equatorial coordinates to unit vectors.
+    
+    Args:
+        ra_hours (array_like): Right ascension in hours.
+        dec_degrees (array_like): Declination in degrees.
+    
+    Returns:
+        np.ndarray: Array of shape (..., 3) of unit vectors.
+    """
+    ra = np.radians(np.asarray(ra_hours, dtype=float) * 15.0)
+    dec = np.radians(np.asarray(dec_degrees, dtype=float))
+    cos_dec = np.cos(dec)
+    return np.stack([cos_dec * np.cos(ra), cos_dec * np.sin(ra), np.sin(dec)], axis=-1)
+
+
+def positions_to_unit_vectors(position_au) -> np.ndarray:
+    """Normalize Skyfield position vectors into unit vectors.
+    
+    Args:
+        position_au (array_like): Positions of shape (3,) or (3, N), as
+            returned by ``position.au`` in Skyfield.
+    
+    Returns:
+        np.ndarray: Array of shape (3,) or (N, 3) of unit vectors.
+    """
+    vectors = np.asarray(position_au, dtype=float)
+    vectors = vectors / np.linalg.norm(vectors, axis=0)
+    return vectors.T
+
+
+def chord_length(angle_deg) -> np.ndarray:
+    """Return the straight-line distance between unit vectors separated by an angle."""
+    return 2.0 * np.sin(np.radians(np.asarray(angle_deg, dtype=float)) / 2.0)
+
+
+def chord_to_angle(chord) -> np.ndarray:
+    """Return the angle in degrees subtended by a chord between unit vectors."""
+    return np.degrees(2.0 * np.arcsin(np.clip(np.asarray(chord, dtype=float) / 2.0, 0.0, 1.0)))
+
+
+class StarIndex:
+    """KD-tree over catalog unit vectors for cone searches.
+    
+    The unit vectors are computed once when the index is built, so every
+    cone query ("stars within N° of the zenith", "within N° of Jupiter")
+    is a sub-linear tree lookup instead of a scan over the catalog.
+    
+    Args:
+        hip_ids (array_like): Hipparcos identifiers, one per star.
+        ra_hours (array_like): Right ascension of each star in hours.
+        dec_degrees (array_like): Declination of each star in degrees.
+        magnitudes (array_like): Visual magnitude of each star.
+        constellations (Optional[array_like]): Constellation code of each star.
+    """
+
+    def __init__(self, hip_ids, ra_hours, dec_degrees, magnitudes, constellations=None):
+        ra_hours = np.asarray(ra_hours, dtype=float)
+        dec_degrees = np.asarray(dec_degrees, dtype=float)
+        valid = np.isfinite(ra_hours) & np.isfinite(dec_degrees)
+
+        self.hip_ids = np.asarray(hip_ids)[valid]
+        self.ra_hours = ra_hours[valid]
+        self.dec_degrees = dec_degrees[valid]
+        self.magnitudes = np.asarray(magnitudes, dtype=float)[valid]
+        self.constellations = np.asarray(constellations)[valid] if constellations is not None else None
+        self.vectors = radec_to_unit_vectors(self.ra_hours, self.dec_degrees)
+        self.tree = cKDTree(self.vectors)
+
+    @classmethod
+    def from_catalog(cls, catalog: np.ndarray) -> "StarIndex":
+        """Build an index from the compact structured star catalog."""
+        return cls(
+            hip_ids=catalog['hip'],
+            ra_hours=catalog['ra_hours'],
+            dec_degrees=catalog['dec_degrees'],
+            magnitudes=catalog['magnitude'],
+            constellations=catalog['constellation'] if 'constellation' in catalog.dtype.names else None,
+        )
+
+    def __len__(self) -> int:
+        return len(self.hip_ids)
+
+    def cone_search(self, centers, radius_deg: float, max_magnitude: Optional[float] = None) -> List[Tuple[np.ndarray, np.ndarray]]:
+        """Find catalog stars within an angular radius of one or more centers.
+        
+        Args:
+            centers (array_like): Unit vector of shape (3,) or a batch of
+                shape (N, 3), e.g. zenith directions for many observers/times.
+            radius_deg (float): Cone radius in degrees.
+            max_magnitude (Optional[float]): Only return stars brighter than this.
+        
+        Returns:
+            List[Tuple[np.ndarray, np.ndarray]]: For each center, the catalog
+            row indices and angular distances in degrees, nearest first.
+        """
+        centers = np.atleast_2d(np.asarray(centers, dtype=float))
+        matches = self.tree.query_ball_point(centers, r=float(chord_length(radius_deg)))
+
+        results = []
+        for center, rows in zip(centers, matches):
+            rows = np.asarray(rows, dtype=np.intp)
+            if max_magnitude is not None:
+                rows = rows[self.magnitudes[rows] < max_magnitude]
+            chords = np.linalg.norm(self.vectors[rows] - center, axis=1)
+            order = np.argsort(chords, kind='stable')
+            results.append((rows[order], chord_to_angle(chords[order])))
+        return results
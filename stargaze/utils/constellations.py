@@ -0,0 +1,103 @@
+from functools import lru_cache
+from typing import Dict, List, Tuple
+
+import numpy as np
+from skyfield.api import load_constellation_map, load_constellation_names, position_of_radec
+from skyfield.named_stars import named_star_dict
+
+# Code stored for positions outside every boundary (never expected, but
+# keeps the uint8 column total).
+UNKNOWN_CODE = 255
+
+
+@lru_cache(maxsize=1)
+def get_constellation_table() -> List[Tuple[str, str]]:
+    """Returns the 88 IAU constellations as (abbreviation, name); the index is the stored code."""
+    return sorted((abbr, name) for abbr, name in load_constellation_names())
+
+
+@lru_cache(maxsize=1)
+def _constellation_map():
+    return load_constellation_map()
+
+
+# IAU names for stars that named_star_dict lists under several aliases;
+# other stars keep their first alias.
+PREFERRED_STAR_NAMES = {
+    677: "Alpheratz",
+    3419: "Diphda",
+    15863: "Mirfak",
+    30324: "Mirzam",
+    45556: "Aspidiske",
+    58001: "Phecda",
+    62434: "Mimosa",
+    67301: "Alkaid",
+    68702: "Hadar",
+    71683: "Rigil Kentaurus",
+    76267: "Alphecca",
+    86032: "Rasalhague",
+    86228: "Sargas",
+    102098: "Deneb",
+}
+
+
+@lru_cache(maxsize=1)
+def _star_names() -> Dict[int, str]:
+    names = dict(PREFERRED_STAR_NAMES)
+    for name, hip in named_star_dict.items():
+        names.setdefault(hip, name)
+    return names
+
+
+def _abbreviations_to_codes(abbreviations: np.ndarray) -> np.ndarray:
+    codes_by_abbr = {abbr: code for code, (abbr, _) in enumerate(get_constellation_table())}
+    unique, inverse = np.unique(np.asarray(abbreviations), return_inverse=True)
+    unique_codes = np.array([codes_by_abbr.get(str(a), UNKNOWN_CODE) for a in unique], dtype=np.uint8)
+    return unique_codes[inverse]
+
+
+def constellation_codes(ra_hours, dec_degrees) -> np.ndarray:
+    """Assigns IAU constellations to ICRS coordinates in one array operation.
+
+    Args:
+        ra_hours (array_like): Right ascension in hours.
+        dec_degrees (array_like): Declination in degrees.
+
+    Returns:
+        np.ndarray: uint8 codes indexing get_constellation_table().
+    """
+    ra_hours = np.atleast_1d(np.asarray(ra_hours, dtype=float))
+    dec_degrees = np.atleast_1d(np.asarray(dec_degrees, dtype=float))
+    if len(ra_hours) == 0:
+        return np.empty(0, dtype=np.uint8)
+    abbreviations = _constellation_map()(position_of_radec(ra_hours, dec_degrees))
+    return _abbreviations_to_codes(abbreviations)
+
+
+def constellation_name(code: int) -> str:
+    """Returns the full name for a stored constellation code."""
+    table = get_constellation_table()
+    return table[code][1] if code < len(table) else "Unknown"
+
+
+def constellation_of(position):
+    """Returns the constellation name(s) containing a Skyfield position.
+
+    Works for planets, the zenith or any other point; an array-valued
+    position gives an array of names.
+
+    Args:
+        position: Any Skyfield position (e.g. an astrometric or apparent one).
+
+    Returns:
+        str or np.ndarray: Full constellation name(s).
+    """
+    codes = _abbreviations_to_codes(np.atleast_1d(_constellation_map()(position)))
+    names = np.array([name for _, name in get_constellation_table()] + ["Unknown"])
+    result = names[np.minimum(codes, len(names) - 1)]
+    return str(result[0]) if np.ndim(position.position.au) == 1 else result
+
+
+def star_name(hip: int) -> str:
+    """Returns a star's common name, or "HIP <id>" if it has none."""
+    return _star_names().get(int(hip), f"HIP {int(hip)}")
@@ -0,0 +1,186 @@
+import asyncio
+import os
+import threading
+import time
+from typing import Optional, Tuple
+from urllib.parse import urlsplit
+
+from geopy.geocoders import Nominatim
+
+from stargaze.utils import telemetry
+from stargaze.utils.async_http import get_async_client
+from stargaze.utils.cache import TieredCache
+from stargaze.utils.http import get_breaker
+from stargaze.utils.resources import DATA_DIR
+
+Coords = Tuple[float, float]
+
+USER_AGENT = "stargazing_app"
+GEOCODE_CACHE_FILE = 'geocode_cache.sqlite3'
+GEOCODE_TABLE = "geocode_v2"
+
+# Place coordinates practically never change; misses are retried sooner.
+FOUND_TTL_SECONDS = 30 * 24 * 3600
+NOT_FOUND_TTL_SECONDS = 3600
+
+# Nominatim's usage policy allows at most one request per second.
+MIN_DELAY_SECONDS = 1.0
+
+
+def normalize_query(query: str) -> str:
+    """Normalize a location string so equivalent queries share a cache key.
+
+    Args:
+        query (str): Free-form location (e.g. "  Paris,  France ").
+
+    Returns:
+        str: Case-folded query with collapsed whitespace (e.g. "paris, france").
+    """
+    return " ".join(query.replace(",", ", ").split()).replace(" ,", ",").casefold()
+
+
+def _ttl(coords: Optional[Coords]) -> float:
+    return FOUND_TTL_SECONDS if coords else NOT_FOUND_TTL_SECONDS
+
+
+def _as_coords(value) -> Optional[Coords]:
+    # The disk tier stores JSON, which turns the tuple into a list.
+    return tuple(value) if value is not None else None
+
+
+class GeocodingService:
+    """Geocoder shared by the weather, sky and satellite lookups.
+
+    Lookups go through an in-process LRU cache, then an optional SQLite
+    cache on disk, and only then the network. Concurrent lookups for the
+    same normalized query are merged into one upstream request, and
+    upstream requests are rate limited and pass through the provider's
+    circuit breaker. ``ageocode`` is the non-blocking variant; it shares
+    the caches, the merging and the rate limit with ``geocode``.
+
+    Args:
+        geocoder: Object with a geopy-style ``geocode(query, timeout=...)``
+            method. Defaults to Nominatim; pass a fake to run offline.
+        cache_path (Optional[str]): SQLite file for the persistent cache,
+            or None to keep results in memory only.
+        maxsize (int): Maximum number of entries in the in-process cache.
+        min_delay_seconds (float): Minimum delay between upstream requests.
+        timeout (float): Timeout in seconds for each upstream request.
+    """
+
+    def __init__(self, geocoder=None, cache_path: Optional[str] = None, maxsize: int = 1024,
+                 min_delay_seconds: float = MIN_DELAY_SECONDS, timeout: float = 10):
+        self.geocoder = geocoder or Nominatim(user_agent=USER_AGENT)
+        self.cache_path = cache_path
+        self.timeout = timeout
+        self.min_delay_seconds = min_delay_seconds
+        # Nominatim-style geocoders expose their search URL; others (fakes)
+        # are only reachable through their blocking geocode method.
+        self._api = getattr(self.geocoder, "api", None)
+        self._breaker = get_breaker(urlsplit(self._api).netloc if self._api else type(self.geocoder).__name__)
+        self._next_slot = 0.0
+        self._lock = threading.Lock()
+        self._cache = TieredCache(GEOCODE_TABLE, cache_path, maxsize=maxsize, name="geocode")
+
+    def geocode(self, query: str) -> Optional[Coords]:
+        """Returns (latitude, longitude) for a location, or None if not found.
+
+        Args:
+            query (str): Name of the location (e.g., "Paris, France").
+
+        Returns:
+            Optional[Tuple[float, float]]: Coordinates, or None if the
+            geocoder does not know the location.
+        """
+        key = normalize_query(query)
+        return _as_coords(self._cache.get_or_load(key, lambda: self._fetch(key), ttl=_ttl))
+
+    async def ageocode(self, query: str) -> Optional[Coords]:
+        """Async variant of geocode; see geocode for arguments and result."""
+        key = normalize_query(query)
+        return _as_coords(await self._cache.aget_or_load(key, lambda: self._afetch(key), ttl=_ttl))
+
+    def clear(self) -> None:
+        """Drop every entry from the in-process cache."""
+        self._cache.clear()
+
+    def _reserve_slot(self) -> float:
+        """Claims the next upstream request slot; returns seconds to wait for it."""
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot)
+            self._next_slot = slot + self.min_delay_seconds
+            return slot - now
+
+    def _fetch(self, key: str) -> Optional[Coords]:
+        """Geocode a normalized query against the upstream service."""
+        with self._breaker.guard():
+            time.sleep(self._reserve_slot())
+            with telemetry.span("http.nominatim"):
+                loc = self.geocoder.geocode(key, timeout=self.timeout)
+        if not loc:
+            return None
+        return loc.latitude, loc.longitude
+
+    async def _afetch(self, key: str) -> Optional[Coords]:
+        """Geocode a normalized query without blocking the event loop."""
+        if self._api is None:
+            return await asyncio.to_thread(self._fetch, key)
+        # Fail fast before queueing for a slot, as _fetch does; the client
+        # checks again (and claims a half-open probe) when it sends.
+        self._breaker.check(claim=False)
+        await asyncio.sleep(self._reserve_slot())
+        params = {"q": key, "format": "json", "limit": 1}
+        with telemetry.span("http.nominatim") as span:
+            # No client-side retries: each request must take its own rate-limit slot.
+            response = await get_async_client().get(
+                self._api, params=params, timeout=(self.timeout, self.timeout), max_retries=0
+            )
+            span["status"] = response.status_code
+            response.raise_for_status()
+            results = response.json()
+        if not results:
+            return None
+        return float(results[0]["lat"]), float(results[0]["lon"])
+
+
+_service: Optional[GeocodingService] = None
+_service_lock = threading.Lock()
+
+
+def get_geocoding_service() -> GeocodingService:
+    """Returns the process-wide geocoding service, creating it on first use."""
+    global _service
+    with _service_lock:
+        if _service is None:
+            _service = GeocodingService(cache_path=os.path.join(DATA_DIR, GEOCODE_CACHE_FILE))
+        return _service
+
+
+def set_geocoding_service(service: Optional[GeocodingService]) -> None:
+    """Replace the process-wide geocoding service (e.g. with one wrapping a fake geocoder).
+
+    Args:
+        service (Optional[GeocodingService]): The new service, or None to
+            fall back to the default Nominatim-backed one on next use.
+    """
+    global _service
+    with _service_lock:
+        _service = service
+
+
+def geocode(location: str) -> Optional[Coords]:
+    """Returns (latitude, longitude) for a location using the shared service.
+
+    Args:
+        location (str): Name of the location (e.g., "Paris, France").
+
+    Returns:
+        Optional[Tuple[float, float]]: Coordinates, or None if not found.
+    """
+    return get_geocoding_service().geocode(location)
+
+
+async def ageocode(location: str) -> Optional[Coords]:
+    """Async variant of geocode, using the shared service."""
+    return await get_geocoding_service().ageocode(location)
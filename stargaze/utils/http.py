@@ -0,0 +1,194 @@
+import threading
+import time
+from contextlib import contextmanager
+from functools import lru_cache
+from typing import Dict, Iterator, Optional
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from stargaze.utils import telemetry
+
+# (connect, read) timeout in seconds for upstream requests.
+DEFAULT_TIMEOUT = (3.05, 10)
+
+POOL_MAXSIZE = 16
+
+# Responses that mean the provider is struggling; retried, and counted
+# against the provider's circuit breaker once retries are exhausted.
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+# A provider's circuit opens after this many consecutive failed requests
+# and lets one probe request through after RESET_TIMEOUT_SECONDS.
+FAILURE_THRESHOLD = 5
+RESET_TIMEOUT_SECONDS = 30.0
+
+
+class CircuitOpenError(ConnectionError):
+    """Raised instead of calling a provider whose circuit is open."""
+
+
+class CircuitBreaker:
+    """Fails fast while a provider is down instead of waiting on timeouts.
+
+    Closed: requests flow. After FAILURE_THRESHOLD consecutive failures
+    the circuit opens and requests fail immediately with CircuitOpenError.
+    After the reset timeout one probe request is let through (half-open);
+    its success closes the circuit, its failure opens it again.
+
+    Args:
+        name (str): Provider name used in errors and telemetry counters.
+        failure_threshold (int): Consecutive failures that open the circuit.
+        reset_timeout (float): Seconds to stay open before probing.
+    """
+
+    def __init__(self, name: str, failure_threshold: int = FAILURE_THRESHOLD,
+                 reset_timeout: float = RESET_TIMEOUT_SECONDS):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+        self._probing = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            if self.opened_at is None:
+                return "closed"
+            return "half-open" if time.monotonic() - self.opened_at >= self.reset_timeout else "open"
+
+    def allow(self, claim: bool = True) -> bool:
+        """Returns True if a request may be sent now.
+
+        In the half-open state this claims the single probe slot, unless
+        claim is False.
+        """
+        with self._lock:
+            if self.opened_at is None:
+                return True
+            if time.monotonic() - self.opened_at >= self.reset_timeout and not self._probing:
+                self._probing = claim
+                return True
+            return False
+
+    def record_success(self) -> None:
+        with self._lock:
+            self.failures = 0
+            self.opened_at = None
+            self._probing = False
+
+    def release(self) -> None:
+        """Free the probe slot of a request abandoned without an outcome (e.g. cancelled)."""
+        with self._lock:
+            self._probing = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self.failures += 1
+            self._probing = False
+            if self.opened_at is not None or self.failures >= self.failure_threshold:
+                if self.opened_at is None:
+                    telemetry.increment(f"http.circuit.{self.name}.opened")
+                self.opened_at = time.monotonic()
+
+    def check(self, claim: bool = True) -> None:
+        """Raise CircuitOpenError if no request may be sent now.
+
+        Pass claim=False to fail fast before a request that will go through
+        a client checking the breaker itself (e.g. AsyncHTTPClient).
+        """
+        if not self.allow(claim):
+            telemetry.increment(f"http.circuit.{self.name}.rejected")
+            raise CircuitOpenError(f"{self.name} is unavailable (circuit open); try again shortly")
+
+    @contextmanager
+    def guard(self) -> Iterator[None]:
+        """Run a block as one request: fail fast if open, record its outcome."""
+        self.check()
+        try:
+            yield
+        except Exception:
+            self.record_failure()
+            raise
+        except BaseException:
+            # Cancelled or interrupted: says nothing about the provider.
+            self.release()
+            raise
+        self.record_success()
+
+
+_breakers: Dict[str, CircuitBreaker] = {}
+_breakers_lock = threading.Lock()
+
+
+def get_breaker(host: str) -> CircuitBreaker:
+    """Returns the process-wide circuit breaker for a provider host."""
+    with _breakers_lock:
+        breaker = _breakers.get(host)
+        if breaker is None:
+            breaker = _breakers[host] = CircuitBreaker(host)
+        return breaker
+
+
+class CountingRetry(Retry):
+    """Retry policy that reports every retry as a telemetry counter."""
+
+    def increment(self, method=None, url=None, *args, **kwargs):
+        telemetry.increment("http.retries")
+        return super().increment(method, url, *args, **kwargs)
+
+
+class CircuitBreakerAdapter(HTTPAdapter):
+    """Transport adapter that routes every request through its host's circuit breaker.
+
+    Retries happen inside the adapter, so one failure here means the
+    request failed even after retrying.
+    """
+
+    def send(self, request, *args, **kwargs):
+        breaker = get_breaker(urlsplit(request.url).netloc)
+        breaker.check()
+        try:
+            response = super().send(request, *args, **kwargs)
+        except requests.RequestException:
+            breaker.record_failure()
+            raise
+        except BaseException:
+            breaker.release()
+            raise
+        if response.status_code in RETRY_STATUSES:
+            breaker.record_failure()
+        else:
+            breaker.record_success()
+        return response
+
+
+@lru_cache(maxsize=1)
+def get_session() -> requests.Session:
+    """Returns the process-wide pooled HTTP session.
+    
+    Connections are kept alive and reused across calls and threads.
+    Idempotent GETs are retried with backoff on connection errors and on
+    429/5xx responses, and each host has a circuit breaker.
+    
+    Returns:
+        requests.Session: The shared session.
+    """
+    retry = CountingRetry(
+        total=2,
+        backoff_factor=0.3,
+        status_forcelist=RETRY_STATUSES,
+        allowed_methods=frozenset(["GET"]),
+        raise_on_status=False,
+    )
+    adapter = CircuitBreakerAdapter(pool_connections=8, pool_maxsize=POOL_MAXSIZE, max_retries=retry)
+
+    session = requests.Session()
+    session.headers["User-Agent"] = "stargazing_app"
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
@@ -0,0 +1,119 @@
+from datetime import date as DateType, datetime, timedelta, timezone
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+from skyfield import almanac
+from skyfield.api import wgs84
+
+from stargaze.utils import telemetry
+from stargaze.utils.resources import get_ephemeris, get_timescale
+from stargaze.utils.timezones import get_timezone
+
+# Eight named phases, each spanning 45 degrees of Moon-Sun ecliptic
+# longitude difference centred on 0 (new), 90 (first quarter), etc.
+PHASE_NAMES = [
+    "New Moon",
+    "Waxing Crescent",
+    "First Quarter",
+    "Waxing Gibbous",
+    "Full Moon",
+    "Waning Gibbous",
+    "Last Quarter",
+    "Waning Crescent",
+]
+
+
+def phase_names(phase_degrees) -> np.ndarray:
+    """Maps Moon-Sun ecliptic longitude differences (0-360) to phase names."""
+    index = np.floor((np.asarray(phase_degrees) + 22.5) % 360 / 45).astype(int)
+    return np.array(PHASE_NAMES)[index]
+
+
+def _moments(days: Sequence[DateType], hour: int, tz) -> list:
+    return [datetime(d.year, d.month, d.day, hour, tzinfo=tz) for d in days]
+
+
+@telemetry.traced()
+def get_moon_phases(days: Sequence[DateType], lat: Optional[float] = None, lon: Optional[float] = None,
+                    hour: int = 22) -> Dict[str, np.ndarray]:
+    """Computes the moon's phase for many dates in one vectorized pass.
+
+    Args:
+        days (Sequence[datetime.date]): Dates to evaluate.
+        lat (Optional[float]): Observer latitude; with lon, dates are local.
+        lon (Optional[float]): Observer longitude.
+        hour (int): Hour of each date to evaluate (local, or UTC without a location).
+
+    Returns:
+        Dict[str, np.ndarray]: "phase" (ecliptic longitude difference in
+        degrees, 0 = new, 180 = full), "illumination" (illuminated fraction
+        0-1) and "name" (one of PHASE_NAMES), each with one entry per date.
+    """
+    tz = get_timezone(lat, lon) if lat is not None and lon is not None else timezone.utc
+    t = get_timescale().from_datetimes(_moments(days, hour, tz))
+    eph = get_ephemeris()
+
+    phase = almanac.moon_phase(eph, t).degrees
+    illumination = almanac.fraction_illuminated(eph, 'moon', t)
+    return {"phase": phase, "illumination": illumination, "name": phase_names(phase)}
+
+
+@telemetry.traced()
+def get_moon_calendar(lat: float, lon: float, start: DateType, days: int = 30) -> List[Dict]:
+    """Returns phase, illumination and moonrise/moonset for consecutive local dates.
+
+    Phases for every date come from one vectorized evaluation, and rise
+    and set times from one search over the whole range, so a year costs
+    little more than a single date.
+
+    Args:
+        lat (float): Latitude of the observer's location.
+        lon (float): Longitude of the observer's location.
+        start (datetime.date): First local date.
+        days (int): Number of dates, at least 1.
+
+    Returns:
+        List[Dict]: Per date: "date", "phase" (name), "illumination" (%),
+        "elongation_deg" (the Moon's ecliptic longitude minus the Sun's,
+        0-360: 0 is new moon, 180 full), "moonrise" and "moonset" (local
+        ISO times, or None when the moon does not rise or set that day).
+
+    Raises:
+        ValueError: If days is less than 1.
+    """
+    if days < 1:
+        raise ValueError(f"days must be at least 1, got {days}")
+    dates = [start + timedelta(days=i) for i in range(days)]
+    phases = get_moon_phases(dates, lat, lon)
+
+    tz = get_timezone(lat, lon)
+    ts = get_timescale()
+    boundaries = ts.from_datetimes(_moments(dates + [dates[-1] + timedelta(days=1)], 0, tz))
+    eph = get_ephemeris()
+    observer = eph['earth'] + wgs84.latlon(latitude_degrees=lat, longitude_degrees=lon)
+    t0, t1 = boundaries[0], boundaries[-1]
+    rises, rise_ok = almanac.find_risings(observer, eph['moon'], t0, t1)
+    sets, set_ok = almanac.find_settings(observer, eph['moon'], t0, t1)
+
+    def by_day(times, ok):
+        # First event per local day; find_* also reports non-events at the poles.
+        found: List[Optional[str]] = [None] * days
+        times = times[ok]
+        slots = np.searchsorted(boundaries.tt, times.tt, side='right') - 1
+        for slot, t in zip(slots, times):
+            if 0 <= slot < days and found[slot] is None:
+                found[slot] = t.astimezone(tz).isoformat(timespec='minutes')
+        return found
+
+    moonrises, moonsets = by_day(rises, rise_ok), by_day(sets, set_ok)
+    return [
+        {
+            "date": d.isoformat(),
+            "phase": str(phases["name"][i]),
+            "illumination": round(float(phases["illumination"][i]) * 100, 1),
+            "elongation_deg": round(float(phases["phase"][i]), 1),
+            "moonrise": moonrises[i],
+            "moonset": moonsets[i],
+        }
+        for i, d in enumerate(dates)
+    ]
@@ -0,0 +1,221 @@
+from datetime import date as DateType, timedelta
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+from skyfield import almanac
+from skyfield.api import wgs84
+
+from stargaze.utils import telemetry
+from stargaze.utils.astronomy import PLANET_KEYS, stars_from_catalog
+from stargaze.utils.constellations import star_name
+from stargaze.utils.resources import get_bright_catalog, get_ephemeris, get_timescale
+from stargaze.utils.timezones import get_timezone, local_time
+
+
+def get_night_window(lat: float, lon: float, date: DateType) -> Optional[Tuple]:
+    """Returns the observer's night starting on a local date.
+
+    Args:
+        lat (float): Latitude of the observer's location.
+        lon (float): Longitude of the observer's location.
+        date (datetime.date): The local date on which the night begins.
+
+    Returns:
+        Optional[Tuple[Time, Time]]: (sunset, sunrise), or None when the sun
+        never sets (midnight sun). During polar night the whole noon-to-noon
+        span is returned.
+    """
+    eph = get_ephemeris()
+    t0 = local_time(lat, lon, date, hour=12)
+    t1 = local_time(lat, lon, date + timedelta(days=1), hour=12)
+    is_up = almanac.sunrise_sunset(eph, wgs84.latlon(latitude_degrees=lat, longitude_degrees=lon))
+
+    times, events = almanac.find_discrete(t0, t1, is_up)
+    sunsets = times[events == 0]
+    sunrises = times[events == 1]
+
+    if len(sunsets) == 0:
+        if is_up(t0):
+            return None
+        start = t0
+    else:
+        start = sunsets[0]
+
+    later_sunrises = sunrises[sunrises.tt > start.tt]
+    end = later_sunrises[0] if len(later_sunrises) else t1
+    return start, end
+
+
+def _crossing_times(alt: np.ndarray, jd: np.ndarray, threshold: float, rising: bool) -> np.ndarray:
+    """Returns the first time each altitude curve crosses a threshold.
+
+    Args:
+        alt (np.ndarray): Altitudes of shape (objects, samples).
+        jd (np.ndarray): Sample times (TT Julian dates) of shape (samples,).
+        threshold (float): Altitude in degrees.
+        rising (bool): Look for upward crossings if True, downward otherwise.
+
+    Returns:
+        np.ndarray: Linearly interpolated crossing times, NaN where none.
+    """
+    above = alt >= threshold
+    crossing = (~above[:, :-1] & above[:, 1:]) if rising else (above[:, :-1] & ~above[:, 1:])
+    has_crossing = crossing.any(axis=1)
+    i = crossing.argmax(axis=1)
+
+    rows = np.arange(len(alt))
+    a0, a1 = alt[rows, i], alt[rows, i + 1]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        frac = np.clip((threshold - a0) / (a1 - a0), 0.0, 1.0)
+    times = jd[i] + frac * (jd[i + 1] - jd[i])
+    return np.where(has_crossing, times, np.nan)
+
+
+def _best_windows(alt: np.ndarray, jd: np.ndarray, min_altitude: float) -> Tuple[np.ndarray, np.ndarray]:
+    """Returns the contiguous span around each curve's peak above min_altitude."""
+    samples = np.arange(alt.shape[1])
+    peak = alt.argmax(axis=1)[:, None]
+    below = alt < min_altitude
+
+    first = np.where(below & (samples < peak), samples, -1).max(axis=1) + 1
+    last = np.where(below & (samples > peak), samples, alt.shape[1]).min(axis=1) - 1
+    return jd[first], jd[last]
+
+
+def altitude_grid(lat, lon, gast_hours, ra_hours, dec_degrees) -> np.ndarray:
+    """Altitudes of fixed sky positions for many observer/time samples.
+
+    Uses the hour-angle formula, so stars only need their apparent places
+    computed once; the samples then cost one broadcast NumPy expression.
+
+    Args:
+        lat (float or array_like): Observer latitude(s), shape () or (K,).
+        lon (float or array_like): Observer longitude(s), shape () or (K,).
+        gast_hours (array_like): Greenwich apparent sidereal time, shape (K,).
+        ra_hours (array_like): Apparent right ascension of date, shape (M,).
+        dec_degrees (array_like): Apparent declination of date, shape (M,).
+
+    Returns:
+        np.ndarray: Altitudes in degrees of shape (M, K).
+    """
+    lat_rad = np.radians(np.asarray(lat, dtype=float))[None, ...]
+    lst_hours = np.asarray(gast_hours, dtype=float) + np.asarray(lon, dtype=float) / 15.0
+    hour_angle = np.radians((lst_hours[None, :] - np.asarray(ra_hours, dtype=float)[:, None]) * 15.0)
+    dec_rad = np.radians(np.asarray(dec_degrees, dtype=float))[:, None]
+    sin_alt = np.sin(lat_rad) * np.sin(dec_rad) + np.cos(lat_rad) * np.cos(dec_rad) * np.cos(hour_angle)
+    return np.degrees(np.arcsin(np.clip(sin_alt, -1.0, 1.0)))
+
+
+def apparent_star_places(lat: float, lon: float, t, rows):
+    """Apparent RA (hours) and Dec (degrees) of date for catalog rows at one time."""
+    location = get_ephemeris()['earth'] + wgs84.latlon(latitude_degrees=lat, longitude_degrees=lon)
+    ra, dec, _ = location.at(t).observe(stars_from_catalog(rows)).apparent().radec(epoch='date')
+    return ra.hours, dec.degrees
+
+
+def _star_altitudes(lat: float, lon: float, t, t_mid, max_magnitude: float):
+    """Altitude curves of catalog stars over a time array.
+
+    Apparent places are computed once at mid-night; the curves then follow
+    from the sidereal time array, so the cost is one catalog observation
+    plus an (N stars x T samples) NumPy expression.
+    """
+    rows = get_bright_catalog(max_magnitude)
+    if len(rows) == 0:
+        return rows, np.empty((0, len(t)))
+
+    ra_hours, dec_degrees = apparent_star_places(lat, lon, t_mid, rows)
+    return rows, altitude_grid(lat, lon, t.gast, ra_hours, dec_degrees)
+
+
+@telemetry.traced()
+def get_night_sky(lat: float, lon: float, date: DateType, max_magnitude: float = 2.5, min_altitude: float = 10, step_minutes: float = 10) -> Dict:
+    """Sweeps planets and bright stars over the observer's whole night.
+
+    Every object is evaluated over one Skyfield time array running from
+    sunset to sunrise, giving its rise, transit (highest point during the
+    night) and set, and the best-viewing window around that highest point.
+
+    Args:
+        lat (float): Latitude of the observer's location.
+        lon (float): Longitude of the observer's location.
+        date (datetime.date): The local date on which the night begins.
+        max_magnitude (float): Only consider stars brighter than this magnitude.
+        min_altitude (float): Minimum altitude in degrees for good viewing.
+        step_minutes (float): Sampling step of the altitude curves.
+
+    Returns:
+        Dict: "timezone", "sunset", "sunrise" and "objects", a list of dicts
+        with name, kind, magnitude, rise, transit, set, max_altitude,
+        best_start and best_end; planets first, then stars brightest
+        first. Times are local ISO strings, or None when the event does
+        not happen during the night.
+    """
+    tz = get_timezone(lat, lon)
+    night = get_night_window(lat, lon, date)
+    if night is None:
+        return {"timezone": str(tz), "sunset": None, "sunrise": None, "objects": []}
+
+    ts = get_timescale()
+    start, end = night
+    n_samples = max(int(np.ceil((end.tt - start.tt) * 1440 / step_minutes)), 1) + 1
+    jd = np.linspace(start.tt, end.tt, n_samples)
+    t = ts.tt_jd(jd)
+    t_mid = ts.tt_jd((start.tt + end.tt) / 2)
+
+    # Planets: one vectorized observation over the time array per planet.
+    eph = get_ephemeris()
+    location = eph['earth'] + wgs84.latlon(latitude_degrees=lat, longitude_degrees=lon)
+    observer = location.at(t)
+    planet_alt = np.array([
+        observer.observe(eph[key]).apparent().altaz()[0].degrees
+        for key in PLANET_KEYS.values()
+    ])
+
+    stars, star_alt = _star_altitudes(lat, lon, t, t_mid, max_magnitude)
+
+    names = list(PLANET_KEYS) + [star_name(hip) for hip in stars['hip']]
+    kinds = ["planet"] * len(PLANET_KEYS) + ["star"] * len(stars)
+    magnitudes = [None] * len(PLANET_KEYS) + [round(float(m), 2) for m in stars['magnitude']]
+    alt = np.vstack([planet_alt, star_alt])
+
+    max_alt = alt.max(axis=1)
+    transit = jd[alt.argmax(axis=1)]
+    rise = _crossing_times(alt, jd, 0.0, rising=True)
+    set_ = _crossing_times(alt, jd, 0.0, rising=False)
+    best_start, best_end = _best_windows(alt, jd, min_altitude)
+
+    def to_local(values: np.ndarray) -> List[Optional[str]]:
+        out = [None] * len(values)
+        finite = np.flatnonzero(np.isfinite(values))
+        if len(finite):
+            for i, dt in zip(finite, ts.tt_jd(values[finite]).astimezone(tz)):
+                out[i] = dt.isoformat(timespec='minutes')
+        return out
+
+    visible = np.flatnonzero(max_alt >= min_altitude)
+    columns = {
+        "rise": to_local(rise[visible]),
+        "transit": to_local(transit[visible]),
+        "set": to_local(set_[visible]),
+        "best_start": to_local(best_start[visible]),
+        "best_end": to_local(best_end[visible]),
+    }
+
+    objects = []
+    for k, i in enumerate(visible):
+        obj = {
+            "name": names[i],
+            "kind": kinds[i],
+            "magnitude": magnitudes[i],
+            "max_altitude": round(float(max_alt[i]), 1),
+        }
+        obj.update({key: values[k] for key, values in columns.items()})
+        objects.append(obj)
+
+    return {
+        "timezone": str(tz),
+        "sunset": start.astimezone(tz).isoformat(timespec='minutes'),
+        "sunrise": end.astimezone(tz).isoformat(timespec='minutes'),
+        "objects": objects,
+    }
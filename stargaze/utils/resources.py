@@ -0,0 +1,135 @@
+import os
+from functools import lru_cache
+
+import numpy as np
+from skyfield.api import Loader
+
+from stargaze.utils import telemetry
+from stargaze.utils.constellations import constellation_codes
+
+# Directory holding downloaded ephemeris/catalog files and derived caches.
+DATA_DIR = os.getenv('STARGAZE_DATA_DIR', '.')
+
+EPHEMERIS_FILE = 'de421.bsp'
+CATALOG_CACHE_FILE = 'hipparcos_v3.npy'
+
+# Only the Hipparcos columns the astronomy helpers actually use. float32
+# keeps positions to ~0.02 arcsec, far finer than anything we report, and
+# halves the file (and page cache). The IAU constellation is precomputed
+# as a uint8 code (see stargaze.utils.constellations), for 17 bytes a star.
+CATALOG_DTYPE = np.dtype([
+    ('hip', np.int32),
+    ('ra_hours', np.float32),
+    ('dec_degrees', np.float32),
+    ('magnitude', np.float32),
+    ('constellation', np.uint8),
+])
+
+
+@lru_cache(maxsize=1)
+def get_loader() -> Loader:
+    """Returns the Skyfield loader rooted at DATA_DIR."""
+    return Loader(DATA_DIR, verbose=False)
+
+
+@lru_cache(maxsize=1)
+def get_ephemeris():
+    """Returns the planetary ephemeris, loading it on first use."""
+    with telemetry.span("resources.load_ephemeris"):
+        return get_loader()(EPHEMERIS_FILE)
+
+
+@lru_cache(maxsize=1)
+def get_timescale():
+    """Returns the Skyfield timescale, building it on first use."""
+    return get_loader().timescale()
+
+
+def write_star_catalog(path: str, hip, ra_hours, dec_degrees, magnitude) -> None:
+    """Save catalog columns as a compact .npy structured array, brightest first.
+    
+    Sorting by magnitude lets every "brighter than" filter be a prefix
+    slice (see get_bright_catalog). Constellations are assigned here, once
+    for the whole catalog. The file is written to a temporary name and moved into place, so a
+    concurrent reader never sees a half-written catalog.
+    
+    Args:
+        path (str): Destination of the compact catalog.
+        hip (array_like): Hipparcos identifiers.
+        ra_hours (array_like): Right ascension in hours.
+        dec_degrees (array_like): Declination in degrees.
+        magnitude (array_like): Visual magnitude.
+    """
+    catalog = np.empty(len(hip), dtype=CATALOG_DTYPE)
+    catalog['hip'] = hip
+    catalog['ra_hours'] = ra_hours
+    catalog['dec_degrees'] = dec_degrees
+    catalog['magnitude'] = magnitude
+    catalog['constellation'] = constellation_codes(ra_hours, dec_degrees)
+    catalog = catalog[np.argsort(catalog['magnitude'], kind='stable')]
+
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, 'wb') as f:
+        np.save(f, catalog)
+    os.replace(tmp_path, path)
+
+
+def build_star_catalog(path: str) -> None:
+    """Parse the Hipparcos catalog and save the columns we use to a .npy file.
+    
+    Args:
+        path (str): Destination of the compact catalog.
+    """
+    from skyfield.data import hipparcos
+
+    with get_loader().open(hipparcos.URL) as f:
+        df = hipparcos.load_dataframe(f)
+    df = df.dropna(subset=['ra_hours', 'dec_degrees', 'magnitude'])
+
+    write_star_catalog(
+        path,
+        hip=df.index.to_numpy(),
+        ra_hours=df['ra_hours'].to_numpy(),
+        dec_degrees=df['dec_degrees'].to_numpy(),
+        magnitude=df['magnitude'].to_numpy(),
+    )
+
+
+@lru_cache(maxsize=1)
+def get_star_catalog() -> np.ndarray:
+    """Returns the compact Hipparcos catalog as a memory-mapped structured array.
+    
+    The raw catalog is parsed only once, the first time any process needs
+    it; afterwards the .npy cache in DATA_DIR is memory-mapped read-only,
+    so every worker process shares the same page-cache copy.
+    
+    Returns:
+        np.ndarray: Structured array with fields from CATALOG_DTYPE,
+        sorted by magnitude.
+    """
+    path = os.path.join(DATA_DIR, CATALOG_CACHE_FILE)
+    with telemetry.span("resources.load_catalog"):
+        if not os.path.exists(path):
+            with telemetry.span("resources.build_catalog"):
+                build_star_catalog(path)
+        return np.load(path, mmap_mode='r')
+
+
+@lru_cache(maxsize=64)
+def _magnitude_cut(max_magnitude: float) -> int:
+    return int(np.searchsorted(get_star_catalog()['magnitude'], max_magnitude, side='left'))
+
+
+def get_bright_catalog(max_magnitude: float) -> np.ndarray:
+    """Returns the catalog stars brighter than max_magnitude, brightest first.
+    
+    The cut index for each magnitude limit is found once; the result is a
+    zero-copy slice of the memory-mapped catalog.
+    
+    Args:
+        max_magnitude (float): Only stars with magnitude below this are returned.
+    
+    Returns:
+        np.ndarray: Read-only view of the leading catalog rows.
+    """
+    return get_star_catalog()[:_magnitude_cut(float(max_magnitude))]
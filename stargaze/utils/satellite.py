@@ -1,9 +1,23 @@
-import requests
-from datetime import datetime, timezone
-from typing import List, Dict
-from geopy.geocoders import Nominatim
+import asyncio
+import logging
 import os
+from concurrent.futures import ThreadPoolExecutor, wait
+from datetime import datetime, timezone
+from typing import List, Dict, Optional
+
+from stargaze.utils import telemetry
+from stargaze.utils.async_http import get_async_client
+from stargaze.utils.cache import TTLCache, quantize_coords
+from stargaze.utils.geocoding import ageocode, geocode
+from stargaze.utils.http import get_session
+from stargaze.utils.tle import load_satellites, predict_visual_passes
+
+logger = logging.getLogger(__name__)
+
+N2YO_BASE_URL = os.getenv('N2YO_BASE_URL', 'https://api.n2yo.com/rest/v1/satellite')
 
+# "n2yo" queries the N2YO API; "local" predicts passes with SGP4 from cached TLEs.
+SATELLITE_BACKEND = os.getenv('SATELLITE_BACKEND', 'n2yo')
 
 # Popular satellites to check
 SATELLITES = {
@@ -17,53 +31,242 @@ SATELLITES = {
     33591: "NOAA 19",
 }
 
-def get_satellite_passes(location: str, days: int = 3, min_visibility: int = 300) -> str:
+MAX_WORKERS = 8
+REQUEST_TIMEOUT = (3.05, 5)  # (connect, read) seconds per N2YO request
+OVERALL_DEADLINE = 12  # seconds for the whole fan-out before returning partial results
+
+# Pass predictions are cached per satellite and ~11 km grid cell.
+GRID_STEP_DEG = 0.1
+_pass_cache = TTLCache(maxsize=2048, ttl=30 * 60, name="n2yo_passes")
+
+
+def fetch_visual_passes(satellite_id: int, lat: float, lon: float, days: int, min_visibility: int, api_key: str) -> List[Dict]:
+    """Fetch visual passes of one satellite from the N2YO API, with caching.
+    
+    Args:
+        satellite_id (int): NORAD catalog number of the satellite.
+        lat (float): Latitude of the observer (already quantized).
+        lon (float): Longitude of the observer (already quantized).
+        days (int): Number of days to predict (N2YO allows at most 10).
+        min_visibility (int): Minimum visibility in seconds.
+        api_key (str): N2YO API key.
+    
+    Returns:
+        List[Dict]: The raw N2YO pass dicts, possibly empty.
+    """
+    key = (satellite_id, lat, lon, days, min_visibility)
+    passes = _pass_cache.get(key)
+    if passes is not None:
+        return passes
+
+    with telemetry.span("http.n2yo", satellite_id=satellite_id) as span:
+        response = get_session().get(_n2yo_url(*key, api_key), timeout=REQUEST_TIMEOUT)
+        span["status"] = response.status_code
+        response.raise_for_status()
+        data = response.json()
+    return _store_passes(key, data)
+
+
+async def afetch_visual_passes(satellite_id: int, lat: float, lon: float, days: int, min_visibility: int, api_key: str) -> List[Dict]:
+    """Async variant of fetch_visual_passes, using the pooled async client."""
+    key = (satellite_id, lat, lon, days, min_visibility)
+    passes = _pass_cache.get(key)
+    if passes is not None:
+        return passes
+
+    with telemetry.span("http.n2yo", satellite_id=satellite_id) as span:
+        response = await get_async_client().get(_n2yo_url(*key, api_key), timeout=REQUEST_TIMEOUT)
+        span["status"] = response.status_code
+        response.raise_for_status()
+        data = response.json()
+    return _store_passes(key, data)
+
+
+def _n2yo_url(satellite_id: int, lat: float, lon: float, days: int, min_visibility: int, api_key: str) -> str:
+    return f"{N2YO_BASE_URL}/visualpasses/{satellite_id}/{lat}/{lon}/0/{days}/{min_visibility}&apiKey={api_key}"
+
+
+def _store_passes(key, data: Dict) -> List[Dict]:
+    if 'error' in data:
+        raise RuntimeError(f"N2YO error for satellite {key[0]}: {data['error']}")
+    passes = data.get('passes') or []
+    _pass_cache.set(key, passes)
+    return passes
+
+
+def _visible(satellite_id: int, passes: List[Dict], catalog: Dict[int, str]) -> Optional[Dict]:
+    if not passes:
+        return None
+    return {
+        'name': catalog[satellite_id],
+        'passes': passes[:3]  # Limit to 3 passes per satellite
+    }
+
+
+def _no_answer_error(count: int, last_error: Optional[BaseException]) -> RuntimeError:
+    reason = f"last error: {telemetry.describe_error(last_error)}" if last_error else "deadline hit"
+    return RuntimeError(f"N2YO answered for none of {count} satellites ({reason})")
+
+
+def get_n2yo_passes(lat: float, lon: float, days: int, min_visibility: int, api_key: str, deadline: Optional[float] = OVERALL_DEADLINE, catalog: Dict[int, str] = SATELLITES) -> List[Dict]:
+    """Fetch visible passes for every satellite in a catalog from N2YO.
+    
+    Satellites are queried concurrently; if the deadline expires, the
+    satellites that have answered so far are returned.
+    
+    Args:
+        lat (float): Latitude of the observer.
+        lon (float): Longitude of the observer.
+        days (int): Number of days to check for passes.
+        min_visibility (int): Minimum visibility in seconds.
+        api_key (str): N2YO API key.
+        deadline (Optional[float]): Overall time budget in seconds, or None to wait for every satellite.
+        catalog (Dict[int, str]): NORAD catalog numbers mapped to display names.
+    
+    Returns:
+        List[Dict]: Satellites with passes, as expected by format_satellite_results.
+
+    Raises:
+        RuntimeError: If no satellite answered, so an outage is not
+            reported as "no passes".
+    """
+    grid_lat, grid_lon = quantize_coords(lat, lon, GRID_STEP_DEG)
+    days = min(days, 10)
+
+    # Fan out one request per satellite
+    executor = ThreadPoolExecutor(max_workers=MAX_WORKERS, thread_name_prefix="n2yo")
+    try:
+        futures = {
+            executor.submit(telemetry.propagate(fetch_visual_passes), satellite_id, grid_lat, grid_lon, days, min_visibility, api_key): satellite_id
+            for satellite_id in catalog
+        }
+        done, not_done = wait(futures, timeout=deadline)
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    if not_done:
+        logger.warning("Satellite deadline of %ss hit; %d of %d satellites missing", deadline, len(not_done), len(futures))
+        telemetry.increment("satellite.skipped", len(not_done))
+
+    visible_satellites, answered, last_error = [], 0, None
+    for future, satellite_id in futures.items():
+        if future not in done:
+            continue
+        try:
+            passes = future.result()
+        except Exception as e:
+            logger.warning("Skipping satellite %s: %s", satellite_id, telemetry.describe_error(e))
+            telemetry.increment("satellite.skipped")
+            last_error = e
+            continue
+        answered += 1
+        visible = _visible(satellite_id, passes, catalog)
+        if visible:
+            visible_satellites.append(visible)
+    if catalog and not answered:
+        raise _no_answer_error(len(catalog), last_error)
+    return visible_satellites
+
+
+async def aget_n2yo_passes(lat: float, lon: float, days: int, min_visibility: int, api_key: str, deadline: Optional[float] = OVERALL_DEADLINE, catalog: Dict[int, str] = SATELLITES) -> List[Dict]:
+    """Async variant of get_n2yo_passes: one task per satellite, no threads.
+
+    Requests still running at the deadline are cancelled and their
+    satellites left out, and an outage raises RuntimeError, as in the
+    sync version.
+    """
+    grid_lat, grid_lon = quantize_coords(lat, lon, GRID_STEP_DEG)
+    days = min(days, 10)
+
+    tasks = {
+        asyncio.ensure_future(afetch_visual_passes(satellite_id, grid_lat, grid_lon, days, min_visibility, api_key)): satellite_id
+        for satellite_id in catalog
+    }
+    done, not_done = await asyncio.wait(tasks, timeout=deadline)
+    for task in not_done:
+        task.cancel()
+
+    if not_done:
+        logger.warning("Satellite deadline of %ss hit; %d of %d satellites missing", deadline, len(not_done), len(tasks))
+        telemetry.increment("satellite.skipped", len(not_done))
+
+    visible_satellites, answered, last_error = [], 0, None
+    for task, satellite_id in tasks.items():
+        if task not in done:
+            continue
+        if task.exception() is not None:
+            logger.warning("Skipping satellite %s: %s", satellite_id, telemetry.describe_error(task.exception()))
+            telemetry.increment("satellite.skipped")
+            last_error = task.exception()
+            continue
+        answered += 1
+        visible = _visible(satellite_id, task.result(), catalog)
+        if visible:
+            visible_satellites.append(visible)
+    if catalog and not answered:
+        raise _no_answer_error(len(catalog), last_error)
+    return visible_satellites
+
+
+def get_local_passes(lat: float, lon: float, days: int, min_visibility: int, catalog: Dict[int, str] = SATELLITES) -> List[Dict]:
+    """Predict visible passes for every satellite in a catalog with SGP4.
+    
+    Uses cached TLEs instead of the N2YO API, so there is no per-satellite
+    network call and the catalog can hold hundreds of satellites.
+    
+    Args:
+        lat (float): Latitude of the observer.
+        lon (float): Longitude of the observer.
+        days (int): Number of days to check for passes.
+        min_visibility (int): Minimum visibility in seconds.
+        catalog (Dict[int, str]): NORAD catalog numbers mapped to display names.
+    
+    Returns:
+        List[Dict]: Satellites with passes, as expected by format_satellite_results.
+    """
+    visible_satellites = []
+    for satellite_id, satellite in load_satellites(catalog).items():
+        with telemetry.span("satellite.sgp4_passes", satellite_id=satellite_id):
+            passes = predict_visual_passes(satellite, lat, lon, days, min_visibility)
+        visible = _visible(satellite_id, passes, catalog)
+        if visible:
+            visible_satellites.append(visible)
+    return visible_satellites
+
+
+@telemetry.traced()
+def get_satellite_passes(location: str, days: int = 3, min_visibility: int = 300, deadline: Optional[float] = OVERALL_DEADLINE, backend: Optional[str] = None) -> str:
     """Get visible satellite passes for a location.
     
     Args:
         location (str): Location name (e.g., "New York, USA").
         days (int): Number of days to check for passes.
         min_visibility (int): Minimum visibility in seconds to consider a pass visible.
+        deadline (Optional[float]): Overall time budget in seconds for the N2YO backend.
+        backend (Optional[str]): "n2yo" (API) or "local" (SGP4 from cached
+            TLEs); defaults to the SATELLITE_BACKEND environment variable.
     
     Returns:
         str: Formatted string with visible satellite passes.
     
     """
-
+    backend = backend or SATELLITE_BACKEND
     api_key = os.getenv('N2YO_API_KEY')
-    
-    if not api_key:
-        return "Error: N2YO API key not configured. Get a free key at https://www.n2yo.com/api/"
+    error = _config_error(backend, api_key)
+    if error:
+        return error
     
     try:
         # Geocode location
-        geolocator = Nominatim(user_agent="stargazing_agent")
-        location_data = geolocator.geocode(location, timeout=10)
-        if not location_data:
+        coords = geocode(location)
+        if not coords:
             return f"Could not find coordinates for location: {location}"
         
-        latitude, longitude = location_data.latitude, location_data.longitude
-        
-        # Check each satellite
-        visible_satellites = []
-        for satellite_id, satellite_name in SATELLITES.items():
-            try:
-                url = f"https://api.n2yo.com/rest/v1/satellite/visualpasses/{satellite_id}/{latitude}/{longitude}/0/{min(days, 10)}/{min_visibility}&apiKey={api_key}"
-                
-                response = requests.get(url, timeout=10)
-                response.raise_for_status()
-                data = response.json()
-                print(data)
-                
-                if 'error' not in data and data.get('passes'):
-                    passes = data['passes']
-                    visible_satellites.append({
-                        'name': satellite_name,
-                        'passes': passes[:3]  # Limit to 3 passes per satellite
-                    })
-                    
-            except Exception:
-                continue  # Skip satellites that error out
+        latitude, longitude = coords
+        if backend == "local":
+            visible_satellites = get_local_passes(latitude, longitude, days, min_visibility)
+        else:
+            visible_satellites = get_n2yo_passes(latitude, longitude, days, min_visibility, api_key, deadline)
         
         return format_satellite_results(visible_satellites, location, latitude, longitude)
         
@@ -71,6 +274,46 @@ def get_satellite_passes(location: str, days: int = 3, min_visibility: int = 300
         return f"Error getting satellite passes: {str(e)}"
 
 
+@telemetry.traced()
+async def aget_satellite_passes(location: str, days: int = 3, min_visibility: int = 300, deadline: Optional[float] = OVERALL_DEADLINE, backend: Optional[str] = None) -> str:
+    """Async variant of get_satellite_passes; see it for arguments and result.
+
+    The N2YO fan-out runs as tasks on the event loop; the CPU-bound local
+    backend runs in a worker thread.
+    """
+    backend = backend or SATELLITE_BACKEND
+    api_key = os.getenv('N2YO_API_KEY')
+    error = _config_error(backend, api_key)
+    if error:
+        return error
+
+    try:
+        coords = await ageocode(location)
+        if not coords:
+            return f"Could not find coordinates for location: {location}"
+
+        latitude, longitude = coords
+        if backend == "local":
+            visible_satellites = await asyncio.to_thread(
+                get_local_passes, latitude, longitude, days, min_visibility
+            )
+        else:
+            visible_satellites = await aget_n2yo_passes(latitude, longitude, days, min_visibility, api_key, deadline)
+
+        return format_satellite_results(visible_satellites, location, latitude, longitude)
+
+    except Exception as e:
+        return f"Error getting satellite passes: {str(e)}"
+
+
+def _config_error(backend: str, api_key: Optional[str]) -> Optional[str]:
+    if backend not in ("n2yo", "local"):
+        return f"Error: unknown satellite backend '{backend}'. Use 'n2yo' or 'local'."
+    if backend == "n2yo" and not api_key:
+        return "Error: N2YO API key not configured. Get a free key at https://www.n2yo.com/api/"
+    return None
+
+
 def format_satellite_results(satellites: List[Dict], location: str, lat: float, lng: float) -> str:
     """Format satellite pass results.
     
@@ -0,0 +1,111 @@
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date as DateType
+from typing import Any, Callable, Dict, Iterable, Optional, Tuple
+
+from stargaze.utils import telemetry
+from stargaze.utils.cache import TieredCache, quantize_coords
+
+# Sky snapshots are shared within ~28 km grid cells: altitudes shift by at
+# most the cell half-width, well below what the text summaries report.
+SKY_GRID_STEP_DEG = 0.25
+
+# A night's sky never changes, but old dates are rarely asked for again.
+SNAPSHOT_TTL_SECONDS = 7 * 24 * 3600
+
+# Warmed at startup so the most common questions never hit the ephemeris.
+POPULAR_CITIES: Dict[str, Tuple[float, float]] = {
+    "New York": (40.71, -74.01),
+    "Los Angeles": (34.05, -118.24),
+    "Chicago": (41.88, -87.63),
+    "Denver": (39.74, -104.99),
+    "Seattle": (47.61, -122.33),
+    "Toronto": (43.65, -79.38),
+    "Mexico City": (19.43, -99.13),
+    "London": (51.51, -0.13),
+    "Paris": (48.86, 2.35),
+    "Berlin": (52.52, 13.40),
+    "Madrid": (40.42, -3.70),
+    "Rome": (41.90, 12.50),
+    "Cairo": (30.04, 31.24),
+    "Mumbai": (19.08, 72.88),
+    "Delhi": (28.61, 77.21),
+    "Beijing": (39.90, 116.41),
+    "Tokyo": (35.68, 139.69),
+    "Singapore": (1.35, 103.82),
+    "Sydney": (-33.87, 151.21),
+    "São Paulo": (-23.55, -46.63),
+}
+
+# Bump when the snapshot text format changes so stale disk entries are ignored.
+SNAPSHOT_TABLE = "sky_snapshots_v3"
+
+SnapshotKey = Tuple[float, float, str]
+
+
+class SkySnapshotCache:
+    """Cache of computed sky snapshots keyed by (grid cell, date).
+
+    Snapshots are computed at the centre of the cell, so every location
+    in the cell shares one. Lookups go through an in-process LRU, then an
+    optional SQLite file, and only then the computation; concurrent
+    misses for the same key are merged into one computation.
+
+    Args:
+        compute (Callable[[float, float, date], Any]): Builds a snapshot
+            for (lat, lon, date); the result must be JSON serializable.
+        cache_path (Optional[str]): SQLite file for the disk tier, or None.
+        maxsize (int): Maximum number of snapshots kept in memory.
+        step_deg (float): Grid cell size in degrees.
+    """
+
+    def __init__(self, compute: Callable[[float, float, DateType], Any], cache_path: Optional[str] = None,
+                 maxsize: int = 4096, step_deg: float = SKY_GRID_STEP_DEG):
+        self.compute = compute
+        self.cache_path = cache_path
+        self.step_deg = step_deg
+        self._cache = TieredCache(SNAPSHOT_TABLE, cache_path, maxsize=maxsize, ttl=SNAPSHOT_TTL_SECONDS,
+                                  name="sky_snapshot")
+
+    def key(self, lat: float, lon: float, date: DateType) -> SnapshotKey:
+        """Returns the cache key of the cell containing (lat, lon) on date."""
+        return (*quantize_coords(lat, lon, self.step_deg), date.strftime("%Y-%m-%d"))
+
+    def get(self, lat: float, lon: float, date: DateType) -> Any:
+        """Returns the snapshot for the cell containing (lat, lon) on date.
+
+        Args:
+            lat (float): Latitude of the observer.
+            lon (float): Longitude of the observer.
+            date (datetime.date): The local date.
+
+        Returns:
+            Any: The cached or freshly computed snapshot.
+        """
+        cell_lat, cell_lon, day = self.key(lat, lon, date)
+
+        def compute():
+            with telemetry.span("sky_snapshot.compute"):
+                return self.compute(cell_lat, cell_lon, date)
+
+        return self._cache.get_or_load(f"{cell_lat}|{cell_lon}|{day}", compute)
+
+    def warm(self, coords: Iterable[Tuple[float, float]], dates: Iterable[DateType], max_workers: int = 4) -> int:
+        """Computes snapshots for every (location, date) pair ahead of time.
+
+        Args:
+            coords (Iterable[Tuple[float, float]]): (lat, lon) per location.
+            dates (Iterable[datetime.date]): Dates to warm.
+            max_workers (int): Snapshots computed concurrently.
+
+        Returns:
+            int: Number of snapshots warmed.
+        """
+        pairs = [(lat, lon, d) for d in dates for lat, lon in coords]
+        with telemetry.span("sky_snapshot.warm", snapshots=len(pairs)):
+            with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="sky_warm") as executor:
+                list(executor.map(lambda p: self.get(*p), pairs))
+        return len(pairs)
+
+    def clear(self) -> None:
+        """Drop every snapshot from the in-process cache."""
+        self._cache.clear()
@@ -0,0 +1,193 @@
+import contextvars
+import functools
+import inspect
+import json
+import logging
+import os
+import threading
+import time
+import uuid
+from collections import defaultdict, deque
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+import httpx
+import requests
+
+# JSON-lines file for span and counter events; unset to keep them in memory only.
+TELEMETRY_LOG = os.getenv('STARGAZE_TELEMETRY_LOG')
+
+logger = logging.getLogger('stargaze.telemetry')
+
+_trace_id: contextvars.ContextVar[Optional[str]] = contextvars.ContextVar('trace_id', default=None)
+_parent_span: contextvars.ContextVar[Optional[str]] = contextvars.ContextVar('parent_span', default=None)
+
+_lock = threading.Lock()
+_counters: Dict[str, int] = defaultdict(int)
+_span_stats: Dict[str, Dict[str, float]] = defaultdict(lambda: {"count": 0, "errors": 0, "total_ms": 0.0, "max_ms": 0.0})
+_recent_spans: deque = deque(maxlen=2000)
+
+
+def configure_logging(path: Optional[str] = TELEMETRY_LOG) -> None:
+    """Write telemetry events as JSON lines to path (no-op if path is empty)."""
+    if not path or any(getattr(h, '_stargaze_telemetry', False) for h in logger.handlers):
+        return
+    handler = logging.FileHandler(path)
+    handler.setFormatter(logging.Formatter('%(message)s'))
+    handler._stargaze_telemetry = True
+    logger.addHandler(handler)
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+
+
+def _emit(event: Dict[str, Any]) -> None:
+    if logger.isEnabledFor(logging.INFO):
+        logger.info(json.dumps(event, default=str))
+
+
+def increment(name: str, value: int = 1) -> None:
+    """Add value to a named counter (e.g. "http.retries", "cache.weather.hit")."""
+    with _lock:
+        _counters[name] += value
+
+
+def describe_error(e: BaseException) -> str:
+    """Returns an exception's type and message, safe to log or record.
+
+    HTTP client errors are reduced to their type and response status:
+    their text includes the request URL, and with it any API key passed
+    as a query parameter (e.g. N2YO's apiKey).
+    """
+    if isinstance(e, (requests.RequestException, httpx.HTTPError)):
+        status = getattr(getattr(e, "response", None), "status_code", None)
+        return f"{type(e).__name__} {status}" if status else type(e).__name__
+    return f"{type(e).__name__}: {e}"
+
+
+@contextmanager
+def span(name: str, **attributes: Any) -> Iterator[Dict[str, Any]]:
+    """Time a block of work and record it as a span.
+
+    The yielded dict can be updated with extra attributes while the block
+    runs. Spans nest: a span opened inside another records it as parent.
+
+    Args:
+        name (str): Span name, dotted by layer (e.g. "http.n2yo", "tool.fetch_weather").
+        **attributes: Extra attributes stored with the span.
+    """
+    span_id = uuid.uuid4().hex[:12]
+    record: Dict[str, Any] = {
+        "span": name,
+        "span_id": span_id,
+        "parent_id": _parent_span.get(),
+        "trace_id": _trace_id.get(),
+        **attributes,
+    }
+    token = _parent_span.set(span_id)
+    start = time.perf_counter()
+    record["start"] = time.time()
+    try:
+        yield record
+    except BaseException as e:
+        record["error"] = describe_error(e)
+        raise
+    finally:
+        _parent_span.reset(token)
+        _finish(record, (time.perf_counter() - start) * 1000)
+
+
+def _finish(record: Dict[str, Any], duration_ms: float) -> None:
+    record["duration_ms"] = round(duration_ms, 3)
+    name = record["span"]
+    with _lock:
+        stats = _span_stats[name]
+        stats["count"] += 1
+        stats["total_ms"] += duration_ms
+        stats["max_ms"] = max(stats["max_ms"], duration_ms)
+        if "error" in record:
+            stats["errors"] += 1
+            _counters[f"{name}.errors"] += 1
+        _recent_spans.append(record)
+    _emit(record)
+
+
+def record_span(name: str, duration_ms: float, **attributes: Any) -> None:
+    """Record a span measured elsewhere (e.g. by a LangChain callback)."""
+    record = {
+        "span": name,
+        "span_id": uuid.uuid4().hex[:12],
+        "parent_id": _parent_span.get(),
+        "trace_id": _trace_id.get(),
+        "start": time.time() - duration_ms / 1000,
+        **attributes,
+    }
+    _finish(record, duration_ms)
+
+
+def traced(name: Optional[str] = None) -> Callable:
+    """Decorator wrapping every call of a function (or coroutine function) in a span."""
+    def decorator(func: Callable) -> Callable:
+        span_name = name or f"{func.__module__.rsplit('.', 1)[-1]}.{func.__name__}"
+
+        if inspect.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                with span(span_name):
+                    return await func(*args, **kwargs)
+
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with span(span_name):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+@contextmanager
+def trace(trace_id: Optional[str] = None) -> Iterator[str]:
+    """Group every span opened inside the block (e.g. one chat turn) under one id."""
+    trace_id = trace_id or uuid.uuid4().hex[:16]
+    token = _trace_id.set(trace_id)
+    try:
+        yield trace_id
+    finally:
+        _trace_id.reset(token)
+
+
+def propagate(func: Callable) -> Callable:
+    """Bind func to the current trace/span context so worker threads report under it."""
+    context = contextvars.copy_context()
+    return functools.partial(context.run, func)
+
+
+def get_spans(trace_id: Optional[str] = None) -> List[Dict[str, Any]]:
+    """Returns recent spans, optionally only those of one trace."""
+    with _lock:
+        spans = list(_recent_spans)
+    if trace_id is not None:
+        spans = [s for s in spans if s.get("trace_id") == trace_id]
+    return spans
+
+
+def snapshot() -> Dict[str, Any]:
+    """Returns current counters and per-span aggregate timings."""
+    with _lock:
+        return {
+            "counters": dict(_counters),
+            "spans": {name: dict(stats) for name, stats in _span_stats.items()},
+        }
+
+
+def reset() -> None:
+    """Clear all counters, span statistics and recent spans."""
+    with _lock:
+        _counters.clear()
+        _span_stats.clear()
+        _recent_spans.clear()
+
+
+configure_logging()
@@ -0,0 +1,48 @@
+from datetime import datetime, timedelta, timezone, tzinfo, date as DateType
+from functools import lru_cache
+from zoneinfo import ZoneInfo
+
+from timezonefinder import TimezoneFinder
+
+from stargaze.utils.resources import get_timescale
+
+
+@lru_cache(maxsize=1)
+def _timezone_finder() -> TimezoneFinder:
+    """Returns the shared TimezoneFinder, built on first use."""
+    return TimezoneFinder()
+
+
+@lru_cache(maxsize=4096)
+def get_timezone(lat: float, lon: float) -> tzinfo:
+    """Returns the local timezone of a location.
+    
+    Args:
+        lat (float): Latitude of the location.
+        lon (float): Longitude of the location.
+    
+    Returns:
+        tzinfo: The IANA timezone, or a whole-hour offset from the
+        longitude where no zone is defined (e.g. open ocean).
+    """
+    name = _timezone_finder().timezone_at(lng=lon, lat=lat)
+    if name:
+        return ZoneInfo(name)
+    return timezone(timedelta(hours=round(lon / 15)))
+
+
+def local_time(lat: float, lon: float, date: DateType, hour: int = 22, minute: int = 0):
+    """Returns a Skyfield time for a wall-clock time at the observer's location.
+    
+    Args:
+        lat (float): Latitude of the observer's location.
+        lon (float): Longitude of the observer's location.
+        date (datetime.date): The local date.
+        hour (int): Local hour.
+        minute (int): Local minute.
+    
+    Returns:
+        Time: The corresponding Skyfield time.
+    """
+    local_dt = datetime(date.year, date.month, date.day, hour, minute, tzinfo=get_timezone(lat, lon))
+    return get_timescale().from_datetime(local_dt)
@@ -0,0 +1,160 @@
+import logging
+import os
+import time
+from datetime import datetime
+from typing import Dict, List, Optional
+
+import numpy as np
+from skyfield.api import EarthSatellite, wgs84
+
+from stargaze.utils import telemetry
+from stargaze.utils.http import DEFAULT_TIMEOUT, get_session
+from stargaze.utils.resources import get_ephemeris, get_loader, get_timescale
+
+logger = logging.getLogger(__name__)
+
+CELESTRAK_URL = os.getenv('CELESTRAK_URL', 'https://celestrak.org/NORAD/elements/gp.php')
+
+TLE_FILE = 'satellites.tle'
+TLE_MAX_AGE_DAYS = 2
+
+# When this process last tried to download each TLE file (time.time()).
+_downloaded_at: Dict[str, float] = {}
+
+MIN_ALTITUDE = 10  # degrees above the horizon for a pass to count as visible
+SUN_MAX_ALTITUDE = -6  # observer must be past civil twilight
+SAMPLE_STEP_SECONDS = 10
+
+
+def download_tles(catalog_numbers, path: str) -> None:
+    """Download TLEs from CelesTrak and save them to a single file.
+
+    Args:
+        catalog_numbers (Iterable[int]): NORAD catalog numbers to fetch.
+        path (str): Destination TLE file.
+    """
+    session = get_session()
+    chunks = []
+    for catnr in catalog_numbers:
+        with telemetry.span("http.celestrak", satellite_id=catnr):
+            response = session.get(CELESTRAK_URL, params={'CATNR': catnr, 'FORMAT': 'tle'}, timeout=DEFAULT_TIMEOUT)
+            response.raise_for_status()
+        chunks.append(response.text.strip())
+
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, 'w') as f:
+        f.write("\n".join(chunks) + "\n")
+    os.replace(tmp_path, path)
+
+
+def load_satellites(catalog: Dict[int, str], filename: str = TLE_FILE) -> Dict[int, EarthSatellite]:
+    """Load EarthSatellite objects for a catalog from the cached TLE file.
+
+    The file in DATA_DIR is refreshed from CelesTrak when it is missing or
+    older than TLE_MAX_AGE_DAYS. A satellite missing from the file triggers
+    at most one refresh per TLE_MAX_AGE_DAYS, since CelesTrak drops
+    decayed satellites. If a refresh fails, the cached file is used.
+
+    Args:
+        catalog (Dict[int, str]): NORAD catalog numbers mapped to display names.
+        filename (str): TLE file name inside DATA_DIR.
+
+    Returns:
+        Dict[int, EarthSatellite]: Satellites keyed by catalog number.
+    """
+    loader = get_loader()
+    path = loader.path_to(filename)
+
+    satellites = _read_tles(loader, filename) if loader.exists(filename) else {}
+    stale = not satellites or loader.days_old(filename) >= TLE_MAX_AGE_DAYS
+    missing = set(catalog) - set(satellites)
+    retried = time.time() - _downloaded_at.get(path, 0.0) < TLE_MAX_AGE_DAYS * 86400
+
+    if stale or (missing and not retried):
+        _downloaded_at[path] = time.time()
+        try:
+            download_tles(sorted(catalog), path)
+        except Exception as e:
+            if not satellites:
+                raise
+            logger.warning("Could not refresh TLEs, using the cached file: %s", telemetry.describe_error(e))
+        else:
+            satellites = _read_tles(loader, filename)
+
+    missing = set(catalog) - set(satellites)
+    if missing:
+        logger.warning("No TLEs found for satellites %s", sorted(missing))
+    return {satnum: satellites[satnum] for satnum in catalog if satnum in satellites}
+
+
+def _read_tles(loader, filename: str) -> Dict[int, EarthSatellite]:
+    return {sat.model.satnum: sat for sat in loader.tle_file(filename, ts=get_timescale())}
+
+
+def predict_visual_passes(satellite: EarthSatellite, lat: float, lon: float, days: int, min_visibility: int = 300, start: Optional[datetime] = None) -> List[Dict]:
+    """Predict visible passes of a satellite with SGP4.
+
+    Rise and set times come from ``find_events``. Every pass is then
+    sampled on one shared time array, and a sample is visible when the
+    satellite is above MIN_ALTITUDE, sunlit, and the observer's sun is
+    below SUN_MAX_ALTITUDE.
+
+    Args:
+        satellite (EarthSatellite): The satellite to predict.
+        lat (float): Latitude of the observer.
+        lon (float): Longitude of the observer.
+        days (int): Number of days to search.
+        min_visibility (int): Minimum visible duration in seconds.
+        start (Optional[datetime]): Start of the search window (timezone-aware), defaults to now.
+
+    Returns:
+        List[Dict]: Passes in the N2YO dict shape (startUTC, endUTC,
+        duration, maxEl) expected by format_satellite_results.
+    """
+    ts = get_timescale()
+    eph = get_ephemeris()
+    topos = wgs84.latlon(latitude_degrees=lat, longitude_degrees=lon)
+
+    t0 = ts.from_datetime(start) if start else ts.now()
+    t1 = ts.tt_jd(t0.tt + days)
+    times, events = satellite.find_events(topos, t0, t1, altitude_degrees=MIN_ALTITUDE)
+
+    # Pair each rise with the following set; skip passes cut off by the window.
+    windows = []
+    rise = None
+    for t, event in zip(times.tt, events):
+        if event == 0:
+            rise = t
+        elif event == 2 and rise is not None:
+            windows.append((rise, t))
+            rise = None
+    if not windows:
+        return []
+
+    step = SAMPLE_STEP_SECONDS / 86400.0
+    samples = [np.arange(rise, set_, step) for rise, set_ in windows]
+    pass_ids = np.repeat(np.arange(len(samples)), [len(s) for s in samples])
+    t = ts.tt_jd(np.concatenate(samples))
+
+    alt = (satellite - topos).at(t).altaz()[0].degrees
+    sun_alt = (eph['earth'] + topos).at(t).observe(eph['sun']).apparent().altaz()[0].degrees
+    visible = (alt >= MIN_ALTITUDE) & (sun_alt < SUN_MAX_ALTITUDE) & satellite.at(t).is_sunlit(eph)
+
+    passes = []
+    for pass_id in range(len(samples)):
+        idx = np.flatnonzero(visible & (pass_ids == pass_id))
+        if len(idx) == 0:
+            continue
+        # The last visible sample stands for the step that follows it.
+        start_utc = int(t[idx[0]].utc_datetime().timestamp())
+        end_utc = int(t[idx[-1]].utc_datetime().timestamp()) + SAMPLE_STEP_SECONDS
+        duration = end_utc - start_utc
+        if duration < min_visibility:
+            continue
+        passes.append({
+            'startUTC': start_utc,
+            'endUTC': end_utc,
+            'duration': duration,
+            'maxEl': round(float(alt[idx].max()), 1),
+        })
+    return passes
@@ -1,12 +1,28 @@
-import requests
+import os
 from datetime import datetime, date as DateType
-from geopy.geocoders import Nominatim
-from typing import Optional, Tuple, Dict, Union
+from typing import Optional, Tuple, Dict, List, Union
+
+from stargaze.utils import telemetry
+from stargaze.utils.cache import TTLCache, quantize_coords
+from stargaze.utils.async_http import get_async_client
+from stargaze.utils.geocoding import ageocode, geocode
+from stargaze.utils.http import DEFAULT_TIMEOUT, get_session
+
+OPEN_METEO_URL = os.getenv('OPEN_METEO_URL', 'https://api.open-meteo.com/v1/forecast')
+
+HOURLY_VARIABLES = ("cloudcover", "temperature_2m")
+FORECAST_DAYS = 16  # Open-Meteo's maximum forecast horizon
+
+# Forecasts are cached per ~11 km grid cell; Open-Meteo refreshes its
+# models roughly hourly, so there is no point keeping them longer.
+GRID_STEP_DEG = 0.1
+FORECAST_TTL_SECONDS = 3600
+_forecast_cache = TTLCache(maxsize=512, ttl=FORECAST_TTL_SECONDS, name="forecast")
 
 
 def get_coords(location: str) -> Tuple[float, float]:
     """
-    Converts a location string into latitude and longitude coordinates using geopy.
+    Converts a location string into latitude and longitude coordinates using the shared geocoder.
 
     Args:
         location (str): The name of the location (e.g., "Paris, France").
@@ -14,49 +30,169 @@ def get_coords(location: str) -> Tuple[float, float]:
     Returns:
         Tuple[float, float]: A tuple containing (latitude, longitude).
     """
-    geolocator = Nominatim(user_agent="stargazing_app")
-    loc = geolocator.geocode(location)
-    if not loc:
+    coords = geocode(location)
+    if not coords:
         raise ValueError(f"Location '{location}' not found.")
-    return loc.latitude, loc.longitude
+    return coords
 
 
-def get_weather(location: str, date: DateType) -> Optional[Dict[str, str]]:
+async def aget_coords(location: str) -> Tuple[float, float]:
+    """Async variant of get_coords."""
+    coords = await ageocode(location)
+    if not coords:
+        raise ValueError(f"Location '{location}' not found.")
+    return coords
+
+
+def _forecast_params(lat: float, lon: float, day_str: Optional[str]) -> Dict[str, Union[str, float, int]]:
+    params = {
+        "latitude": lat,
+        "longitude": lon,
+        "hourly": ",".join(HOURLY_VARIABLES),
+        "timezone": "auto",
+    }
+    if day_str:
+        params.update(start_date=day_str, end_date=day_str)
+    else:
+        params["forecast_days"] = FORECAST_DAYS
+    return params
+
+
+def _parse_forecast(res: Dict) -> Optional[Dict[str, List]]:
+    # Handle case where API doesn't return hourly data
+    if 'hourly' not in res:
+        return None
+    return {key: res['hourly'][key] for key in ("time",) + HOURLY_VARIABLES}
+
+
+def fetch_hourly_forecast(lat: float, lon: float, day_str: Optional[str] = None) -> Optional[Dict[str, List]]:
     """
-    Fetches weather forecast for a given location and date using the Open-Meteo API.
-    Returns average cloud cover and temperature summary.
+    Fetches hourly cloud cover and temperature from the Open-Meteo API.
 
     Args:
-        location (str): Name of the location (e.g., "London, UK").
-        date (datetime.date): The date for which to fetch weather data.
+        lat (float): Latitude of the grid cell.
+        lon (float): Longitude of the grid cell.
+        day_str (Optional[str]): Single date (YYYY-MM-DD) to fetch, or None
+            for the whole forecast horizon.
 
     Returns:
-        Optional[Dict[str, str]]: A dictionary with a summary string, or None if data is unavailable.
+        Optional[Dict[str, List]]: Hourly "time", "cloudcover" and
+        "temperature_2m" series in local time, or None if unavailable.
     """
-    lat, lon = get_coords(location)
+    with telemetry.span("http.open_meteo", days="horizon" if not day_str else day_str) as span:
+        response = get_session().get(OPEN_METEO_URL, params=_forecast_params(lat, lon, day_str), timeout=DEFAULT_TIMEOUT)
+        span["status"] = response.status_code
+        res = response.json()
+    return _parse_forecast(res)
+
+
+async def afetch_hourly_forecast(lat: float, lon: float, day_str: Optional[str] = None) -> Optional[Dict[str, List]]:
+    """Async variant of fetch_hourly_forecast, using the pooled async client."""
+    with telemetry.span("http.open_meteo", days="horizon" if not day_str else day_str) as span:
+        response = await get_async_client().get(OPEN_METEO_URL, params=_forecast_params(lat, lon, day_str))
+        span["status"] = response.status_code
+        res = response.json()
+    return _parse_forecast(res)
+
+
+def get_forecast(lat: float, lon: float) -> Optional[Dict[str, List]]:
+    """
+    Returns the whole-horizon hourly forecast for a location's grid cell.
+
+    Args:
+        lat (float): Latitude of the observer.
+        lon (float): Longitude of the observer.
+
+    Returns:
+        Optional[Dict[str, List]]: Hourly "time" (local), "cloudcover" and
+        "temperature_2m" series for the next FORECAST_DAYS days, or None.
+    """
+    cell = quantize_coords(lat, lon, GRID_STEP_DEG)
+    forecast = _forecast_cache.get(cell)
+    if forecast is None:
+        forecast = fetch_hourly_forecast(*cell)
+        if forecast:
+            _forecast_cache.set(cell, forecast)
+    return forecast
+
+
+async def aget_forecast(lat: float, lon: float) -> Optional[Dict[str, List]]:
+    """Async variant of get_forecast."""
+    cell = quantize_coords(lat, lon, GRID_STEP_DEG)
+    forecast = _forecast_cache.get(cell)
+    if forecast is None:
+        forecast = await afetch_hourly_forecast(*cell)
+        if forecast:
+            _forecast_cache.set(cell, forecast)
+    return forecast
+
+
+def _hours_of(forecast: Dict[str, List], day_str: str) -> Dict[str, List]:
+    hours = [i for i, t in enumerate(forecast["time"]) if t.startswith(day_str)]
+    return {key: [values[i] for i in hours] for key, values in forecast.items()}
+
 
-    # Format date to string as required by Open-Meteo API
+def _covers(forecast: Optional[Dict[str, List]], day_str: str) -> bool:
+    return bool(forecast) and any(t.startswith(day_str) for t in forecast["time"])
+
+
+def get_hourly_weather(lat: float, lon: float, date: DateType) -> Optional[Dict[str, List]]:
+    """
+    Returns the hourly forecast for one date, served from the grid-cell cache.
+
+    The whole forecast horizon for the cell is fetched in one request and
+    cached, so later dates and hours for nearby locations need no request.
+    Dates outside the horizon are fetched and cached individually.
+
+    Args:
+        lat (float): Latitude of the observer.
+        lon (float): Longitude of the observer.
+        date (datetime.date): The date of interest (local to the location).
+
+    Returns:
+        Optional[Dict[str, List]]: Hourly "time", "cloudcover" and
+        "temperature_2m" series for that date, or None if unavailable.
+    """
+    cell = quantize_coords(lat, lon, GRID_STEP_DEG)
     day_str = date.strftime("%Y-%m-%d")
 
-    # Construct Open-Meteo API URL
-    url = (
-        f"https://api.open-meteo.com/v1/forecast"
-        f"?latitude={lat}&longitude={lon}"
-        f"&hourly=cloudcover,temperature_2m"
-        f"&timezone=auto"
-        f"&start_date={day_str}&end_date={day_str}"
-    )
+    forecast = get_forecast(lat, lon)
 
-    # Fetch weather data
-    res = requests.get(url).json()
+    if not _covers(forecast, day_str):
+        forecast = _forecast_cache.get((cell, day_str))
+        if forecast is None:
+            forecast = fetch_hourly_forecast(*cell, day_str=day_str)
+            if not forecast:
+                return None
+            _forecast_cache.set((cell, day_str), forecast)
 
-    # Handle case where API doesn't return hourly data
-    if 'hourly' not in res:
+    return _hours_of(forecast, day_str)
+
+
+async def aget_hourly_weather(lat: float, lon: float, date: DateType) -> Optional[Dict[str, List]]:
+    """Async variant of get_hourly_weather, sharing its cache."""
+    cell = quantize_coords(lat, lon, GRID_STEP_DEG)
+    day_str = date.strftime("%Y-%m-%d")
+
+    forecast = await aget_forecast(lat, lon)
+
+    if not _covers(forecast, day_str):
+        forecast = _forecast_cache.get((cell, day_str))
+        if forecast is None:
+            forecast = await afetch_hourly_forecast(*cell, day_str=day_str)
+            if not forecast:
+                return None
+            _forecast_cache.set((cell, day_str), forecast)
+
+    return _hours_of(forecast, day_str)
+
+
+def _summarize(hourly: Optional[Dict[str, List]]) -> Optional[Dict[str, str]]:
+    if not hourly:
         return None
 
-    hours = res['hourly']['time']
-    clouds = res['hourly']['cloudcover']
-    temps = res['hourly']['temperature_2m']
+    clouds = [c for c in hourly['cloudcover'] if c is not None]
+    temps = [t for t in hourly['temperature_2m'] if t is not None]
 
     # Compute average cloud cover and use first temperature reading as approximation
     avg_cloud = sum(clouds) / len(clouds) if clouds else None
@@ -67,3 +203,27 @@ def get_weather(location: str, date: DateType) -> Optional[Dict[str, str]]:
 
     summary = f"{round(avg_cloud)}% cloud cover, Temp ~{round(first_temp)}°C"
     return {"summary": summary}
+
+
+@telemetry.traced()
+def get_weather(location: str, date: DateType) -> Optional[Dict[str, str]]:
+    """
+    Fetches weather forecast for a given location and date using the Open-Meteo API.
+    Returns average cloud cover and temperature summary.
+
+    Args:
+        location (str): Name of the location (e.g., "London, UK").
+        date (datetime.date): The date for which to fetch weather data.
+
+    Returns:
+        Optional[Dict[str, str]]: A dictionary with a summary string, or None if data is unavailable.
+    """
+    lat, lon = get_coords(location)
+    return _summarize(get_hourly_weather(lat, lon, date))
+
+
+@telemetry.traced()
+async def aget_weather(location: str, date: DateType) -> Optional[Dict[str, str]]:
+    """Async variant of get_weather: geocoding and the forecast request do not block a thread."""
+    lat, lon = await aget_coords(location)
+    return _summarize(await aget_hourly_weather(lat, lon, date))
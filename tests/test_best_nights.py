@@ -0,0 +1,42 @@
+from datetime import date, datetime, timedelta
+
+from stargaze.utils import best_nights
+
+
+def hourly_forecast(start: datetime, cloudcover):
+    times = [(start + timedelta(hours=i)).isoformat(timespec="minutes") for i in range(len(cloudcover))]
+    return {"time": times, "cloudcover": cloudcover, "temperature_2m": [10.0] * len(cloudcover)}
+
+
+def test_nights_without_cloud_forecast_are_omitted(monkeypatch):
+    # Night of Oct 16 has no cloud data at all; night of Oct 17 is fully forecast.
+    forecast = hourly_forecast(datetime(2026, 10, 16, 12), [None] * 24 + [20.0] * 24)
+    monkeypatch.setattr(best_nights, "get_forecast", lambda lat, lon: forecast)
+
+    nights = best_nights.rank_nights(40.0, -105.0, days=2, start=date(2026, 10, 16))
+    assert [n["date"] for n in nights] == ["2026-10-17"]
+    assert nights[0]["cloudcover"] == 20.0
+
+
+def test_text_never_reports_nan_cloud(monkeypatch):
+    # Dark hours (local night) lack cloud data; only the afternoon is forecast.
+    forecast = hourly_forecast(datetime(2026, 10, 16, 12), [30.0] * 6 + [None] * 18)
+    monkeypatch.setattr(best_nights, "get_forecast", lambda lat, lon: forecast)
+    monkeypatch.setattr(best_nights, "get_coords", lambda location: (40.0, -105.0))
+    rank_nights = best_nights.rank_nights
+    monkeypatch.setattr(best_nights, "rank_nights",
+                        lambda lat, lon, days: rank_nights(lat, lon, days, start=date(2026, 10, 16)))
+
+    lines = best_nights.get_best_nights("Denver, CO", days=1)
+    assert len(lines) == 1 and "nan" not in lines[0] and "no cloud forecast" in lines[0]
+
+
+def test_night_cut_off_by_the_forecast_horizon_is_omitted(monkeypatch):
+    # Like Open-Meteo: starts at local midnight and ends at midnight, so the
+    # night of Oct 18 would only have its evening hours.
+    forecast = hourly_forecast(datetime(2026, 10, 16), [0.0] * 72)
+    monkeypatch.setattr(best_nights, "get_forecast", lambda lat, lon: forecast)
+
+    nights = best_nights.rank_nights(40.0, -105.0, days=16, start=date(2026, 10, 16))
+    assert sorted(n["date"] for n in nights) == ["2026-10-16", "2026-10-17"]
+    assert all(n["dark_hours"] >= 9 for n in nights)
@@ -0,0 +1,92 @@
+import asyncio
+
+import pytest
+from geopy.geocoders import Nominatim
+
+from stargaze.utils.async_http import AsyncHTTPClient
+from stargaze.utils.geocoding import GeocodingService
+from stargaze.utils.http import CircuitBreaker, CircuitOpenError, get_breaker
+
+
+class HangingTransport:
+    """Stands in for httpx.AsyncClient; every request hangs until cancelled."""
+
+    async def get(self, *args, **kwargs):
+        await asyncio.sleep(3600)
+
+
+def open_breaker(breaker: CircuitBreaker) -> None:
+    for _ in range(breaker.failure_threshold):
+        breaker.record_failure()
+
+
+def test_opens_after_threshold_and_fails_fast():
+    breaker = CircuitBreaker("test-open", failure_threshold=3, reset_timeout=60)
+    for _ in range(3):
+        assert breaker.allow()
+        breaker.record_failure()
+    assert breaker.state == "open"
+    with pytest.raises(CircuitOpenError):
+        breaker.check()
+
+
+def test_half_open_lets_one_probe_through():
+    breaker = CircuitBreaker("test-probe", failure_threshold=1, reset_timeout=0)
+    open_breaker(breaker)
+    assert breaker.allow()
+    assert not breaker.allow()
+    breaker.record_success()
+    assert breaker.state == "closed"
+
+
+def test_cancelled_guard_releases_probe():
+    breaker = CircuitBreaker("test-guard", failure_threshold=1, reset_timeout=0)
+    open_breaker(breaker)
+    with pytest.raises(asyncio.CancelledError):
+        with breaker.guard():
+            raise asyncio.CancelledError()
+    assert breaker.allow()
+
+
+def test_cancelled_async_probe_releases_slot():
+    url = "http://breaker-cancel.invalid/probe"
+    breaker = get_breaker("breaker-cancel.invalid")
+    breaker.failure_threshold, breaker.reset_timeout = 1, 0
+    open_breaker(breaker)
+
+    async def probe_cancelled_by_deadline():
+        client = AsyncHTTPClient()
+        await client.aclose()
+        client._client = HangingTransport()
+        with pytest.raises(asyncio.TimeoutError):
+            await asyncio.wait_for(client.get(url), timeout=0.05)
+
+    asyncio.run(probe_cancelled_by_deadline())
+    assert breaker.allow(), "a cancelled probe must not leave the circuit stuck open"
+
+
+def test_unclaimed_check_leaves_the_probe_for_the_request():
+    breaker = CircuitBreaker("test-unclaimed", failure_threshold=1, reset_timeout=0)
+    open_breaker(breaker)
+    breaker.check(claim=False)
+    assert breaker.allow()
+    with pytest.raises(CircuitOpenError):
+        breaker.check(claim=False)
+
+
+def test_async_geocode_fails_fast_without_taking_a_rate_limit_slot():
+    service = GeocodingService(Nominatim(user_agent="stargazing_app_tests"), min_delay_seconds=60)
+    open_breaker(service._breaker)
+    service._breaker.reset_timeout = 3600
+    next_slot = service._next_slot
+
+    async def lookups():
+        for query in ("denver", "boulder"):
+            with pytest.raises(CircuitOpenError):
+                await asyncio.wait_for(service._afetch(query), timeout=1)
+
+    try:
+        asyncio.run(lookups())
+        assert service._next_slot == next_slot
+    finally:
+        service._breaker.record_success()
@@ -0,0 +1,15 @@
+import pytest
+
+from stargaze.utils.constellations import star_name
+
+
+@pytest.mark.parametrize("hip, name", [
+    (71683, "Rigil Kentaurus"),
+    (45556, "Aspidiske"),
+    (102098, "Deneb"),
+    (15863, "Mirfak"),
+    (32349, "Sirius"),
+    (1, "HIP 1"),
+])
+def test_star_name(hip, name):
+    assert star_name(hip) == name
@@ -0,0 +1,11 @@
+from datetime import date
+
+import pytest
+
+from stargaze.utils.moon import get_moon_calendar
+
+
+@pytest.mark.parametrize("days", [0, -3])
+def test_calendar_rejects_empty_ranges(days):
+    with pytest.raises(ValueError):
+        get_moon_calendar(40.0, -105.0, date(2026, 10, 16), days)
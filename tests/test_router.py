@@ -0,0 +1,42 @@
+from datetime import date
+
+import pytest
+
+from agents.router import detect_intent, extract_date, extract_location
+
+TODAY = date(2026, 10, 16)
+
+
+@pytest.mark.parametrize("question, intent", [
+    ("What's the moon phase on 2026-10-20?", "moon_phase"),
+    ("What's the weather in Denver tomorrow?", "weather"),
+    ("Which night is best this week in Denver?", "best_nights"),
+    ("Any ISS passes over Denver this week?", "satellite_passes"),
+    # Asking when something happens needs a search over dates, not one date's template.
+    ("When will the moon be full?", None),
+    ("When is the next new moon?", None),
+    ("How long until the next full moon?", None),
+    ("Why is the moon red tonight?", None),
+])
+def test_detect_intent(question, intent):
+    assert detect_intent(question) == intent
+
+
+@pytest.mark.parametrize("question, expected", [
+    ("What's the moon phase on 2026-10-20?", (date(2026, 10, 20), True)),
+    ("What's the weather in Denver tomorrow?", (date(2026, 10, 17), True)),
+    ("What planets can I see tonight?", (TODAY, True)),
+    ("Weather in Denver at 10:30 pm tomorrow", (date(2026, 10, 17), True)),
+    # Clock times are not dates.
+    ("What stars can I see in Denver at 3am", (None, False)),
+    ("What stars can I see in Denver at 11 pm", (None, False)),
+    # Several days named: the agent should answer for each.
+    ("Are there clouds in Denver tonight or tomorrow?", (None, True)),
+    ("Moon phase on 2026-10-20 or 2026-10-21?", (None, True)),
+    ("Weather in Denver on Friday or Saturday?", (None, True)),
+    # Vague dates defer too.
+    ("What can I see in May?", (None, True)),
+])
+def test_extract_date(question, expected):
+    _, rest = extract_location(question)
+    assert extract_date(rest, TODAY) == expected
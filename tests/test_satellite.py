@@ -0,0 +1,59 @@
+import asyncio
+import logging
+
+import requests
+
+from stargaze.utils import satellite
+
+CATALOG = {25544: "ISS", 20580: "Hubble"}
+PASS = {"startUTC": 1792115709, "endUTC": 1792115809, "duration": 100, "maxEl": 12.9}
+
+
+def leaky_error() -> requests.ConnectionError:
+    return requests.ConnectionError(f"{satellite.N2YO_BASE_URL}/visualpasses/20580/40.0/-105.0/0/3/300&apiKey=SECRET")
+
+
+def fake_fetch(satellite_id, *args):
+    if satellite_id == 20580:
+        raise leaky_error()
+    return [PASS]
+
+
+async def afake_fetch(satellite_id, *args):
+    return fake_fetch(satellite_id, *args)
+
+
+def test_skipped_satellites_are_logged_without_the_api_key(monkeypatch, caplog):
+    monkeypatch.setattr(satellite, "fetch_visual_passes", fake_fetch)
+    monkeypatch.setattr(satellite, "afetch_visual_passes", afake_fetch)
+    with caplog.at_level(logging.WARNING, logger=satellite.__name__):
+        sync = satellite.get_n2yo_passes(40.0, -105.0, 3, 300, "SECRET", catalog=CATALOG)
+        async_ = asyncio.run(satellite.aget_n2yo_passes(40.0, -105.0, 3, 300, "SECRET", catalog=CATALOG))
+
+    assert sync == async_ == [{"name": "ISS", "passes": [PASS]}]
+    assert caplog.text.count("Skipping satellite 20580: ConnectionError") == 2
+    assert "SECRET" not in caplog.text
+
+
+def test_outage_is_an_error_not_no_passes(monkeypatch):
+    def refuse(*args):
+        raise leaky_error()
+
+    async def arefuse(*args):
+        refuse()
+
+    monkeypatch.setenv("N2YO_API_KEY", "SECRET")
+    monkeypatch.setattr(satellite, "fetch_visual_passes", refuse)
+    monkeypatch.setattr(satellite, "afetch_visual_passes", arefuse)
+    monkeypatch.setattr(satellite, "geocode", lambda location: (40.0, -105.0))
+
+    async def ageocode(location):
+        return 40.0, -105.0
+
+    monkeypatch.setattr(satellite, "ageocode", ageocode)
+    sync = satellite.get_satellite_passes("Denver, CO", backend="n2yo")
+    async_ = asyncio.run(satellite.aget_satellite_passes("Denver, CO", backend="n2yo"))
+
+    assert sync == async_
+    assert sync.startswith("Error getting satellite passes: N2YO answered for none of 8 satellites")
+    assert "SECRET" not in sync
@@ -0,0 +1,32 @@
+import httpx
+import pytest
+import requests
+
+from stargaze.utils import telemetry
+
+URL = "https://api.n2yo.com/rest/v1/satellite/visualpasses/25544/40.0/-105.0/0/3/300&apiKey=SECRET"
+
+
+def http_error(status: int) -> requests.HTTPError:
+    response = requests.Response()
+    response.status_code, response.url, response.reason = status, URL, "Service Unavailable"
+    try:
+        response.raise_for_status()
+    except requests.HTTPError as e:
+        return e
+
+
+@pytest.mark.parametrize("error, recorded", [
+    (http_error(503), "HTTPError 503"),
+    (requests.ConnectionError(f"Max retries exceeded with url: {URL}"), "ConnectionError"),
+    (httpx.ConnectError(f"connection refused: {URL}"), "ConnectError"),
+    (RuntimeError("N2YO error for satellite 25544: quota"), "RuntimeError: N2YO error for satellite 25544: quota"),
+])
+def test_span_errors_never_record_request_urls(error, recorded):
+    with telemetry.trace() as trace_id:
+        with pytest.raises(type(error)):
+            with telemetry.span("http.n2yo"):
+                raise error
+    [span] = telemetry.get_spans(trace_id)
+    assert span["error"] == recorded
+    assert "SECRET" not in span["error"]
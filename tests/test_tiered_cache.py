@@ -0,0 +1,52 @@
+import asyncio
+import threading
+
+import pytest
+
+from stargaze.utils.cache import TieredCache
+
+
+def test_disk_tier_survives_a_new_instance(tmp_path):
+    path = str(tmp_path / "cache.sqlite3")
+    TieredCache("values_v1", path).set("k", [1, 2])
+    assert TieredCache("values_v1", path).get_or_load("k", lambda: pytest.fail("loader ran")) == [1, 2]
+
+
+def test_uncacheable_values_are_returned_but_not_stored():
+    cache = TieredCache("values_v1")
+    assert cache.get_or_load("k", lambda: "Error", cacheable=lambda v: v != "Error") == "Error"
+    assert cache.get("k") is None
+
+
+def test_concurrent_sync_misses_run_the_loader_once():
+    cache, calls, release = TieredCache("values_v1"), [], threading.Event()
+
+    def loader():
+        calls.append(1)
+        release.wait(5)
+        return "value"
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(cache.get_or_load("k", loader))) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    release.set()
+    for thread in threads:
+        thread.join()
+    assert results == ["value"] * 4 and len(calls) == 1
+
+
+def test_cancelled_async_leader_does_not_strand_merged_callers():
+    cache = TieredCache("values_v1")
+
+    async def scenario():
+        leader = asyncio.ensure_future(cache.aget_or_load("k", lambda: asyncio.sleep(3600)))
+        await asyncio.sleep(0)
+        follower = asyncio.ensure_future(cache.aget_or_load("k", lambda: pytest.fail("loader ran twice")))
+        await asyncio.sleep(0)
+        leader.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await asyncio.wait_for(follower, timeout=1)
+        assert await cache.aget_or_load("k", lambda: asyncio.sleep(0, result="fresh")) == "fresh"
+
+    asyncio.run(scenario())
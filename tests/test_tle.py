@@ -0,0 +1,70 @@
+import os
+import time
+from datetime import datetime, timezone
+
+import pytest
+import requests
+from skyfield.api import EarthSatellite, Loader
+
+from stargaze.utils import tle
+from stargaze.utils.resources import get_timescale
+from stargaze.utils.tle import predict_visual_passes
+
+ISS = (
+    "1 25544U 98067A   26288.50000000  .00016717  00000-0  10270-3 0  9005",
+    "2 25544  51.6400 208.9163 0006317  69.9862  25.2906 15.50000000    08",
+)
+
+
+def test_pass_times_are_utc_and_duration_matches_them():
+    satellite = EarthSatellite(*ISS, "ISS", get_timescale())
+    start = datetime(2026, 10, 16, tzinfo=timezone.utc)
+    passes = predict_visual_passes(satellite, 40.0, -105.0, 2, min_visibility=60, start=start)
+
+    assert passes
+    for p in passes:
+        assert p["duration"] == p["endUTC"] - p["startUTC"]
+        assert start.timestamp() <= p["startUTC"] < start.timestamp() + 2 * 86400
+
+
+@pytest.fixture
+def tle_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(tle, "get_loader", lambda: Loader(str(tmp_path), verbose=False))
+    monkeypatch.setattr(tle, "_downloaded_at", {})
+    return tmp_path
+
+
+def fake_download(calls, fail=False):
+    def download(catalog_numbers, path):
+        calls.append(list(catalog_numbers))
+        if fail:
+            raise requests.ConnectionError("CelesTrak is down")
+        with open(path, "w") as f:
+            f.write("ISS\n" + "\n".join(ISS) + "\n")  # 99999 has decayed
+    return download
+
+
+def test_satellite_missing_upstream_does_not_download_every_call(tle_dir, monkeypatch):
+    calls = []
+    monkeypatch.setattr(tle, "download_tles", fake_download(calls))
+    for _ in range(3):
+        assert list(tle.load_satellites({25544: "ISS", 99999: "Decayed"})) == [25544]
+    assert len(calls) == 1
+
+
+def test_failed_refresh_falls_back_to_the_cached_file(tle_dir, monkeypatch):
+    monkeypatch.setattr(tle, "download_tles", fake_download([]))
+    tle.load_satellites({25544: "ISS"})
+    stale = time.time() - (tle.TLE_MAX_AGE_DAYS + 1) * 86400
+    os.utime(tle_dir / tle.TLE_FILE, (stale, stale))
+
+    calls = []
+    monkeypatch.setattr(tle, "download_tles", fake_download(calls, fail=True))
+    assert list(tle.load_satellites({25544: "ISS"})) == [25544]
+    assert len(calls) == 1
+
+
+def test_no_cached_file_and_failed_download_raises(tle_dir, monkeypatch):
+    monkeypatch.setattr(tle, "download_tles", fake_download([], fail=True))
+    with pytest.raises(requests.ConnectionError):
+        tle.load_satellites({25544: "ISS"})
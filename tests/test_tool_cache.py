@@ -0,0 +1,75 @@
+import json
+
+import pytest
+import requests
+
+from agents.cache import cached_tool, get_tool_cache
+from agents.tools import fetch_satellite_passes, is_complete_report
+from stargaze.utils import satellite
+
+
+@pytest.fixture(autouse=True)
+def empty_cache():
+    get_tool_cache().clear()
+    yield
+    get_tool_cache().clear()
+
+
+@pytest.mark.parametrize("failure", [
+    "Error getting satellite passes: timeout",
+    "Error getting satellite passes: N2YO answered for none of 8 satellites (last error: ConnectionError)",
+    "Could not find coordinates for location: Atlantis",
+    "Location not found.",
+    "No weather data available.",
+])
+def test_failures_are_not_cached(failure):
+    calls = []
+
+    @cached_tool("test_failure")
+    def tool(location: str) -> str:
+        calls.append(location)
+        return failure
+
+    assert tool("Atlantis") == failure
+    assert tool("Atlantis") == failure
+    assert len(calls) == 2
+
+
+def test_n2yo_outage_is_not_cached(monkeypatch):
+    def refuse(*args):
+        raise requests.ConnectionError("connection refused")
+
+    monkeypatch.setenv("N2YO_API_KEY", "key")
+    monkeypatch.setattr(satellite, "SATELLITE_BACKEND", "n2yo")
+    monkeypatch.setattr(satellite, "geocode", lambda location: (40.0, -105.0))
+    monkeypatch.setattr(satellite, "fetch_visual_passes", refuse)
+
+    first = fetch_satellite_passes.invoke({"location": "Denver, CO"})
+    second = fetch_satellite_passes.invoke({"location": "Denver, CO"})
+    assert first == second and first.startswith("Error")
+    assert get_tool_cache().stats()["fetch_satellite_passes"] == {"hits": 0, "misses": 2}
+
+
+def test_answers_are_cached_per_normalized_location():
+    calls = []
+
+    @cached_tool("test_answer")
+    def tool(location: str) -> str:
+        calls.append(location)
+        return "51% cloud cover"
+
+    assert tool("Denver, CO") == tool(" denver,co") == "51% cloud cover"
+    assert len(calls) == 1
+    assert get_tool_cache().stats()["test_answer"] == {"hits": 1, "misses": 1}
+
+
+@pytest.mark.parametrize("sky_events, satellite_passes, errors, complete", [
+    ("Visible planets: Saturn", "No visible passes", {}, True),
+    ("Location not found.", "No visible passes", {}, False),
+    (None, "No visible passes", {"sky_events": "timed out after 20s"}, False),
+    ("Visible planets: Saturn", "Error getting satellite passes: N2YO answered for none of 8 satellites", {}, False),
+])
+def test_is_complete_report(sky_events, satellite_passes, errors, complete):
+    report = {"weather": "51% cloud cover", "moon_phase": "Waxing Crescent", "sky_events": sky_events,
+              "satellite_passes": satellite_passes, "errors": errors}
+    assert is_complete_report(json.dumps(report)) is complete